@@ -0,0 +1,116 @@
+"""Cold-start benchmark of the dashboard: import time of its modules.
+
+Each run imports the dashboard modules in a fresh interpreter (as a new
+replica would) and measures the time spent after ``import streamlit``.
+The median over the runs is compared with a budget; the check also fails
+when a module meant to be imported lazily (pydeck, scipy, geopandas...)
+is loaded at startup. With ``--record`` the median is stored as the
+baseline of this machine, later runs fail when they exceed it by more than
+the tolerance.
+
+    python scripts/bench_startup.py --record
+    python scripts/bench_startup.py
+"""
+# Standard library imports
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import loaders
+
+# Constants
+BASELINE_PATH = os.path.join(loaders.DATA_PATH, "bench", "startup.json")
+SCRIPTS_PATH = os.path.dirname(os.path.abspath(__file__))
+MODULES = ['dashboard.tabs.accueil', 'dashboard.tabs.coefficients', 'dashboard.tabs.emplacement',
+           'dashboard.tabs.secteur', 'dashboard.tabs.ponderations', 'dashboard.tabs.suggestions']
+N_RUNS = 7
+BUDGET_SECONDS = 1.0
+TOLERANCE = 1.25
+
+# Modules réservés aux vues qui les utilisent : jamais importés au démarrage
+DEFERRED = ['matplotlib', 'seaborn', 'altair', 'folium', 'geopandas', 'branca', 'pydeck',
+            'scipy', 'shapely', 'plotly.express']
+
+_PROBE = """
+import json, sys, time
+import streamlit
+preloaded = set(sys.modules)
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'secondes': elapsed,
+                   'modules': sorted(name for name in sys.modules if name not in preloaded)}}))
+"""
+
+
+def measure_once(modules=MODULES):
+    """Import time (s) of ``modules`` in a new interpreter and the modules it loaded."""
+    result = subprocess.run([sys.executable, '-c', _PROBE.format(modules=modules)], cwd=SCRIPTS_PATH,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de l'import des modules :\n{result.stderr.strip()}")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe['secondes'], probe['modules']
+
+
+def measure(n_runs=N_RUNS, modules=MODULES):
+    """Median import time over ``n_runs`` cold starts and the deferred modules loaded anyway."""
+    timings, loaded = [], set()
+    for _ in range(n_runs):
+        seconds, imported = measure_once(modules)
+        timings.append(seconds)
+        loaded.update(imported)
+    eager = sorted(name for name in DEFERRED if name in loaded)
+    return statistics.median(timings), eager
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return None
+    with open(BASELINE_PATH) as f:
+        return json.load(f)['secondes']
+
+
+def save_baseline(seconds):
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH + ".tmp", 'w') as f:
+        json.dump({'secondes': seconds, 'modules': MODULES}, f)
+    os.replace(BASELINE_PATH + ".tmp", BASELINE_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage à froid du tableau de bord")
+    parser.add_argument('--runs', type=int, default=N_RUNS)
+    parser.add_argument('--budget', type=float, default=BUDGET_SECONDS, help="Plafond absolu (secondes)")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="Marge tolérée sur la référence")
+    parser.add_argument('--record', action='store_true', help="Enregistrer la mesure comme référence")
+    args = parser.parse_args()
+
+    median, eager = measure(args.runs)
+    print(f"Import des modules du tableau de bord : {median * 1000:.0f} ms (médiane de {args.runs})")
+
+    failures = []
+    if eager:
+        failures.append(f"modules importés au démarrage au lieu d'être différés : {', '.join(eager)}")
+    if median > args.budget:
+        failures.append(f"{median * 1000:.0f} ms au-delà du budget de {args.budget * 1000:.0f} ms")
+    baseline = load_baseline()
+    if baseline is not None and not args.record:
+        print(f"Référence : {baseline * 1000:.0f} ms")
+        if median > baseline * args.tolerance:
+            failures.append(f"régression de {(median / baseline - 1) * 100:.0f} % par rapport à la référence")
+    if args.record:
+        save_baseline(median)
+        print(f"Référence enregistrée dans {BASELINE_PATH}")
+
+    for failure in failures:
+        print(f"ÉCHEC : {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
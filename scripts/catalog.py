@@ -0,0 +1,233 @@
+"""Catalog of the datasets: content-addressed versions and lineage.
+
+Every source file and every derived artefact of the project is an entry.
+A source's version is the hash of its content. A derived entry's version
+is the hash of the code that produces it and of the versions of its
+inputs, so a refreshed source changes the token of exactly the tables
+built from it and of nothing else. Caches, figure payloads and export file
+names key on :func:`version` (or :func:`token` for several entries);
+stale files are removed with ``prune``.
+
+Source hashes are memoised in ``data/store/catalog.json`` against the file
+size and modification time, so a version costs a ``stat`` per source once
+the file has been hashed. The manifest also records the artefacts written
+for each version (path and content hash).
+
+    python scripts/catalog.py status
+    python scripts/catalog.py lineage opportunites
+    python scripts/catalog.py prune
+"""
+# Standard library imports
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+import loaders
+
+# Constants
+MANIFEST_PATH = os.path.join(loaders.DATA_PATH, "store", "catalog.json")
+SCRIPTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Fichiers sources : chemin et étape qui les a produits
+SOURCES = {
+    'main.xlsx': (os.path.join(loaders.DATA_PATH, "main.xlsx"), "source externe"),
+    'main_table': (loaders.MAIN_TABLE, "source externe"),
+    'Scores-final.zip': (loaders.SCORES_ZIP, "notebooks/Calcul_score (4).ipynb, notebooks/scores.ipynb"),
+    'score_sport.xlsx': (loaders.CLUBS_XLSX, "notebooks/Calcul_score (4).ipynb"),
+    'corr_dpt.csv': (loaders.CORR_DPT_CSV, "notebooks/scores.ipynb"),
+    'df_filtered_secteurs_88.csv': (loaders.SECTOR_CSV, "notebooks/urssaf.ipynb"),
+    'departements.geojson': (loaders.DEPARTEMENTS_GEOJSON, "source externe"),
+    'communes.geojson': (loaders.COMMUNES_GEOJSON, "source externe"),
+    # Jeton réécrit à chaque lot de résultats ingéré en cours de saison
+    'direct': (os.path.join(loaders.DATA_PATH, "flux", "VERSION"), "scripts/live_scores.py"),
+}
+
+# Artefacts dérivés : modules qui les produisent et entrées dont ils dépendent
+# (les tables clean/* dépendent aussi de compact.py, qui fixe les types servis par les chargeurs)
+DERIVED = {
+    'clean/scores': (['schema.py', 'geography.py', 'compact.py'], ['Scores-final.zip', 'departements.geojson']),
+    'clean/scores_departement': (['schema.py', 'geography.py', 'compact.py'],
+                                 ['Scores-final.zip', 'departements.geojson']),
+    'clean/correlations': (['schema.py', 'geography.py', 'compact.py'], ['Scores-final.zip', 'departements.geojson']),
+    'clean/correlations_dpt': (['schema.py', 'geography.py', 'compact.py'], ['corr_dpt.csv', 'departements.geojson']),
+    'clean/clubs': (['schema.py', 'geography.py', 'compact.py'], ['score_sport.xlsx', 'departements.geojson']),
+    'clean/main_table': (['schema.py', 'geography.py', 'compact.py'], ['main_table', 'departements.geojson']),
+    'clean/sector': (['schema.py', 'geography.py', 'compact.py'], ['df_filtered_secteurs_88.csv', 'departements.geojson']),
+    'store/scores': (['export.py'], ['clean/scores']),
+    'store/sector': (['export.py'], ['clean/sector']),
+    'store/clubs': (['export.py'], ['clean/clubs']),
+    'partage/scores': (['shared_data.py'], ['clean/scores']),
+    'partage/sector': (['shared_data.py'], ['clean/sector']),
+    'partage/clubs': (['shared_data.py'], ['clean/clubs']),
+    'cube_secteurs': (['sector_cube.py'], ['clean/sector']),
+    'feuilles': (['table_viewer.py'], ['Scores-final.zip']),
+    'opportunites': (['opportunities.py', 'resampling.py'],
+                     ['clean/sector', 'clean/correlations', 'clean/clubs', 'clean/scores',
+                      'clean/scores_departement']),
+    'moyennes': (['rollup.py', 'stats.py'], ['clean/scores']),
+    'previsions': (['forecast.py', 'lags.py', 'rollup.py'], ['clean/scores']),
+    'decalages': (['lags.py', 'rollup.py'], ['clean/scores']),
+    'intervalles': (['resampling.py', 'rollup.py', 'stats.py'], ['clean/scores', 'clean/scores_departement']),
+    'sensibilite': (['sensitivity.py', 'weights.py'], ['clean/main_table']),
+    'tuiles': (['tiles.py'], ['clean/scores', 'clean/sector', 'communes.geojson']),
+    'scores_sportifs': (['sport_scores.py', 'rollup.py'], ['clean/clubs', 'score_sport.xlsx']),
+    'rapports': (['reports.py', 'dashboard/figures.py'],
+                 ['moyennes', 'clean/scores', 'clean/correlations', 'clean/clubs', 'clean/sector', 'intervalles', 'previsions']),
+}
+
+_lock = threading.Lock()
+_manifest = None
+
+
+def _load_manifest(reload=False):
+    global _manifest
+    if _manifest is None or reload:
+        try:
+            with open(MANIFEST_PATH) as f:
+                _manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _manifest = {}
+        _manifest.setdefault('fichiers', {})
+        _manifest.setdefault('artefacts', {})
+    return _manifest
+
+
+def _save_manifest():
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_manifest, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def file_hash(path):
+    """Content hash of a file, rehashed only when its size or modification time changed."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return 'absent'
+    key = os.path.relpath(path, loaders.BASE_PATH)
+    with _lock:
+        files = _load_manifest()['fichiers']
+        known = files.get(key)
+        if known and known['taille'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['hash']
+        digest = loaders.file_version(path)
+        # Relire le manifeste avant d'écrire : d'autres processus ont pu l'enrichir
+        files = _load_manifest(reload=True)['fichiers']
+        files[key] = {'taille': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        _save_manifest()
+    return digest
+
+
+def version(name):
+    """Version token of a source (content hash) or of a derived entry (code and inputs)."""
+    if name in SOURCES:
+        return file_hash(SOURCES[name][0])
+    modules, inputs = DERIVED[name]
+    digest = hashlib.sha1(name.encode())
+    for module in modules:
+        digest.update(file_hash(os.path.join(SCRIPTS_PATH, module)).encode())
+    for entry in inputs:
+        digest.update(version(entry).encode())
+    return digest.hexdigest()[:16]
+
+
+def token(*names):
+    """Single token for several entries (e.g. a figure built from two tables)."""
+    if len(names) == 1:
+        return version(names[0])
+    digest = hashlib.sha1()
+    for name in sorted(names):
+        digest.update(f"{name}={version(name)}".encode())
+    return digest.hexdigest()[:16]
+
+
+def producer(name):
+    """Notebook or pipeline stage that produces an entry."""
+    return SOURCES[name][1] if name in SOURCES else ', '.join(f"scripts/{m}" for m in DERIVED[name][0])
+
+
+def lineage(name, depth=0):
+    """``(depth, name, producer, version)`` of an entry and, recursively, of its inputs."""
+    rows = [(depth, name, producer(name), version(name))]
+    for entry in ([] if name in SOURCES else DERIVED[name][1]):
+        rows += lineage(entry, depth + 1)
+    return rows
+
+
+def dependents(name):
+    """Derived entries whose version changes when ``name`` changes."""
+    affected = []
+    for entry, (_, inputs) in DERIVED.items():
+        if name in inputs:
+            affected += [entry] + [e for e in dependents(entry) if e not in affected]
+    return list(dict.fromkeys(affected))
+
+
+def record(name, path):
+    """Register a file written for the current version of ``name``; returns that version."""
+    current = version(name)
+    with _lock:
+        files = _load_manifest(reload=True)['artefacts'].setdefault(name, {}).setdefault(current, {})
+        files[os.path.relpath(path, loaders.BASE_PATH)] = {
+            'hash': loaders.file_version(path) if os.path.isfile(path) else None,
+            'cree_le': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        _save_manifest()
+    return current
+
+
+def artefacts(name):
+    """Paths of the files recorded for the current version of ``name`` that still exist."""
+    files = _load_manifest()['artefacts'].get(name, {}).get(version(name), {})
+    return [path for path in files if os.path.exists(os.path.join(loaders.BASE_PATH, path))]
+
+
+def prune():
+    """Delete recorded artefacts of versions that are no longer current; returns their paths."""
+    removed = []
+    current = {name: version(name) for name in DERIVED}
+    with _lock:
+        recorded = _load_manifest(reload=True)['artefacts']
+        # Un fichier réécrit au même chemin (tuiles) appartient à la version courante
+        kept = {path for name, versions in recorded.items() for path in versions.get(current.get(name), {})}
+        for name, versions in recorded.items():
+            for old in [v for v in versions if v != current.get(name)]:
+                for path in versions.pop(old):
+                    path_on_disk = os.path.join(loaders.BASE_PATH, path)
+                    if path not in kept and os.path.isfile(path_on_disk):
+                        os.remove(path_on_disk)
+                        removed.append(path_on_disk)
+        _save_manifest()
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalogue des jeux de données : versions et lignage")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('status', help="Version de chaque entrée et artefacts à jour")
+    lineage_parser = subparsers.add_parser('lineage', help="Lignage d'une entrée")
+    lineage_parser.add_argument('name', choices=list(SOURCES) + list(DERIVED))
+    subparsers.add_parser('prune', help="Supprimer les artefacts des versions périmées")
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        for name in list(SOURCES) + list(DERIVED):
+            state = 'source' if name in SOURCES else ('à jour' if artefacts(name) else 'à construire')
+            print(f"{name:32} {version(name)}  {state:13} {producer(name)}")
+    elif args.command == 'lineage':
+        for depth, name, stage, current in lineage(args.name):
+            print(f"{'  ' * depth}{name} [{current}] ← {stage}")
+    else:
+        removed = prune()
+        print(f"{len(removed)} artefact(s) périmé(s) supprimé(s)")
+        for path in removed:
+            print(f"  - {path}")
+
+
+if __name__ == '__main__':
+    main()
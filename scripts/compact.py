@@ -0,0 +1,248 @@
+"""Compact in-memory representation of the datasets.
+
+The clean tables keep the types of their schema: float64 measures, int64
+seasons, and the same names (région, département, ville, sport, club...)
+stored again in every table that mentions them. ``compact`` shrinks a
+table as the runtime loaders hand it out:
+
+* floats become float32 (the sources carry far fewer significant digits);
+* integers take the smallest signed type, from int16 up, that holds them;
+* text columns whose values repeat (fewer distinct values than
+  ``MAX_DISTINCT_SHARE`` of the rows) become categoricals whose
+  dictionary is shared by every table of the process. Each name is stored
+  once, rows hold small integer codes, and tables joined on a dimension
+  compare codes of the same dictionary. Région and département
+  dictionaries start with the registry names, so their codes stay the
+  registry ids.
+
+A dictionary is seeded with the names of every clean table already
+ingested, so all tables share it. Should a table bring names unknown to
+it, it grows (and stays sorted); tables compacted before keep the
+previous dictionary.
+``SPORTECO_COMPACT=0`` serves the tables as typed by :mod:`schema`.
+
+    python scripts/compact.py report
+    python scripts/compact.py check
+"""
+# Standard library imports
+import argparse
+import os
+import sys
+import threading
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import loaders
+
+# Constants
+ENABLED = os.environ.get('SPORTECO_COMPACT', '1') not in ('', '0')
+MAX_DISTINCT_SHARE = 0.5
+INT_TYPES = ('int16', 'int32')
+GEO_LEVELS = ('region', 'departement')
+# Écart toléré entre résultats calculés sur les tables typées et compactes (float32 : ~7 chiffres)
+RTOL, ATOL = 1e-4, 1e-5
+CHECK_RESAMPLES = 200
+# p-valeurs de permutation : une égalité |r_perm| = |r_obs| peut basculer d'un tirage avec l'arrondi float32
+COLUMN_ATOL = {'p_value': 2 / (CHECK_RESAMPLES + 1)}
+
+_lock = threading.Lock()
+_dictionaries = {}
+
+
+def _categories(column, names):
+    """Sorted dictionary of ``column``; registry entities first for régions and départements."""
+    if column in GEO_LEVELS:
+        registry_names = list(loaders.load_registry().names(column))
+        return registry_names + sorted(names.difference(registry_names))
+    return sorted(names)
+
+
+def stored_names(column):
+    """Names of ``column`` in every clean table already ingested (only that column is read)."""
+    import pyarrow.parquet as pq
+    import schema
+
+    names = set()
+    for name, columns in schema.SCHEMAS.items():
+        path = schema.clean_path(name)
+        if column in columns and os.path.exists(path) and column in pq.read_schema(path).names:
+            values = pq.read_table(path, columns=[column]).column(0).drop_null().unique()
+            names.update(str(value) for value in values.to_pylist())
+    return names
+
+
+def shared_dtype(column, values):
+    """Categorical dtype shared by every ``column`` of the process, covering ``values``."""
+    names = set(values.dropna().astype(str).unique())
+    # Premier usage : dictionnaire amorcé avec les noms de toutes les tables ingérées
+    seed = stored_names(column) if column not in _dictionaries else set()
+    with _lock:
+        dtype = _dictionaries.get(column)
+        if dtype is None or not names.issubset(dtype.categories):
+            known = set(dtype.categories) if dtype is not None else seed
+            dtype = pd.CategoricalDtype(pd.Index(_categories(column, known | names)))
+            _dictionaries[column] = dtype
+    return dtype
+
+
+def downcast(values):
+    """Numeric column in its smallest safe type (float32, int16 or int32); other columns unchanged."""
+    kind = values.dtype.kind
+    if kind == 'f':
+        return values.astype('float32')
+    if kind in 'iu' and len(values):
+        low, high = values.min(), values.max()
+        for dtype in INT_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return values.astype(dtype)
+    return values
+
+
+def _is_dimension(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return True
+    if not (pd.api.types.is_string_dtype(values) or values.dtype == object):
+        return False
+    return values.nunique() <= MAX_DISTINCT_SHARE * len(values)
+
+
+def compact(df):
+    """Downcast the numbers of ``df`` and move its repeated text to shared dictionaries (in place)."""
+    for column in df.columns:
+        values = df[column]
+        if _is_dimension(values):
+            # Catégories de la table décodées en texte puis recodées dans le dictionnaire partagé
+            text = values.astype(object).where(values.notna())
+            df[column] = text.astype(shared_dtype(str(column), text))
+        else:
+            df[column] = downcast(values)
+    return df
+
+
+def frame_bytes(df):
+    """Bytes of ``df`` without its shared dictionaries (codes only), and those of its own strings."""
+    total = 0
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype) and values.dtype is _dictionaries.get(str(column)):
+            total += values.cat.codes.memory_usage(index=False)
+        else:
+            total += values.memory_usage(index=False, deep=True)
+    return total + df.index.memory_usage(deep=True)
+
+
+def dictionary_bytes():
+    """Bytes of the shared dictionaries, counted once for every table."""
+    with _lock:
+        return sum(dtype.categories.memory_usage(deep=True) for dtype in _dictionaries.values())
+
+
+def load_typed():
+    """Tables as typed by :mod:`schema` (sources unavailable here skipped) and the dashboard workbook."""
+    import schema
+
+    frames = {}
+    for name in schema.SCHEMAS:
+        try:
+            frames[name] = schema.load_clean(name)
+        except Exception as e:
+            print(f"{name} : ignoré ({type(e).__name__})", file=sys.stderr)
+    try:
+        df = pd.read_excel(os.path.join(loaders.DATA_PATH, "main.xlsx"))
+        df.columns = df.columns.str.lower()
+        frames['main.xlsx'] = loaders.canonicalize_geography(df)
+    except Exception as e:
+        print(f"main.xlsx : ignoré ({type(e).__name__})", file=sys.stderr)
+    return frames
+
+
+def memory_report(frames):
+    """Memory of every table before and after :func:`compact`, and of the shared dictionaries."""
+    rows = []
+    for name, df in frames.items():
+        before = df.memory_usage(index=True, deep=True).sum()
+        after = frame_bytes(compact(df.copy()))
+        rows.append({'table': name, 'lignes': len(df), 'avant_mo': before / 1e6, 'apres_mo': after / 1e6})
+    report = pd.DataFrame(rows, columns=['table', 'lignes', 'avant_mo', 'apres_mo'])
+    report.loc[len(report)] = ['dictionnaires partagés', 0, 0.0, dictionary_bytes() / 1e6]
+    report.loc[len(report)] = ['total', report['lignes'].sum(), report['avant_mo'].sum(), report['apres_mo'].sum()]
+    report['facteur'] = report['avant_mo'] / report['apres_mo']
+    return report
+
+
+def _results(frames):
+    """Derived tables the app serves, computed from ``frames`` (only those whose inputs are present)."""
+    import forecast
+    import lags
+    import opportunities
+    import resampling
+    import rollup
+    import sport_scores
+
+    results = {}
+    if 'scores' in frames:
+        df_scores = frames['scores']
+        averages = rollup.score_rollup(df_scores)
+        for level in GEO_LEVELS:
+            results[f'moyennes/{level}'] = averages[level]
+            results[f'decalages/{level}'] = lags.lag_table(df_scores, level)
+            results[f'previsions/{level}'] = forecast.forecast_scores(df_scores, level)
+            if 'scores_departement' in frames:
+                results[f'intervalles/{level}'] = resampling.score_correlation_intervals(
+                    df_scores, level, frames['scores_departement'], n_resamples=CHECK_RESAMPLES, processes=1)
+    if 'clubs' in frames:
+        results['scores_sportifs'] = sport_scores.compute_all(frames['clubs'])['commune']
+    if {'sector', 'correlations', 'clubs', 'scores'} <= set(frames):
+        results['opportunites'] = opportunities.build_opportunities(
+            frames['sector'], frames['correlations'], frames['clubs'])
+    return results
+
+
+def compare(expected, actual):
+    """Columns of two results that differ beyond the tolerance (numbers) or at all (text)."""
+    if expected.shape != actual.shape:
+        return [f"dimensions {expected.shape} ≠ {actual.shape}"]
+    differences = []
+    for column in expected.columns:
+        a, b = expected[column], actual[column]
+        if a.dtype.kind in 'biuf' and b.dtype.kind in 'biuf':
+            if not np.allclose(a.to_numpy(dtype='float64'), b.to_numpy(dtype='float64'),
+                               rtol=RTOL, atol=COLUMN_ATOL.get(column, ATOL), equal_nan=True):
+                differences.append(str(column))
+        elif not (a.astype(str).to_numpy() == b.astype(str).to_numpy()).all():
+            differences.append(str(column))
+    return differences
+
+
+def check(frames):
+    """``{result: differing columns}`` between typed and compact inputs (empty lists when identical)."""
+    expected = _results(frames)
+    actual = _results({name: compact(df.copy()) for name, df in frames.items()})
+    return {name: compare(expected[name].reset_index(drop=True), actual[name].reset_index(drop=True))
+            for name in expected}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Types compacts et dictionnaires partagés des tables")
+    parser.add_argument('command', choices=['report', 'check'])
+    args = parser.parse_args()
+
+    frames = load_typed()
+    if args.command == 'report':
+        report = memory_report(frames)
+        print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        return
+
+    failed = False
+    for name, columns in check(frames).items():
+        failed |= bool(columns)
+        print(f"{name:26} {'écart : ' + ', '.join(columns) if columns else 'identique'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
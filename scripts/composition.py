@@ -0,0 +1,124 @@
+"""Clustering of territories by the sector composition of their economy.
+
+The sector table is long (territory x sector x year). Share vectors are
+built directly as sparse CSR matrices from the categorical codes, with
+duplicates summed by the COO constructor, so commune x 88 sectors x years
+never goes through a dense pivot. Blocks for NA88, NA38 and NA17 are
+stacked side by side and clustered with mini-batch k-means (sparse
+distances) or, for the few hundred départements and zones, Ward
+hierarchical clustering.
+"""
+# Third-party imports
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.cluster.hierarchy import fcluster, linkage
+
+# Constants
+UNITS = {'Département': 'departement', 'Zone': 'zone', 'Code postal': 'code_postal'}
+SECTOR_LEVELS = {'NA88': 'secteur_na88', 'NA38': 'secteur_na38', 'NA17': 'secteur_na17'}
+MEASURES = {"Nombre d'entreprises": 'nb_entreprise', 'Effectifs': 'nb_effectif'}
+BATCH_SIZE = 256
+N_ITERATIONS = 100
+
+
+def share_matrix(df_sector, unit, sector_column, measure='nb_entreprise', year=None):
+    """``(units, sectors, CSR matrix)`` of the share of each sector in each unit's total."""
+    df = df_sector if year is None else df_sector[df_sector['année'] == year]
+    units = df[unit].astype('category')
+    sectors = df[sector_column].astype('category')
+    values = df[measure].to_numpy(dtype='float64')
+    keep = (units.cat.codes.to_numpy() >= 0) & (sectors.cat.codes.to_numpy() >= 0) & ~np.isnan(values)
+    matrix = sparse.coo_matrix(
+        (values[keep], (units.cat.codes.to_numpy()[keep], sectors.cat.codes.to_numpy()[keep])),
+        shape=(len(units.cat.categories), len(sectors.cat.categories))
+    ).tocsr()
+    totals = np.asarray(matrix.sum(axis=1)).ravel()
+    matrix = sparse.diags(np.where(totals > 0, 1 / np.where(totals > 0, totals, 1), 0)) @ matrix
+    return units.cat.categories, sectors.cat.categories, matrix.tocsr()
+
+
+def composition_matrix(df_sector, unit, levels=tuple(SECTOR_LEVELS), measure='nb_entreprise', year=None):
+    """Units x (sectors of every level) share matrix; each level block carries the same weight."""
+    blocks, columns, units = [], [], None
+    for level in levels:
+        level_units, sectors, matrix = share_matrix(df_sector, unit, SECTOR_LEVELS[level], measure, year)
+        if units is None:
+            units = level_units
+        # Même ensemble d'unités pour chaque niveau (les catégories viennent de la même colonne)
+        blocks.append(matrix / np.sqrt(len(levels)))
+        columns += [f"{level} · {sector}" for sector in sectors]
+    return units, pd.Index(columns), sparse.hstack(blocks).tocsr()
+
+
+def _squared_distances(x, centroids):
+    x_norm = np.asarray(x.multiply(x).sum(axis=1))
+    return np.maximum(x_norm - 2 * (x @ centroids.T) + (centroids ** 2).sum(axis=1), 0)
+
+
+def minibatch_kmeans(x, k, batch_size=BATCH_SIZE, n_iter=N_ITERATIONS, seed=0):
+    """Mini-batch k-means (Sculley, 2010) on a sparse matrix; returns ``(labels, centroids)``."""
+    rng = np.random.default_rng(seed)
+    n = x.shape[0]
+    # Initialisation k-means++
+    centroids = [x[rng.integers(n)].toarray()[0]]
+    for _ in range(1, k):
+        d = _squared_distances(x, np.array(centroids)).min(axis=1)
+        p = d / d.sum() if d.sum() > 0 else np.full(n, 1 / n)
+        centroids.append(x[rng.choice(n, p=p)].toarray()[0])
+    centroids = np.array(centroids)
+
+    counts = np.zeros(k)
+    for _ in range(n_iter):
+        batch = x[rng.choice(n, size=min(batch_size, n), replace=False)]
+        nearest = _squared_distances(batch, centroids).argmin(axis=1)
+        dense = batch.toarray()
+        for c in np.unique(nearest):
+            members = dense[nearest == c]
+            counts[c] += len(members)
+            # Pas d'apprentissage 1 / effectif cumulé, appliqué au lot entier
+            centroids[c] += (members.sum(axis=0) - len(members) * centroids[c]) / counts[c]
+    return _squared_distances(x, centroids).argmin(axis=1), centroids
+
+
+def hierarchical(x, k):
+    """Ward clustering (dense, meant for départements and zones); returns ``(labels, centroids)``."""
+    dense = x.toarray()
+    labels = fcluster(linkage(dense, method='ward'), k, criterion='maxclust') - 1
+    centroids = np.array([dense[labels == c].mean(axis=0) for c in range(labels.max() + 1)])
+    return labels, centroids
+
+
+def cluster_composition(df_sector, unit, k, levels=tuple(SECTOR_LEVELS), measure='nb_entreprise',
+                        year=None, method='kmeans', seed=0):
+    """Cluster label of every unit and centroid shares, as ``(labels, centroids)`` DataFrames."""
+    units, columns, x = composition_matrix(df_sector, unit, levels, measure, year)
+    non_empty = np.diff(x.indptr) > 0
+    units, x = units[non_empty], x[non_empty]
+    k = min(k, x.shape[0])
+    if method == 'hierarchique':
+        labels, centroids = hierarchical(x, k)
+    else:
+        labels, centroids = minibatch_kmeans(x, k, seed=seed)
+
+    # Numéroter les groupes par taille décroissante
+    sizes = np.bincount(labels, minlength=len(centroids))
+    order = np.argsort(-sizes, kind='stable')
+    relabel = np.empty_like(order)
+    relabel[order] = np.arange(len(order))
+    df_labels = pd.DataFrame({unit: units, 'groupe': relabel[labels] + 1})
+    # Les blocs étaient pondérés par 1 / sqrt(nombre de niveaux) : revenir aux parts
+    df_centroids = pd.DataFrame(centroids[order] * np.sqrt(len(levels)), columns=columns)
+    df_centroids.insert(0, 'effectif', sizes[order])
+    df_centroids.index = pd.Index(np.arange(1, len(order) + 1), name='groupe')
+    return df_labels, df_centroids
+
+
+def top_sectors(df_centroids, n=5):
+    """Long table of the ``n`` largest centroid shares of each cluster."""
+    shares = df_centroids.drop(columns='effectif')
+    rows = []
+    for cluster, values in shares.iterrows():
+        for sector, share in values.nlargest(n).items():
+            rows.append({'groupe': cluster, 'secteur': sector, 'part': share})
+    return pd.DataFrame(rows)
@@ -0,0 +1,10 @@
+"""Streamlit dashboard, split by concern so that each page only imports what it draws.
+
+``app.py`` is the entry point; it sets the page up and hands every tab to
+its module in :mod:`dashboard.tabs`. Cached loaders live in
+:mod:`dashboard.data`, score aggregates in :mod:`dashboard.aggregations`
+and the shared chart builders in :mod:`dashboard.figures`. Libraries only
+needed by one view (pydeck, scipy-based models, Arrow datasets) are
+imported where that view is rendered, which keeps the first paint of a
+cold replica short; ``scripts/bench_startup.py`` guards that import time.
+"""
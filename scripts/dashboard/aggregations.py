@@ -0,0 +1,24 @@
+"""Yearly score averages of each geographic level."""
+# Standard library imports
+import functools
+
+# Third-party imports
+import streamlit as st
+
+import catalog
+import disk_cache
+import rollup
+from dashboard.data import load_dataset
+
+
+@st.cache(allow_output_mutation=True)
+def _score_averages(version):
+    # Tous les niveaux sortent de la même passe : calculée au plus une fois, au premier niveau absent du disque
+    levels = functools.lru_cache(maxsize=None)(lambda: rollup.score_rollup(load_dataset('scores')))
+    return {level: disk_cache.frame('moyennes', (level, version), lambda level=level: levels()[level])
+            for level in rollup.LEVELS}
+
+
+def score_averages(level):
+    """Mean sport and economic scores of every entity of ``level`` and season."""
+    return _score_averages(catalog.version('moyennes'))[level]
@@ -0,0 +1,55 @@
+"""Paths and static assets of the dashboard."""
+# Standard library imports
+import os
+
+# Constants
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PATHS = {
+    'images': os.path.join(BASE_PATH, "images"),
+    'data': os.path.join(BASE_PATH, "data"),
+    'notebooks': os.path.join(BASE_PATH, "notebooks")
+}
+
+ASSETS = {
+    'logo': os.path.join(PATHS['images'], "logo-vectoriel-le-wagon-removebg-preview.png"),
+    'main_data': os.path.join(PATHS['data'], "main.xlsx"),
+    'notebook': 'notebooks/visu_dpt.ipynb',
+    'jose_gif': os.path.join(PATHS['images'], "jose.gif"),
+    'logo_sporteco': os.path.join(PATHS['images'], "logo sporteco.jpeg"),
+    'lofo_lfp': os.path.join(PATHS['images'], "lofo-lfp.png"),
+    'logo_datagouv': os.path.join(PATHS['images'], "logo-datagouv.png"),
+    'logo_insee': os.path.join(PATHS['images'], "logo-insee.jpg"),
+    'logo_trasnfermarkt': os.path.join(PATHS['images'], "logo-trasnfermarkt.png"),
+    'logo_uefa': os.path.join(PATHS['images'], "logo-uefa.jpeg"),
+    'logocurssaf': os.path.join(PATHS['images'], "logocurssaf.png"),
+    'logofifa': os.path.join(PATHS['images'], "logofifa.png"),
+    'clement': os.path.join(PATHS['images'], "clement.jpeg"),
+    'yohann': os.path.join(PATHS['images'], "yohann.jpeg"),
+    'louis': os.path.join(PATHS['images'], "Photo Louis Tang pro.jpg"),
+    'edriss': os.path.join(PATHS['images'], "edriss.jpeg"),
+    'asana': os.path.join(PATHS['images'], "asana.png"),
+    'bigquery': os.path.join(PATHS['images'], "bigquery.png"),
+    'drive': os.path.join(PATHS['images'], "drive.png"),
+    'python': os.path.join(PATHS['images'], "python-removebg-preview.png"),
+    'vsc': os.path.join(PATHS['images'], "vsc-removebg-preview.png"),
+    'github': os.path.join(PATHS['images'], "github-removebg-preview.png"),
+    'option1': os.path.join(PATHS['images'], "option1.webp"),
+    'option2': os.path.join(PATHS['images'], "option2.webp")
+}
+
+# Color mappings
+REGION_COLORS = {
+    'Île-de-France': 'purple',
+    'Nouvelle-Aquitaine': 'blue',
+    'Auvergne-Rhône-Alpes': 'red',
+    'Bourgogne-Franche-Comté': 'green',
+    'Bretagne': 'orange',
+    'Centre-Val de Loire': 'brown',
+    'Grand Est': 'pink',
+    'Hauts-de-France': 'gray',
+    'Normandie': 'cyan',
+    'Occitanie': 'magenta',
+    'Pays de la Loire': 'yellow',
+    "Provence-Alpes-Côte d'Azur": 'lime'
+}
+
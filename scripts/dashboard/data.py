@@ -0,0 +1,266 @@
+"""Cached loaders of the dashboard.
+
+Models that need pyarrow, scipy or geopandas import their module inside
+the loader, so that the cost is paid by the first view that uses them and
+not by every process start. Each cached function takes the catalog version
+of its inputs as last argument: a data refresh changes the cache key of
+the affected loaders only. Results that are expensive to recompute are
+also kept in the on-disk cache (:mod:`disk_cache`), so a restarted process
+reads them instead of rebuilding them.
+"""
+# Standard library imports
+import os
+import threading
+
+# Third-party imports
+import streamlit as st
+import pandas as pd
+
+import catalog
+import compact
+import disk_cache
+import forecast
+import lags
+import loaders
+import resampling
+import weights
+from dashboard.config import ASSETS
+
+
+@st.cache
+def load_and_prepare_data():
+    """Load and prepare the main dataset with error handling."""
+    try:
+        df = pd.read_excel(ASSETS['main_data'])
+        df.columns = df.columns.str.lower()
+        if 'ville' in df.columns:
+            df['ville'] = df['ville'].str.lower()
+        df = loaders.canonicalize_geography(df)
+        return compact.compact(df) if compact.ENABLED else df
+    except Exception as e:
+        st.error(f"Erreur lors du chargement des données : {str(e)}")
+        return None
+
+
+@st.cache
+def create_filtered_data(df, saison="Toutes", region="Toutes", ville="Toutes"):
+    """Create filtered dataframe based on user selections."""
+    if df is None:
+        return None
+
+    df_filtered = df.copy()
+
+    filters = {
+        'saison': (saison, lambda x: x == saison),
+        'region': (region, lambda x: x == region),
+        'ville': (ville, lambda x: x == ville.lower())
+    }
+
+    for col, (value, condition) in filters.items():
+        if value != "Toutes" and col in df_filtered.columns:
+            df_filtered = df_filtered[df_filtered[col].apply(condition)]
+
+    return df_filtered
+
+
+def load_dataset(name):
+    """Dataset from the shared memory-mapped store when enabled, from its loader otherwise."""
+    import export
+    import shared_data
+
+    if shared_data.ENABLED:
+        return shared_data.load_frame(name)
+    return export.DATASETS[name]()
+
+
+@st.cache(allow_output_mutation=True)
+def _sector_data(version):
+    return load_dataset('sector')
+
+
+def load_sector_data():
+    return _sector_data(catalog.version('clean/sector'))
+
+
+@st.cache(allow_output_mutation=True)
+def get_unique_values(df, column):
+    return sorted(df[column].unique())
+
+
+@st.cache(allow_output_mutation=True)
+def _commune_index(version):
+    import spatial
+
+    return spatial.CommuneIndex.from_geojson()
+
+
+def load_commune_index():
+    """Load commune polygons and centroids into the spatial index once."""
+    return _commune_index(catalog.version('communes.geojson'))
+
+
+@st.cache(allow_output_mutation=True)
+def _clubs_index(clubs_version, communes_version):
+    import spatial
+
+    # Clubs placés au centroïde de leur commune (le classeur ne donne pas de coordonnées)
+    df_clubs = load_dataset('clubs')[['club', 'sport', 'ville', 'code_commune']].astype(str) \
+        .drop_duplicates(['club', 'sport'])
+    return spatial.PointIndex.from_communes(df_clubs, load_commune_index())
+
+
+def load_clubs_index():
+    """Clubs indexed once at the centroid of their commune."""
+    return _clubs_index(catalog.version('clean/clubs'), catalog.version('communes.geojson'))
+
+
+@st.cache(allow_output_mutation=True)
+def _catchment_counts(radius_km, clubs_version, communes_version):
+    import spatial
+
+    return spatial.catchment_club_counts(load_commune_index(), load_clubs_index(), radius_km)
+
+
+def load_catchment_counts(radius_km):
+    """Clubs within ``radius_km`` of every commune, keyed by INSEE code."""
+    return _catchment_counts(radius_km, catalog.version('clean/clubs'), catalog.version('communes.geojson'))
+
+
+@st.cache(allow_output_mutation=True)
+def _score_workbooks(version):
+    import table_viewer
+
+    return table_viewer.list_workbooks()
+
+
+def list_score_workbooks():
+    """List the Excel files of the scores archive and their sheets."""
+    return _score_workbooks(catalog.version('Scores-final.zip'))
+
+
+@st.cache(allow_output_mutation=True)
+def _sheet_view(file_name, sheet_name, version):
+    import table_viewer
+
+    return table_viewer.SheetView(table_viewer.load_sheet(file_name, sheet_name))
+
+
+def get_sheet_view(file_name, sheet_name):
+    """Memory-mapped, index-backed view of one score sheet."""
+    return _sheet_view(file_name, sheet_name, catalog.version('feuilles'))
+
+
+@st.cache(allow_output_mutation=True)
+def _weight_model(level, version):
+    return weights.WeightModel(weights.build_components(loaders.load_main_table()), level)
+
+
+def load_weight_model(level):
+    """Normalised score components of one geographic level, stacked once."""
+    return _weight_model(level, catalog.version('clean/main_table'))
+
+
+@st.cache(allow_output_mutation=True)
+def _lag_table(level, version):
+    if os.path.exists(lags.result_path(level, version)):
+        return pd.read_csv(lags.result_path(level, version))
+    return disk_cache.frame('decalages', (level, version),
+                            lambda: lags.lag_table(load_dataset('scores'), level))
+
+
+def load_lag_table(level):
+    """Lagged sport/economy correlations of every entity of one level."""
+    return _lag_table(level, catalog.version('decalages'))
+
+
+@st.cache(allow_output_mutation=True)
+def _correlation_intervals(level, version):
+    if os.path.exists(resampling.result_path(level, version)):
+        return pd.read_csv(resampling.result_path(level, version))
+    return disk_cache.frame(
+        'intervalles', (level, version),
+        lambda: resampling.score_correlation_intervals(load_dataset('scores'), level, processes=1)
+    )
+
+
+def load_correlation_intervals(level):
+    """Bootstrap intervals and permutation p-values of the score correlations."""
+    return _correlation_intervals(level, catalog.version('intervalles'))
+
+
+@st.cache(allow_output_mutation=True)
+def _trajectory_index(version):
+    import similarity
+
+    return similarity.TrajectoryIndex(load_dataset('scores'), 'ville')
+
+
+def load_trajectory_index():
+    """Nearest-neighbour index over the city score trajectories, built once per version."""
+    return _trajectory_index(catalog.version('clean/scores'))
+
+
+@st.cache(allow_output_mutation=True)
+def _forecasts(level, version):
+    return forecast.load_forecasts(level)
+
+
+def load_forecasts(level):
+    """Next-season score forecasts of one level, cached on disk by catalog version."""
+    return _forecasts(level, catalog.version('previsions'))
+
+
+@st.cache(allow_output_mutation=True)
+def _sector_clusters(unit, levels, measure, year, k, method, version):
+    import composition
+
+    key = (unit, levels, measure, year, k, method, version)
+    clusters = {}
+
+    def compute(part):
+        if not clusters:
+            clusters['labels'], clusters['centroids'] = composition.cluster_composition(
+                load_sector_data(), unit, k, levels, measure, year, method)
+        return clusters[part]
+
+    return (disk_cache.frame('groupes', key + ('labels',), lambda: compute('labels')),
+            disk_cache.frame('groupes', key + ('centroids',), lambda: compute('centroids')))
+
+
+def get_sector_clusters(unit, levels, measure, year, k, method):
+    return _sector_clusters(unit, levels, measure, year, k, method, catalog.version('clean/sector'))
+
+
+@st.cache(allow_output_mutation=True)
+def _live_scores(level, version):
+    import live_scores
+
+    return live_scores.load_live_scores(level)
+
+
+def load_live_scores(level):
+    """In-season sport scores of one level (None before the first ingested results)."""
+    return _live_scores(level, catalog.version('direct'))
+
+
+def warm_up():
+    """Compute the results every first visit needs: score averages, lags, intervals, forecasts."""
+    from dashboard.aggregations import score_averages
+
+    for level in lags.LEVELS:
+        score_averages(level)
+        load_lag_table(level)
+        load_forecasts(level)
+    load_correlation_intervals('departement')
+
+
+@st.cache(allow_output_mutation=True)
+def start_warm_up():
+    """Warm the caches in the background once per server process (first render is not delayed)."""
+    def run():
+        disk_cache.preload()
+        warm_up()
+
+    thread = threading.Thread(target=run, name='warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,108 @@
+"""Chart builders shared by several tabs."""
+# Third-party imports
+import pandas as pd
+import plotly.graph_objects as go
+
+import catalog
+import disk_cache
+from dashboard.data import load_forecasts
+
+# Mise en page commune : fond transparent, marges réduites
+TRANSPARENT_LAYOUT = dict(
+    margin=dict(l=20, r=20, t=40, b=20),
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)'
+)
+
+
+def add_forecast_traces(fig, df_history, level, entity):
+    """Extend the score curves of ``fig`` with the dashed next-season forecast and its interval."""
+    df_forecast = load_forecasts(level)
+    row = df_forecast[df_forecast[level] == str(entity)]
+    if row.empty or df_history.empty:
+        return
+    row = row.iloc[0]
+    last = df_history.iloc[-1]
+    # Pas de prévision, ou historique qui ne s'arrête pas à la saison précédant la prévision
+    if pd.isna(row['score_sportif_prevision']) or last['annee'] != row['annee'] - 1:
+        return
+    for score, label, color in [('score_sportif', 'Score Sportif', 'blue'),
+                                ('score_economique', 'Score Économique', 'red')]:
+        low, high = row[f'{score}_bas'], row[f'{score}_haut']
+        fig.add_trace(go.Scatter(
+            x=[last['annee'], row['annee']], y=[last[score], row[f'{score}_prevision']],
+            mode='lines+markers', name=f"{label} (prévision)", line=dict(color=color, dash='dash'),
+            error_y=dict(type='data', symmetric=False, array=[0, high - row[f'{score}_prevision']],
+                         arrayminus=[0, row[f'{score}_prevision'] - low], visible=bool(pd.notna(low))),
+            hovertext=[None, f"Modèle : {row[f'{score}_modele']}"]
+        ))
+
+
+def score_evolution_figure(df_history, level, entity, title):
+    """Sport and economic scores of one entity over the seasons, with the forecast.
+
+    The figure is kept in the on-disk cache, keyed by the content of
+    ``df_history`` and the version of the forecasts.
+    """
+    history_hash = pd.util.hash_pandas_object(df_history[['annee', 'score_sportif', 'score_economique']],
+                                              index=False).sum()
+    key = (level, entity, title, history_hash, catalog.version('previsions'))
+    return disk_cache.figure('evolution', key,
+                             lambda: _score_evolution_figure(df_history, level, entity, title))
+
+
+def _score_evolution_figure(df_history, level, entity, title):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df_history["annee"], y=df_history["score_sportif"],
+                             mode='lines+markers', name='Score Sportif',
+                             line=dict(color='blue')))
+    fig.add_trace(go.Scatter(x=df_history["annee"], y=df_history["score_economique"],
+                             mode='lines+markers', name='Score Économique',
+                             line=dict(color='red')))
+    add_forecast_traces(fig, df_history, level, entity)
+    fig.update_layout(
+        title=title,
+        xaxis_title="Année",
+        yaxis_title="Score",
+        showlegend=True,
+        height=500,
+        **TRANSPARENT_LAYOUT
+    )
+    return fig
+
+
+def club_pie_figure(sport_counts, title):
+    """Share of the clubs of each sport (``sport_counts``: counts indexed by sport)."""
+    fig = go.Figure(data=[go.Pie(labels=sport_counts.index, values=sport_counts.values)])
+    fig.update_layout(
+        title=title,
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+
+def department_map_figure(geojson, codes, values, highlight=None, height=400):
+    """Choropleth of the correlation of some départements, zoomed on them.
+
+    Drawn without a tile background so that it renders offline; the
+    départements whose code is in ``highlight`` get a thick outline. Only
+    the drawn features are embedded in the figure.
+    """
+    highlight = set(() if highlight is None else highlight)
+    drawn = set(codes)
+    geojson = dict(geojson, features=[feat for feat in geojson['features'] if feat['properties']['code'] in drawn])
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson,
+        locations=list(codes),
+        z=list(values),
+        featureidkey="properties.code",
+        colorscale=[[0, 'rgb(255,255,255)'], [1, 'rgb(0,0,139)']],
+        zmin=-1,
+        zmax=1,
+        marker_line_width=[3 if code in highlight else 0.5 for code in codes],
+        colorbar_title="Corrélation"
+    ))
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(height=height, margin=dict(l=0, r=0, t=0, b=0), paper_bgcolor='rgba(0,0,0,0)')
+    return fig
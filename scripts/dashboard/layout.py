@@ -0,0 +1,74 @@
+"""Page chrome shared by every tab: stylesheet, header and small widgets."""
+# Standard library imports
+import base64
+import os
+
+# Third-party imports
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from dashboard.config import ASSETS, PATHS
+
+
+def load_css():
+    """Inject the stylesheet of ``images/style.css``."""
+    css_file = os.path.join(PATHS['images'], 'style.css')
+    try:
+        with open(css_file) as f:
+            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    except FileNotFoundError:
+        st.warning(f"Le fichier CSS n'a pas été trouvé : {css_file}")
+
+
+@st.cache(allow_output_mutation=True)
+def image_base64(path):
+    """Base64 content of an image, read once per server process."""
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+def center_text(text, size=1):
+    """Centers text with specified heading size."""
+    st.markdown(f"<h{size} style='text-align: center;'>{text}</h{size}>", unsafe_allow_html=True)
+
+
+def render_header():
+    """Banner with the logos and the title of the application."""
+    st.markdown("""
+        <div class="header-container">
+            <div style="display: flex; align-items: center; justify-content: space-between;">
+                <div class="logo-container" style="flex: 1;">
+                    <img src="data:image/gif;base64,{}" style="width: 100%; border-radius: 10px;">
+                </div>
+                <div class="title-container" style="flex: 3; margin: 0 2rem;">
+                    <h1 class="header-title">Drwatobut</h1>
+                    <h2 class="header-subtitle">Sport et économie : un duo gagnant pour nos villes !</h2>
+                </div>
+                <div class="logo-container" style="flex: 1;">
+                    <img src="data:image/png;base64,{}" style="width: 100%; border-radius: 10px;">
+                </div>
+            </div>
+        </div>
+    """.format(image_base64(ASSETS['jose_gif']), image_base64(ASSETS['logo'])), unsafe_allow_html=True)
+
+
+def render_export(name, filters, key):
+    """Download widget streaming the current selection out of the columnar store."""
+    import catalog
+    import export
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Format d'export", list(export.FORMATS), key=f"{key}_format")
+    mime, suffix = export.FORMATS[fmt]
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button(f"Préparer l'export ({export.count_rows(name, filters)} lignes)", key=f"{key}_prepare"):
+            try:
+                # st.download_button n'accepte pas les fichiers temporaires : contenu lu en bytes
+                with export.export_file(name, fmt, filters) as f:
+                    data = f.read()
+                st.download_button("Télécharger", data=data,
+                                   file_name=f"{key}-{catalog.version(f'store/{name}')[:8]}{suffix}", mime=mime, key=f"{key}_download")
+            except (ValueError, OSError, StreamlitAPIException) as e:
+                st.error(f"Export impossible : {e}")
@@ -0,0 +1 @@
+"""One module per tab of the dashboard, each exposing ``render()``."""
@@ -0,0 +1,284 @@
+"""Accueil: presentation of the project, its sources and the score file explorer."""
+# Standard library imports
+import os
+import zipfile
+
+# Third-party imports
+import streamlit as st
+import plotly.graph_objects as go
+
+from dashboard.config import ASSETS, PATHS
+from dashboard.data import get_sheet_view, list_score_workbooks
+from dashboard.layout import center_text, image_base64
+
+
+def render():
+    orga_tab, info_tab = st.tabs(["Vue générale", "Infos Supplémentaires"])
+
+    with orga_tab:
+        render_overview()
+
+    with info_tab:
+        render_info()
+
+
+def render_overview():
+    # Ajout du titre principal
+    st.markdown("<h2 style='text-align: center;'>Les performances sportives impactent-elles l'économie d'une ville ?</h2>", unsafe_allow_html=True)
+
+    # Création de la pyramide inversée
+    fig = go.Figure()
+
+    # Définition des niveaux et des valeurs
+    levels = ['France', 'Région', 'Département', 'Votre choix']
+    values = [100, 75, 50, 25]
+
+    # Création du graphique en entonnoir
+    fig.add_trace(go.Funnel(
+        name='Pyramide',
+        y=levels,
+        x=values,
+        textinfo="label",
+        textposition="inside",
+        textfont=dict(
+            color=['white', 'white', 'white', 'white'],  # Tous les niveaux en blanc
+            size=20  # Augmentation de la taille du texte
+        ),
+        marker=dict(
+            color=['#ADD8E6', '#6495ED', '#4169E1', '#00008B']  # Dégradé de bleu clair à bleu foncé
+        )
+    ))
+
+    # Mise en page
+    fig.update_layout(
+        showlegend=False,
+        margin=dict(l=20, r=20, t=20, b=20),
+        funnelmode="stack",
+        height=500,
+        yaxis=dict(showticklabels=False),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+
+    # Afficher le graphique
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+    st.markdown("<br>", unsafe_allow_html=True)  # Ajouter un espace
+
+    # Création des conteneurs pour les scores
+    score_sportif, score_economique = st.columns(2)
+
+    with score_sportif:
+        center_text("Score Sportif", 3)
+        st.markdown("""
+        <div class="sport-container">
+            <div class="sport-list">
+                <div class="title">5 sports collectifs</div>
+                <div class="sport-item">⚽ Football</div>
+                <div class="sport-item">🏉 Rugby</div>
+                <div class="sport-item">🏀 Basketball</div>
+                <div class="sport-item">🤾 Handball</div>
+                <div class="sport-item">🏑 Hockey</div>
+            </div>
+            <div class="criteria-list">
+                <div class="title">Critères d'évaluation</div>
+                <div class="criteria-item">
+                    🏆 Performance Sportive
+                    <div class="sub-criteria">• Classement</div>
+                    <div class="sub-criteria">• Division</div>
+                    <div class="sub-criteria">• Parcours européen</div>
+                </div>
+                <div class="criteria-item">👥 Affluence (foot uniquement)</div>
+                <div class="criteria-item">💰 Données économique de clubs (Foot uniquement)</div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with score_economique:
+        center_text("Score Économique", 3)
+        st.markdown("""
+        <div class="eco-container">
+            <div class="geo-list">
+                <div class="title">Base Géographique</div>
+                <div class="eco-item">🏙️ Ville</div>
+                <div class="eco-item">🏛️ Département</div>
+                <div class="eco-item">🗺️ Région</div>
+            </div>
+            <div class="criteria-list">
+                <div class="title">📊 Indicateurs économiques</div>
+                <div class="criteria-item">
+                    Taux de chômage
+                </div>
+                <div class="criteria-item">
+                    Salaire Median
+                </div>
+                <div class="criteria-item">
+                    Nombre de création d'entreprises
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Ajout d'espace avant la section "Nos Sources"
+    st.markdown("<div style='margin-top: 40px;'></div>", unsafe_allow_html=True)
+
+    # Ajout de la section "Nos Sources"
+    center_text("Nos Sources", 3)
+
+    # Container pour centrer le contenu
+    container = st.container()
+    with container:
+        # Première ligne de logos
+        _, col1, col2, col3, col4, _ = st.columns([0.5, 1, 1, 1, 1, 0.5])
+        with col1:
+            st.image(ASSETS['lofo_lfp'], width=100)
+        with col2:
+            st.image(ASSETS['logo_datagouv'], width=100)
+        with col3:
+            st.image(ASSETS['logo_insee'], width=100)
+        with col4:
+            st.image(ASSETS['logo_trasnfermarkt'], width=100)
+
+        # Espacement
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        # Deuxième ligne de logos avec colonnes centrées
+        _, col1, col2, col3, _ = st.columns([0.5, 1, 1, 1, 0.5])
+        with col1:
+            st.image(ASSETS['logo_uefa'], width=100)
+        with col2:
+            st.image(ASSETS['logocurssaf'], width=100)
+        with col3:
+            st.image(ASSETS['logofifa'], width=100)
+
+    # Notre équipe
+    st.markdown("---")
+    st.markdown("<h3 style='text-align: center;'>Notre équipe</h3>", unsafe_allow_html=True)
+
+    # Créer le HTML pour tous les membres en une seule fois
+    team_html = f'''
+    <div class="team-section">
+        <div class="team-container">
+            <div class="team-member">
+                <img src="data:image/jpeg;base64,{image_base64(ASSETS['clement'])}"/>
+                <div class="team-name">Clément ROSSI</div>
+            </div>
+            <div class="team-member">
+                <img src="data:image/jpeg;base64,{image_base64(ASSETS['yohann'])}"/>
+                <div class="team-name">Yohann CEBALS</div>
+            </div>
+            <div class="team-member">
+                <img src="data:image/jpeg;base64,{image_base64(ASSETS['louis'])}"/>
+                <div class="team-name">Louis TANG</div>
+            </div>
+            <div class="team-member">
+                <img src="data:image/jpeg;base64,{image_base64(ASSETS['edriss'])}"/>
+                <div class="team-name">Edriss BEN JEMAA</div>
+            </div>
+        </div>
+    </div>
+    '''
+
+    st.markdown(team_html, unsafe_allow_html=True)
+
+
+def render_info():
+    import table_viewer
+
+    st.markdown("<h3 style='text-align: center;'>Notre organisation</h3>", unsafe_allow_html=True)
+
+    # First row of images
+    _, col1, col2, col3, _ = st.columns([0.5, 1, 1, 1, 0.5])
+
+    with col1:
+        st.image(ASSETS['asana'], caption="Asana", use_column_width=True)
+    with col2:
+        st.image(ASSETS['bigquery'], caption="BigQuery", use_column_width=True)
+    with col3:
+        st.image(ASSETS['drive'], caption="Drive", use_column_width=True)
+
+    # Add some spacing between rows
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Second row of images
+    _, col4, col5, col6, _ = st.columns([0.5, 1, 1, 1, 0.5])
+
+    with col4:
+        st.image(ASSETS['python'], use_column_width=True)
+        st.markdown("<p style='text-align: center;'>Python</p>", unsafe_allow_html=True)
+    with col5:
+        st.image(ASSETS['vsc'], use_column_width=True)
+        st.markdown("<p style='text-align: center;'>Visual Studio Code</p>", unsafe_allow_html=True)
+    with col6:
+        st.image(ASSETS['github'], use_column_width=True)
+        st.markdown("<p style='text-align: center;'>GitHub</p>", unsafe_allow_html=True)
+
+    # Ajout d'un séparateur
+    st.markdown("---")
+
+    # Explorateur des fichiers de scores : seule la page visible est envoyée au navigateur
+    zip_path = os.path.join(PATHS['data'], "Scores-final.zip")
+    try:
+        workbooks = list_score_workbooks()
+
+        if not workbooks:
+            st.error("Aucun fichier Excel trouvé dans le dossier Scores")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_file = st.selectbox("Sélectionner un fichier:", list(workbooks))
+            with col2:
+                selected_sheet = st.selectbox("Sélectionner une feuille:", workbooks[selected_file])
+
+            sheet_view = get_sheet_view(selected_file, selected_sheet)
+
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                visible_columns = st.multiselect("Colonnes", sheet_view.columns, default=sheet_view.columns,
+                                                 key='viewer_columns')
+            with col2:
+                sort_by = st.selectbox("Trier par", ['Aucun tri'] + sheet_view.columns, key='viewer_sort')
+            with col3:
+                descending = st.checkbox("Ordre décroissant", key='viewer_desc')
+
+            col1, col2 = st.columns(2)
+            with col1:
+                filter_column = st.selectbox("Filtrer sur", ['Aucun filtre'] + sheet_view.columns, key='viewer_filter')
+            row_mask = None
+            with col2:
+                if filter_column != 'Aucun filtre' and sheet_view.is_numeric(filter_column):
+                    low, high = sheet_view.value_range(filter_column)
+                    if low is not None and low < high:
+                        bounds = st.slider("Intervalle", float(low), float(high), (float(low), float(high)),
+                                           key='viewer_range')
+                        row_mask = sheet_view.mask(filter_column, value_range=bounds)
+                elif filter_column != 'Aucun filtre':
+                    text = st.text_input("Contient", key='viewer_text')
+                    row_mask = sheet_view.mask(filter_column, text=text)
+
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                page_size = st.selectbox("Lignes par page", table_viewer.PAGE_SIZES, key='viewer_page_size')
+            n_matching = sheet_view.table.num_rows if row_mask is None else int(row_mask.sum())
+            n_pages = max(1, -(-n_matching // page_size))
+            with col2:
+                page = st.number_input(f"Page (sur {n_pages})", min_value=1, value=1, key='viewer_page')
+            page = min(page, n_pages)
+
+            df_page, n_rows, elapsed_ms = sheet_view.query(
+                columns=visible_columns,
+                sort_by=None if sort_by == 'Aucun tri' else sort_by,
+                descending=descending,
+                mask=row_mask,
+                offset=(page - 1) * page_size,
+                limit=page_size
+            )
+            st.caption(f"{n_rows} lignes sur {sheet_view.table.num_rows} · requête en {elapsed_ms:.1f} ms")
+            st.dataframe(df_page, use_container_width=True)
+
+    except FileNotFoundError:
+        st.error(f"Le fichier zip n'a pas été trouvé à l'emplacement : {zip_path}")
+    except zipfile.BadZipFile:
+        st.error("Le fichier zip est corrompu ou n'est pas un fichier zip valide")
+    except Exception as e:
+        st.error(f"Erreur lors de la lecture du fichier : {str(e)}")
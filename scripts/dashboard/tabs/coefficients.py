@@ -0,0 +1,283 @@
+"""Nos Analyses · Les coefficients: score cards, lags, score evolution and nearby clubs."""
+# Standard library imports
+import os
+
+# Third-party imports
+import streamlit as st
+import plotly.graph_objects as go
+
+import loaders
+from dashboard.aggregations import score_averages
+from dashboard.data import (load_catchment_counts, load_clubs_index, load_commune_index, load_dataset,
+                            load_lag_table, load_live_scores, load_trajectory_index)
+from dashboard.figures import score_evolution_figure
+from dashboard.layout import render_export
+
+
+def render():
+    df_scores = load_dataset('scores')
+    df_region = score_averages('region')
+    df_dept = score_averages('departement')
+    df_city = score_averages('ville')
+
+    st.markdown("<h3 style='text-align: center;'>Analyse de coefficients</h3>", unsafe_allow_html=True)
+
+    # Sélecteur de granularité
+    granularity = st.selectbox(
+        'Sélectionnez une granularité',
+        ['Région', 'Département', 'Ville'],
+        index=0
+    )
+
+    # Préparation des données selon la granularité
+    group_by_col = {'Région': 'region', 'Département': 'departement', 'Ville': 'ville'}[granularity]
+    df_analysis = score_averages(group_by_col)
+    df_raw = df_scores
+
+    # Calcul des scores
+    current_year = df_analysis['annee'].max()
+    current_data = df_analysis[df_analysis['annee'] == current_year]
+    current_raw_data = df_raw[df_raw['annee'] == current_year]
+
+    mean_eco = current_data['score_economique'].mean()
+    mean_sport = current_data['score_sportif'].mean()
+
+    # Utiliser les données brutes pour les tops
+    top_eco = current_raw_data.nlargest(1, 'score_economique')
+    top_sport = current_raw_data.nlargest(1, 'score_sportif')
+
+    # Affichage des score cards
+    col1, col2, col3, col4 = st.columns(4)
+
+    card_style = """
+    <div style="
+        padding: 20px;
+        border-radius: 10px;
+        background-color: white;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        text-align: center;
+        margin: 10px;
+    ">
+        <h4 style="color: #666;">{}</h4>
+        <h2 style="color: #343a40;">{:.2f}</h2>
+        <p style="color: #666; font-size: 0.9em;">{}</p>
+    </div>
+    """
+
+    with col1:
+        st.markdown(card_style.format(
+            "Moyenne Score Économique",
+            mean_eco,
+            f"Moyenne {granularity.lower()}s"
+        ), unsafe_allow_html=True)
+    with col2:
+        st.markdown(card_style.format(
+            "Moyenne Score Sportif",
+            mean_sport,
+            f"Moyenne {granularity.lower()}s"
+        ), unsafe_allow_html=True)
+    with col3:
+        st.markdown(card_style.format(
+            "Top 1 Score Économique",
+            float(top_eco['score_economique'].iloc[0]),
+            f"{top_eco[group_by_col].iloc[0]}"
+        ), unsafe_allow_html=True)
+    with col4:
+        st.markdown(card_style.format(
+            "Top 1 Score Sportif",
+            float(top_sport['score_sportif'].iloc[0]),
+            f"{top_sport[group_by_col].iloc[0]}"
+        ), unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)  # Add some spacing
+
+    # Corrélations décalées : le sport précède-t-il l'économie ?
+    st.subheader("Le sport précède-t-il l'économie ?")
+    df_lags = load_lag_table(group_by_col)
+    lag_columns = [c for c in df_lags.columns if c.startswith('decalage_')]
+    lag_values = [int(c.split('_')[1]) for c in lag_columns]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        min_strength = st.slider("Force minimale de la corrélation", 0.0, 1.0, 0.5, 0.05, key='lag_min_strength')
+        df_strong = df_lags[df_lags['force'].abs() >= min_strength]
+        lag_counts = df_strong['meilleur_decalage'].value_counts().reindex(lag_values, fill_value=0)
+        fig_lags = go.Figure(go.Bar(
+            x=lag_values, y=lag_counts.values,
+            marker_color=['#e74c3c' if lag < 0 else '#2ecc71' if lag > 0 else '#0aa2bf' for lag in lag_values]
+        ))
+        fig_lags.update_layout(
+            title=f"Meilleur décalage par {granularity.lower()} ({len(df_strong)} entités)",
+            xaxis_title="Décalage (saisons) : < 0 l'économie précède, > 0 le sport précède",
+            yaxis_title="Nombre d'entités",
+            height=400,
+            margin=dict(l=20, r=20, t=40, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_lags, use_container_width=True, config={'displayModeBar': False})
+    with col2:
+        lag_entity = st.selectbox(f"Profil d'un(e) {granularity.lower()}", df_lags[group_by_col], key='lag_entity')
+        lag_row = df_lags[df_lags[group_by_col] == lag_entity].iloc[0]
+        fig_profile = go.Figure(go.Bar(x=lag_values, y=lag_row[lag_columns].astype(float).values,
+                                       marker_color='#0aa2bf'))
+        fig_profile.update_layout(
+            title=f"Corrélation croisée pour {lag_entity}",
+            xaxis_title="Décalage (saisons)",
+            yaxis_title="Corrélation",
+            yaxis_range=[-1, 1],
+            height=400,
+            margin=dict(l=20, r=20, t=40, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_profile, use_container_width=True, config={'displayModeBar': False})
+
+    # Evolution des scores par région au cours du temps
+    st.subheader("Evolution des scores par région au cours du temps")
+
+    # Sélecteur de région
+    regions = sorted(df_region['region'].unique())
+    selected_region = st.selectbox('Sélectionnez une région', regions)
+
+    # Filtrer les données pour la région sélectionnée
+    df_region_filtered = df_region[df_region['region'] == selected_region]
+    df_region_filtered = df_region_filtered.sort_values('annee')
+
+    fig_region = score_evolution_figure(df_region_filtered, 'region', selected_region,
+                                        f"Evolution des scores pour la région {selected_region}")
+    st.plotly_chart(fig_region, use_container_width=True, config={'displayModeBar': False})
+    render_export('scores', {'region': selected_region}, key='export_scores_region')
+
+    # Afficher les clubs de la région sélectionnée
+    df_clubs_region = load_dataset('clubs')
+
+    # Mapping des sports pour normalisation
+    sport_mapping = {
+        'basket': 'Basketball',
+        'football': 'Football',
+        'handball': 'Handball',
+        'hockey': 'Hockey',
+        'rugby': 'Rugby'
+    }
+
+    # Normaliser les sports uniquement
+    df_clubs_region['sport'] = df_clubs_region['sport'].map(sport_mapping)
+
+    # Filtrer les clubs de la région sélectionnée (utiliser le nom exact de la région)
+    df_clubs_region = df_clubs_region[df_clubs_region['region'] == selected_region]
+    clubs_region = df_clubs_region[['club', 'sport']].drop_duplicates().sort_values(['sport', 'club'])
+
+    st.markdown("---")  # Ajout d'une ligne de séparation
+    st.write(f"### Clubs de la région ({len(clubs_region)})")
+
+    # Créer des colonnes pour chaque sport
+    sports = sorted(clubs_region['sport'].unique())
+    if sports:  # Vérifier qu'il y a des sports à afficher
+        cols = st.columns(len(sports))
+        for idx, sport in enumerate(sports):
+            with cols[idx]:
+                clubs_in_sport = clubs_region[clubs_region['sport'] == sport]
+                clubs_count = len(clubs_in_sport)
+                st.markdown(f"**{sport.capitalize()} ({clubs_count})**")
+                for club in sorted(clubs_in_sport['club']):
+                    st.write(f"• {club}")
+
+    # Classements de la saison en cours (résultats ingérés par live_scores.py)
+    df_live = load_live_scores('club')
+    if df_live is not None:
+        current_season = df_live['fin_saison'].max()
+        df_live_region = df_live[(df_live['region'].astype(str) == str(selected_region))
+                                 & (df_live['fin_saison'] == current_season)]
+        if len(df_live_region):
+            with st.expander(f"Classements en direct · saison {current_season}"):
+                st.dataframe(df_live_region[['club', 'sport', 'division', 'classement', 'score']]
+                             .sort_values(['sport', 'division', 'classement']).round(3),
+                             use_container_width=True, hide_index=True)
+
+    # Evolution des scores par département au cours du temps
+    st.subheader("Evolution des scores par département au cours du temps")
+
+    # Sélecteur de département
+    departements = sorted(df_dept['departement'].unique())
+    selected_dept = st.selectbox('Sélectionnez un département', departements)
+
+    # Filtrer les données pour le département sélectionné
+    df_dept_filtered = df_dept[df_dept['departement'] == selected_dept]
+    df_dept_filtered = df_dept_filtered.sort_values('annee')
+
+    fig_dept = score_evolution_figure(df_dept_filtered, 'departement', selected_dept,
+                                      f"Evolution des scores pour le département {selected_dept}")
+    st.plotly_chart(fig_dept, use_container_width=True, config={'displayModeBar': False})
+
+    st.markdown("---")  # Ajout d'une ligne de séparation
+
+    # Evolution des scores par commune au cours du temps
+    st.subheader("Evolution des scores par commune au cours du temps")
+
+    # Sélecteur de commune
+    villes = sorted(df_city['ville'].unique())
+    selected_ville = st.selectbox('Sélectionnez une ville', villes, key='ville_selector')
+
+    # Filtrer les données pour la ville sélectionnée
+    df_ville_filtered = df_city[df_city['ville'] == selected_ville]
+    df_ville_filtered = df_ville_filtered.sort_values('annee')
+
+    fig_ville = score_evolution_figure(df_ville_filtered, 'ville', selected_ville,
+                                       f"Evolution des scores pour la ville de {selected_ville}")
+    st.plotly_chart(fig_ville, use_container_width=True, config={'displayModeBar': False})
+
+    # Villes dont les trajectoires sport / économie ressemblent le plus à la ville choisie
+    st.subheader("Trajectoires similaires")
+    trajectory_index = load_trajectory_index()
+    if selected_ville in trajectory_index.entities:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            n_similar = st.slider("Nombre de villes", 3, 25, 10, key='similar_k')
+            use_dtw = st.checkbox("Alignement temporel (DTW)", key='similar_dtw')
+            df_similar, elapsed_ms = trajectory_index.similar(selected_ville, n_similar,
+                                                              'dtw' if use_dtw else 'euclidean')
+            st.dataframe(df_similar.round(3), use_container_width=True)
+            st.caption(f"Recherche en {elapsed_ms:.1f} ms")
+        with col2:
+            fig_similar = go.Figure()
+            for ville_name in [selected_ville] + df_similar['ville'].head(3).tolist():
+                i = trajectory_index.entities.get_loc(ville_name)
+                fig_similar.add_trace(go.Scatter(
+                    x=trajectory_index.seasons, y=trajectory_index.sport[i], mode='lines',
+                    name=ville_name, line=dict(width=4 if ville_name == selected_ville else 2)
+                ))
+            fig_similar.update_layout(
+                title="Score sportif normalisé (z-score)",
+                xaxis_title="Année",
+                yaxis_title="Écart à la moyenne (écarts-types)",
+                height=400,
+                margin=dict(l=20, r=20, t=40, b=20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig_similar, use_container_width=True, config={'displayModeBar': False})
+    else:
+        st.info(f"Pas assez de saisons pour comparer la trajectoire de {selected_ville}.")
+
+    # Clubs dans un rayon autour de la commune sélectionnée (index spatial)
+    st.markdown("---")
+    st.subheader("Clubs à proximité")
+    if not os.path.exists(loaders.COMMUNES_GEOJSON):
+        st.info("Le fichier des contours des communes (data/communes.geojson) est absent : "
+                "lancez `python scripts/tiles.py fetch`.")
+    else:
+        commune_index = load_commune_index()
+        radius_km = st.slider("Rayon (km)", min_value=5, max_value=100, value=30, step=5, key='radius_km')
+        selected_code = str(df_ville_filtered['code_commune'].iloc[0]).zfill(5)
+        if selected_code in commune_index.position.index:
+            nearby_clubs = load_clubs_index().within(commune_index.centroid(selected_code), radius_km)
+            # Bassin de clubs comparé à celui de toutes les communes, pour le même rayon
+            catchment = load_catchment_counts(radius_km)
+            share = (catchment < catchment[selected_code]).mean()
+            st.write(f"{len(nearby_clubs)} club(s) à moins de {radius_km} km de {selected_ville}, "
+                     f"plus que {share:.0%} des communes")
+            st.dataframe(nearby_clubs[['club', 'sport', 'ville', 'distance_km']].round({'distance_km': 1}),
+                         use_container_width=True, hide_index=True)
+        else:
+            st.warning(f"La commune {selected_ville} n'a pas été trouvée dans les contours des communes.")
@@ -0,0 +1,116 @@
+"""Nos Analyses · Emplacement: correlation map of départements and commune score tiles."""
+# Standard library imports
+import json
+import os
+
+# Third-party imports
+import streamlit as st
+import plotly.graph_objects as go
+
+import loaders
+from dashboard.config import PATHS
+
+
+def render():
+    import tiles
+
+    st.markdown("<h3 style='text-align: center;'>Carte des corrélations par département</h3>", unsafe_allow_html=True)
+
+    # Charger les données de corrélation (typées à l'ingestion)
+    df_corr = loaders.load_department_correlations()
+    registry = loaders.load_registry()
+
+    # Charger le GeoJSON des départements français
+    geojson_path = os.path.join(PATHS['data'], "departements.geojson")
+
+    try:
+        with open(geojson_path, 'r') as f:
+            departements = json.load(f)
+
+        # Créer la carte choroplèthe
+        fig_map = go.Figure(go.Choroplethmapbox(
+            geojson=departements,
+            locations=registry.code_of(df_corr['departement'], 'departement'),
+            z=df_corr['correlation_departement'],
+            colorscale=[[0, 'rgb(255,255,255)'], [1, 'rgb(0,0,139)']],  # De blanc à bleu foncé
+            zmin=-1,
+            zmax=1,
+            marker_opacity=0.7,
+            marker_line_width=0.5,
+            colorbar_title="Corrélation",
+            featureidkey="properties.code"
+        ))
+
+        # Mise à jour du layout
+        fig_map.update_layout(
+            mapbox_style="carto-positron",
+            mapbox=dict(
+                center=dict(lat=46.5, lon=2.5),
+                zoom=4.5
+            ),
+            height=600,
+            margin={"r":0,"t":0,"l":0,"b":0}
+        )
+
+        # Afficher la carte
+        st.plotly_chart(fig_map, use_container_width=True)
+
+    except FileNotFoundError:
+        st.error("Le fichier GeoJSON des départements n'a pas été trouvé. Veuillez vérifier le chemin du fichier.")
+    except Exception as e:
+        st.error(f"Une erreur s'est produite lors de la création de la carte : {str(e)}")
+
+    # st.markdown("<h1 style='text-align: center; font-size: 2.5em;'>No spoil, map is comming...</h1>", unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.markdown("<h3 style='text-align: center;'>Carte des scores par commune</h3>", unsafe_allow_html=True)
+
+    tiles_url = tiles.tiles_url() if os.path.exists(tiles.COMMUNES_MBTILES) else None
+    if tiles_url is None:
+        st.info("Les tuiles des communes n'ont pas encore été générées : lancez "
+                "`python scripts/tiles.py fetch` puis `python scripts/tiles.py build`.")
+    else:
+        try:
+            import pydeck as pdk
+
+            tiles_stats = tiles.read_metadata(tiles.COMMUNES_MBTILES)['json']['stats']
+
+            metric_labels = {
+                'sport': 'Score Sportif',
+                'eco': 'Score Économique',
+                'correlation': 'Corrélation',
+                'croissance': 'Croissance sectorielle (5 ans)'
+            }
+            tiles_years = sorted({int(col.split('_')[1]) for col in tiles_stats if col.startswith(('sport_', 'eco_'))})
+
+            col1, col2 = st.columns(2)
+            with col1:
+                tiles_metric = st.selectbox('Indicateur', [m for m in metric_labels if m in ('sport', 'eco') or m in tiles_stats],
+                                            format_func=metric_labels.get, key='tiles_metric')
+            with col2:
+                tiles_year = st.selectbox('Année', tiles_years, index=len(tiles_years) - 1, key='tiles_year',
+                                          disabled=tiles_metric not in ('sport', 'eco'))
+
+            column = f"{tiles_metric}_{tiles_year}" if tiles_metric in ('sport', 'eco') else tiles_metric
+            vmin, vmax = tiles_stats[column]
+            ratio = f"((properties.{column} - {vmin}) / {max(vmax - vmin, 1e-9)})"
+
+            # Même échelle que la carte des départements : de blanc à bleu foncé
+            commune_layer = pdk.Layer(
+                "MVTLayer",
+                data=tiles_url,
+                min_zoom=int(tiles.MIN_ZOOM),
+                max_zoom=int(tiles.MAX_ZOOM),
+                binary=False,
+                pickable=True,
+                stroked=False,
+                get_fill_color=f"properties.{column} >= {vmin} ? [255 * (1 - {ratio}), 255 * (1 - {ratio}), 255 - 116 * {ratio}, 180] : [200, 200, 200, 60]"
+            )
+            st.pydeck_chart(pdk.Deck(
+                layers=[commune_layer],
+                initial_view_state=pdk.ViewState(latitude=46.5, longitude=2.5, zoom=5),
+                map_style=None,
+                tooltip={"html": f"<b>{{nom}}</b><br/>{metric_labels[tiles_metric]} : {{{column}}}"}
+            ))
+        except Exception as e:
+            st.error(f"Une erreur s'est produite lors de l'affichage de la carte des communes : {str(e)}")
@@ -0,0 +1,88 @@
+"""Nos Analyses · Pondérations: what-if weights and sensitivity results."""
+# Standard library imports
+import os
+
+# Third-party imports
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+import sensitivity
+import weights
+from dashboard.data import load_weight_model
+from dashboard.layout import center_text
+
+
+def render():
+    import plotly.express as px
+
+    st.markdown("<h3 style='text-align: center;'>Simulation des pondérations</h3>", unsafe_allow_html=True)
+
+    try:
+        col1, col2 = st.columns(2)
+        with col1:
+            weights_granularity = st.selectbox('Granularité', ['Région', 'Département', 'Ville'], key='weights_granularity')
+        weight_model = load_weight_model({'Région': 'region', 'Département': 'departement', 'Ville': 'ville'}[weights_granularity])
+        weights_years = sorted(np.unique(weight_model.years))
+        with col2:
+            weights_year = st.selectbox('Saison', weights_years, index=len(weights_years) - 1, key='weights_year')
+
+        # Curseurs de pondération, initialisés avec les poids des notebooks
+        col1, col2 = st.columns(2)
+        with col1:
+            center_text("Score Sportif", 4)
+            sport_weights = {c: st.slider(weights.COMPONENT_LABELS[c], 0.0, 1.0, w, 0.05, key=f'w_{c}')
+                             for c, w in weights.SPORT_WEIGHTS.items()}
+        with col2:
+            center_text("Score Économique", 4)
+            eco_weights = {c: st.slider(weights.COMPONENT_LABELS[c], 0.0, 1.0, w, 0.05, key=f'w_{c}')
+                           for c, w in weights.ECO_WEIGHTS.items()}
+
+        df_what_if, elapsed_ms = weight_model.what_if(sport_weights, eco_weights, weights_year)
+        st.caption(f"{len(df_what_if)} entités recalculées en {elapsed_ms:.1f} ms")
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.dataframe(df_what_if.drop(columns='annee').round(3), use_container_width=True, hide_index=True)
+        with col2:
+            fig_corr = go.Figure(go.Histogram(x=df_what_if['correlation'], nbinsx=40, marker_color='#0aa2bf'))
+            fig_corr.update_layout(
+                title="Distribution des corrélations sport-économie",
+                xaxis_title="Corrélation",
+                yaxis_title="Nombre d'entités",
+                height=400,
+                margin=dict(l=20, r=20, t=40, b=20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig_corr, use_container_width=True, config={'displayModeBar': False})
+
+        # Résultats de l'analyse de sensibilité (calculés hors de l'application)
+        center_text("Sensibilité aux pondérations", 4)
+        weights_level = weight_model.level
+        intervals_path, sobol_path = sensitivity.result_paths(weights_level)
+        if os.path.exists(intervals_path) and os.path.exists(sobol_path):
+            df_sobol = pd.read_csv(sobol_path)
+            df_intervals = pd.read_csv(intervals_path)
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                fig_sobol = px.bar(df_sobol, x='indice_total', y='facteur', color='sortie', barmode='group',
+                                   orientation='h', labels={'indice_total': "Indice de Sobol total", 'facteur': ""})
+                fig_sobol.update_layout(height=450, margin=dict(l=20, r=20, t=40, b=20),
+                                        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                                        legend=dict(orientation='h', y=-0.2))
+                st.plotly_chart(fig_sobol, use_container_width=True, config={'displayModeBar': False})
+            with col2:
+                df_intervals['amplitude_rang_sportif'] = df_intervals['rang_sportif_p95'] - df_intervals['rang_sportif_p05']
+                st.dataframe(df_intervals.sort_values('rang_sportif_reference').round(3),
+                             use_container_width=True, hide_index=True)
+                st.caption(f"Intervalles 5 %-95 % des rangs de la saison {df_intervals['annee_reference'].iloc[0]}")
+        else:
+            st.info("Aucune analyse de sensibilité pour cette granularité. Lancez : "
+                    f"`python scripts/sensitivity.py --level {weights_level}`")
+
+    except FileNotFoundError:
+        st.error("La table principale (main_table_2012_2023) n'a pas été trouvée dans le dossier 'data'.")
+    except Exception as e:
+        st.error(f"Une erreur s'est produite lors de la simulation des pondérations : {str(e)}")
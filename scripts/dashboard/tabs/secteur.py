@@ -0,0 +1,191 @@
+"""Nos Analyses · Secteur: sector scores, territory specialisation and sector profiles."""
+# Third-party imports
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboard.data import get_sector_clusters, get_unique_values, load_sector_data
+from dashboard.layout import render_export
+
+
+def render():
+    import composition
+    import plotly.express as px
+    import sector_cube
+
+    st.markdown("<h3 style='text-align: center;'>Analyse sectorielle</h3>", unsafe_allow_html=True)
+
+    try:
+        # Chargement des données avec cache
+        df_sector = load_sector_data()
+
+        # Filtres interactifs optimisés
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            regions = get_unique_values(df_sector, 'region')
+            selected_region = st.selectbox('Région:', ['Toutes les régions'] + regions)
+
+        # Filtrage optimisé des départements
+        if selected_region != 'Toutes les régions':
+            dept_mask = df_sector['region'] == selected_region
+            dept_options = sorted(df_sector[dept_mask]['departement'].unique())
+        else:
+            dept_options = get_unique_values(df_sector, 'departement')
+
+        with col2:
+            selected_dept = st.selectbox('Département:', ['Tous les départements'] + dept_options)
+
+        # Filtrage optimisé des zones
+        if selected_dept != 'Tous les départements':
+            zone_mask = df_sector['departement'] == selected_dept
+            zone_options = sorted(df_sector[zone_mask]['zone'].unique())
+        else:
+            zone_options = get_unique_values(df_sector, 'zone')
+
+        with col3:
+            selected_zone = st.selectbox('Zone:', ['Toutes les zones'] + zone_options)
+
+        with col4:
+            sectors = get_unique_values(df_sector, 'secteur_na88')
+            selected_sector = st.selectbox('Secteur:', ['Tous les secteurs'] + sectors)
+
+        score_mode = st.radio("Score sectoriel", ['Simple (50/50)', 'Enrichi (croissance et localisation)'],
+                              horizontal=True, key='sector_score_mode')
+        sector_filters = {
+            'region': None if selected_region == 'Toutes les régions' else selected_region,
+            'departement': None if selected_dept == 'Tous les départements' else selected_dept,
+            'zone': None if selected_zone == 'Toutes les zones' else selected_zone,
+            'secteur_na88': None if selected_sector == 'Tous les secteurs' else selected_sector
+        }
+
+        if score_mode == 'Simple (50/50)':
+            # Filtrage optimisé des données avec masque
+            mask = pd.Series(True, index=df_sector.index)
+            if selected_region != 'Toutes les régions':
+                mask &= df_sector['region'] == selected_region
+            if selected_dept != 'Tous les départements':
+                mask &= df_sector['departement'] == selected_dept
+            if selected_zone != 'Toutes les zones':
+                mask &= df_sector['zone'] == selected_zone
+            if selected_sector != 'Tous les secteurs':
+                mask &= df_sector['secteur_na88'] == selected_sector
+
+            df_filtered = df_sector[mask]
+        else:
+            # Score enrichi lu dans le cube ville x secteur x année, filtres appliqués à la lecture
+            df_filtered = sector_cube.query_cube(sector_filters, columns=['secteur_na88', 'année', 'score_sectoriel'])
+
+        # Calcul optimisé du taux de croissance
+        if selected_sector != 'Tous les secteurs' and not df_filtered.empty:
+            df_filtered = df_filtered.sort_values('année')
+            last_5_years = sorted(df_filtered['année'].unique())[-5:]
+            df_last_5_years = df_filtered[df_filtered['année'].isin(last_5_years)]
+
+        # Création du graphique optimisé
+        if not df_filtered.empty:
+            fig = go.Figure()
+
+            # Agrégation des données avant création des traces
+            for sector in df_filtered['secteur_na88'].unique():
+                sector_data = df_filtered[df_filtered['secteur_na88'] == sector]
+                agg_data = sector_data.groupby('année')['score_sectoriel'].mean().reset_index()
+
+                fig.add_trace(go.Scatter(
+                    x=agg_data['année'],
+                    y=agg_data['score_sectoriel'],
+                    name=sector,
+                    mode='lines+markers'
+                ))
+
+            title_suffix = f" ({selected_sector})" if selected_sector != "Tous les secteurs" else ""
+            fig.update_layout(
+                title=f"Évolution des scores sectoriels pour {selected_zone}, {selected_dept} ({selected_region}){title_suffix}",
+                xaxis_title="Année",
+                yaxis_title="Score sectoriel",
+                showlegend=True,
+                height=600,
+                template="plotly_white",
+                hovermode='x unified'
+            )
+
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.warning("Aucune donnée disponible pour les critères sélectionnés.")
+
+        # Spécialisation du territoire : quotients de localisation et décomposition shift-share
+        st.subheader("Spécialisation du territoire")
+        territory_filters = {**sector_filters, 'secteur_na88': None}
+        cube_years = sector_cube.query_cube(territory_filters, columns=['année'])['année']
+        if not cube_years.empty:
+            lq_year = int(cube_years.max())
+            df_territory = sector_cube.query_cube(
+                {**territory_filters, 'année': lq_year},
+                columns=['secteur_na88', 'nb_effectif', 'effet_national', 'effet_sectoriel', 'effet_local']
+            ).groupby('secteur_na88', observed=True).sum()
+            df_national = sector_cube.query_cube({'année': lq_year}, columns=['secteur_na88', 'nb_effectif']) \
+                .groupby('secteur_na88', observed=True)['nb_effectif'].sum()
+            df_territory['quotient_localisation'] = (
+                (df_territory['nb_effectif'] / df_territory['nb_effectif'].sum())
+                / (df_national.reindex(df_territory.index) / df_national.sum())
+            )
+            df_territory = df_territory.sort_values('quotient_localisation', ascending=False).reset_index()
+            st.dataframe(df_territory.round(2), use_container_width=True, hide_index=True)
+            st.caption(f"Année {lq_year} · quotient > 1 : secteur surreprésenté par rapport à la France ; "
+                       "effets shift-share calculés sur l'évolution de l'effectif depuis l'année précédente")
+
+        # Export de la sélection courante, filtres appliqués pendant la lecture du Parquet
+        render_export('sector', sector_filters, key='export_secteurs')
+
+        # Profils sectoriels : regroupement des territoires selon la composition de leur tissu économique
+        st.markdown("---")
+        st.subheader("Profils sectoriels des territoires")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            cluster_unit = st.selectbox("Territoire", ['Département', 'Zone'], key='cluster_unit')
+            cluster_levels = st.multiselect("Nomenclatures", list(composition.SECTOR_LEVELS),
+                                            default=list(composition.SECTOR_LEVELS), key='cluster_levels')
+        with col2:
+            cluster_measure = st.selectbox("Mesure", list(composition.MEASURES), key='cluster_measure')
+            cluster_years = get_unique_values(df_sector, 'année')
+            cluster_year = st.selectbox("Année", cluster_years, index=len(cluster_years) - 1, key='cluster_year')
+        with col3:
+            n_clusters = st.slider("Nombre de groupes", 2, 12, 5, key='cluster_k')
+            cluster_method = st.radio("Méthode", ['kmeans', 'hierarchique'], horizontal=True,
+                                      format_func=lambda m: "k-means mini-batch" if m == 'kmeans' else "Hiérarchique (Ward)",
+                                      key='cluster_method')
+
+        if cluster_levels:
+            unit_column = composition.UNITS[cluster_unit]
+            df_labels, df_centroids = get_sector_clusters(
+                unit_column, tuple(cluster_levels), composition.MEASURES[cluster_measure],
+                cluster_year, n_clusters, cluster_method
+            )
+            col1, col2 = st.columns([3, 2])
+            with col1:
+                df_top = composition.top_sectors(df_centroids)
+                fig_clusters = px.bar(df_top, x='part', y='groupe', color='secteur', orientation='h',
+                                      labels={'part': "Part moyenne", 'groupe': "Groupe"})
+                fig_clusters.update_layout(
+                    title="Secteurs dominants de chaque groupe",
+                    yaxis=dict(autorange='reversed', dtick=1),
+                    height=500,
+                    template="plotly_white"
+                )
+                st.plotly_chart(fig_clusters, use_container_width=True, config={'displayModeBar': False})
+            with col2:
+                selected_cluster = st.selectbox(
+                    "Groupe", df_centroids.index,
+                    format_func=lambda g: f"Groupe {g} ({df_centroids.loc[g, 'effectif']} territoires)",
+                    key='cluster_selected'
+                )
+                st.dataframe(df_labels[df_labels['groupe'] == selected_cluster][[unit_column]],
+                             use_container_width=True, hide_index=True, height=420)
+        else:
+            st.info("Sélectionnez au moins une nomenclature.")
+
+    except FileNotFoundError:
+        st.error("Le fichier de données sectorielles n'a pas été trouvé. Veuillez vérifier que le fichier 'df_filtered_secteurs_88.csv' est présent dans le dossier 'data'.")
+    except Exception as e:
+        st.error(f"Une erreur s'est produite lors du chargement des données : {str(e)}")
@@ -0,0 +1,348 @@
+"""Nos Suggestions: the two options, the personalised search and the ranked opportunities."""
+# Third-party imports
+import pandas as pd
+import streamlit as st
+
+import loaders
+from dashboard.config import ASSETS
+from dashboard.data import load_correlation_intervals, load_dataset, load_sector_data
+from dashboard.figures import club_pie_figure
+from dashboard.layout import render_export
+
+
+def render():
+    options_tab, recherche_tab, top_tab, reveal_opt1_tab, reveal_opt2_tab = st.tabs(
+        ["Nos options", "Ma recherche", "Top opportunités", "Reveal Opt1", "Reveal Opt2"])
+
+    with options_tab:
+        render_options()
+
+    with recherche_tab:
+        render_search()
+
+    with top_tab:
+        render_top_opportunities()
+
+    with reveal_opt1_tab:
+        st.image(ASSETS['option1'], use_column_width=True)
+
+    with reveal_opt2_tab:
+        st.image(ASSETS['option2'], use_column_width=True)
+
+
+def render_options():
+    _, col1, col2, _ = st.columns([0.5, 1, 1, 0.5])
+
+    with col1:
+        st.markdown("""
+        <div style="
+            padding: 20px;
+            border-radius: 10px;
+            background-color: white;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            text-align: center;
+            margin: 10px;
+            min-height: 200px;
+        ">
+            <h3 style='color: var(--primary);'>Option 1</h3>
+            <div style="margin-top: 15px;">
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-map-marker-alt" style="color: #dc3545; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Pas-de-Calais</span>
+                </div>
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-bed" style="color: #198754; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Hébergement</span>
+                </div>
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-futbol" style="color: #0d6efd; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Football</span>
+                </div>
+            </div>
+        </div>
+        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4/css/all.min.css">
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div style="
+            padding: 20px;
+            border-radius: 10px;
+            background-color: white;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            text-align: center;
+            margin: 10px;
+            min-height: 200px;
+        ">
+            <h3 style='color: var(--primary);'>Option 2</h3>
+            <div style="margin-top: 15px;">
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-map-marker-alt" style="color: #dc3545; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Val d'Oise</span>
+                </div>
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-utensils" style="color: #198754; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Restauration</span>
+                </div>
+                <div style="
+                    margin: 15px 0;
+                    padding: 10px;
+                    border-radius: 8px;
+                    background-color: #f8f9fa;
+                    transition: transform 0.2s;
+                    cursor: pointer;
+                " onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                    <i class="fas fa-volleyball-ball" style="color: #0d6efd; font-size: 1.2em; margin-right: 8px;"></i>
+                    <span style="font-weight: 500;">Handball</span>
+                </div>
+            </div>
+        </div>
+        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4/css/all.min.css">
+        """, unsafe_allow_html=True)
+
+
+def render_search():
+    st.markdown("<h3 style='text-align: center;'>Ma recherche personnalisée</h3>", unsafe_allow_html=True)
+
+    # Créer deux colonnes pour les sélecteurs
+    col1, col2 = st.columns(2)
+
+    # Variables pour suivre les couleurs
+    correlation_green = False
+    growth_rate_green = False
+
+    with col1:
+        # Charger les données de corrélation
+        df_correlations = loaders.load_correlations()
+
+        # Créer le sélecteur de département
+        departement = st.selectbox(
+            "Sélectionnez un département",
+            options=sorted(df_correlations['departement'].unique()),
+            key='dept_selector'
+        )
+
+        # Afficher la corrélation pour le département sélectionné
+        correlation = df_correlations[df_correlations['departement'] == departement]['correlation_departement'].values[0]
+        correlation_green = correlation >= 0.7
+
+        # Intervalle et p-value de cette corrélation, rééchantillonnée sur les saisons du département
+        df_intervals = load_correlation_intervals('departement')
+        interval = df_intervals[df_intervals['departement'] == str(departement)]
+        significance = ""
+        if len(interval):
+            interval = interval.iloc[0]
+            significance = (f"IC 95 % [{interval['ic_bas']:.2f} ; {interval['ic_haut']:.2f}] · "
+                            f"p = {interval['p_value']:.3f} · {interval['n_saisons']} saisons")
+
+        st.markdown(f"""
+        <div style="
+            padding: 20px;
+            border-radius: 10px;
+            background-color: white;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            text-align: center;
+            margin: 10px;
+        ">
+            <h4>Corrélation Sport-Économie</h4>
+            <h2 style="color: {'#2ecc71' if correlation_green else '#e74c3c'};">
+                {'n.d.' if pd.isna(correlation) else f'{correlation:.3f}'}
+            </h2>
+            <p>pour le département {departement}</p>
+            <p style="font-size: 0.85em; color: #6c757d;">{significance}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        # Charger les données sectorielles
+        df_sector = load_sector_data()
+
+        # Créer le sélecteur de secteur
+        secteur = st.selectbox(
+            "Sélectionnez un secteur d'activité",
+            options=sorted(df_sector['secteur_na88'].unique()),
+            key='secteur_selector'
+        )
+
+        # Filtrer les données pour le département et le secteur sélectionnés
+        df_filtered = df_sector[
+            (df_sector['secteur_na88'] == secteur) &
+            (df_sector['departement'] == departement)
+        ].sort_values(by='année')
+
+        last_5_years = sorted(df_filtered['année'].unique())[-5:]
+        df_last_5_years = df_filtered[df_filtered['année'].isin(last_5_years)]
+
+        growth_rate = None
+        if len(last_5_years) >= 5:
+            agg_scores = df_last_5_years.groupby('année')['score_sectoriel'].mean()
+            score_start = agg_scores.iloc[0]
+            score_end = agg_scores.iloc[-1]
+
+            if score_start > 0:
+                growth_rate = ((score_end - score_start) / score_start) * 100
+                growth_rate_green = growth_rate >= 2
+
+                st.markdown(f"""
+                <div style="
+                    padding: 20px;
+                    border-radius: 10px;
+                    background-color: white;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                    text-align: center;
+                    margin: 10px;
+                ">
+                    <h4>Taux de Croissance sur 5 ans</h4>
+                    <h2 style="color: {'#2ecc71' if growth_rate_green else '#e74c3c'};">
+                        {growth_rate:.1f}%
+                    </h2>
+                    <p>pour le secteur {secteur} dans le département {departement}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.warning("Impossible de calculer le taux de croissance (score initial nul ou négatif)")
+        else:
+            st.warning(f"Pas assez de données pour calculer le taux de croissance sur 5 ans pour le département {departement}")
+
+    # Ajouter l'indicateur visuel centré sous les deux colonnes
+    if growth_rate is not None:  # Seulement si on a pu calculer le taux de croissance
+        st.markdown("""
+        <div style="
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            margin-top: 20px;
+        ">
+        """, unsafe_allow_html=True)
+
+        if correlation_green and growth_rate_green:
+            st.markdown("""
+            <div style="text-align: center;">
+                <i class="fas fa-thumbs-up" style="color: #2ecc71; font-size: 48px;"></i>
+                <p style="color: #2ecc71; margin-top: 10px; font-weight: bold;">Nous pouvons commencer à creuser ici 👍</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div style="text-align: center;">
+                <i class="fas fa-thumbs-down" style="color: #e74c3c; font-size: 48px;"></i>
+                <p style="color: #e74c3c; margin-top: 10px; font-weight: bold;">Si j'étais vous, je n'irai pas ici 👎</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # Ajouter la section des clubs
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Charger et préparer les données des clubs
+    df_clubs_region = load_dataset('clubs')
+
+    # Mapping des sports pour normalisation
+    sport_mapping = {
+        'basket': 'Basketball',
+        'football': 'Football',
+        'handball': 'Handball',
+        'rugby': 'Rugby',
+        'volley': 'Volleyball'
+    }
+
+    # Filtrer et préparer les données des clubs
+    df_clubs_region['sport'] = df_clubs_region['sport'].map(sport_mapping)
+    dept_clubs = df_clubs_region[df_clubs_region['departement'] == departement]
+    clubs_count = len(dept_clubs)
+
+    # Afficher le nombre total de clubs
+    st.markdown(f"### Clubs du département ({clubs_count})")
+
+    if clubs_count > 0:
+        # Afficher la répartition des clubs par sport
+        sport_counts = dept_clubs['sport'].value_counts()
+
+        # Créer le graphique camembert
+        fig_pie = club_pie_figure(sport_counts, f"Répartition des clubs par sport dans le département {departement}")
+        st.plotly_chart(fig_pie, use_container_width=True, config={'displayModeBar': False})
+        render_export('clubs', {'departement': departement}, key='export_clubs_departement')
+    else:
+        st.info("Aucun club n'a été trouvé dans ce département.")
+
+
+def render_top_opportunities():
+    import opportunities
+
+    st.markdown("<h3 style='text-align: center;'>Top opportunités</h3>", unsafe_allow_html=True)
+
+    try:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            top_level = st.selectbox("Territoire", ['departement', 'zone'],
+                                     format_func=lambda n: "Département" if n == 'departement' else "Zone",
+                                     key='top_level')
+        with col2:
+            top_regions = sorted(opportunities.open_opportunities().to_table(columns=['region'])
+                                 .column('region').unique().to_pylist())
+            top_region = st.selectbox("Région", ['Toutes les régions'] + top_regions, key='top_region')
+        with col3:
+            top_k = st.slider("Nombre par région", 1, 50, opportunities.TOP_K, key='top_k')
+        with col4:
+            st.markdown("<br>", unsafe_allow_html=True)
+            top_recommended = st.checkbox("Recommandées uniquement", key='top_recommended',
+                                          help="Corrélation ≥ 0.7 et croissance sur 5 ans ≥ 2 %, comme dans « Ma recherche »")
+
+        df_top = opportunities.top_opportunities(
+            niveau=top_level,
+            region=None if top_region == 'Toutes les régions' else top_region,
+            k=top_k,
+            recommended_only=top_recommended
+        )
+        st.caption(f"{len(df_top)} couples territoire × secteur")
+        st.dataframe(
+            df_top.drop(columns=['niveau']).round(3),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'score_opportunite': st.column_config.ProgressColumn("Score d'opportunité", min_value=0, max_value=1),
+                'croissance_5_ans': st.column_config.NumberColumn("Croissance 5 ans", format="%.1f %%"),
+                'recommande': st.column_config.CheckboxColumn("Recommandé"),
+                'p_value': st.column_config.NumberColumn("p-value de la corrélation", format="%.3f"),
+            }
+        )
+    except FileNotFoundError as e:
+        st.error(f"Données manquantes pour le classement des opportunités : {e.filename}")
+    except Exception as e:
+        st.error(f"Une erreur s'est produite lors du calcul des opportunités : {str(e)}")
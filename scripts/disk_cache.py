@@ -0,0 +1,227 @@
+"""Persistent on-disk cache of derived frames and figure payloads.
+
+The Streamlit caches live in process memory and are lost at every deploy
+or restart. This cache keeps the same results under ``data/cache``:
+frames as Arrow IPC files (memory-mapped on read), figures as their Plotly
+JSON. Keys include the catalog version of the inputs (see :mod:`catalog`),
+so an entry is never stale; entries of old versions simply stop being read
+and are evicted.
+
+* Writes are atomic (temporary file, then ``os.replace``): a reader sees
+  either nothing or a complete file.
+* A hit refreshes the file's modification time; when the directory grows
+  beyond ``SPORTECO_CACHE_MO`` (512 Mo by default) the least recently used
+  entries are removed. Eviction is serialised across processes by a lock
+  file, and a process still reading an evicted file keeps its mapping.
+* Computing a missing entry holds a per-key lock, so concurrent processes
+  (several replicas after a deploy) compute it once and the others read it.
+  Lock files live in ``data/cache/.verrous`` and are never evicted: a
+  process waiting on a lock keeps locking the same file as the next one.
+
+Warm-up fills the cache before the first users arrive and loads the most
+recent entries into the page cache:
+
+    python scripts/disk_cache.py warm
+    python scripts/disk_cache.py status
+    python scripts/disk_cache.py clear
+"""
+# Standard library imports
+import argparse
+import contextlib
+import hashlib
+import os
+import time
+
+# Third-party imports
+import pandas as pd
+
+import loaders
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus
+    fcntl = None
+
+# Constants
+CACHE_PATH = os.path.join(loaders.DATA_PATH, "cache")
+MAX_BYTES = int(os.environ.get('SPORTECO_CACHE_MO', 512)) * 1024 * 1024
+PRELOAD_BYTES = 128 * 1024 * 1024
+EXTENSIONS = ('.arrow', '.json')
+LOCKS_PATH = os.path.join(CACHE_PATH, ".verrous")
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Exclusive lock shared by every process of the machine."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def entry_path(name, key, extension):
+    """File of the entry ``key`` (a tuple of values, compared as text) of the cache ``name``."""
+    digest = hashlib.sha1(repr(tuple(str(part) for part in key)).encode()).hexdigest()[:20]
+    return os.path.join(CACHE_PATH, name, f"{digest}{extension}")
+
+
+def lock_path(path):
+    """Lock file of the entry at ``path``, outside the evicted entries."""
+    return os.path.join(LOCKS_PATH, f"{os.path.relpath(path, CACHE_PATH)}.lock")
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_atomic(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_frame(path, df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=not isinstance(df.index, pd.RangeIndex))
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_frame(path):
+    import pyarrow as pa
+
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _write_json(path, payload):
+    with open(path, 'w') as f:
+        f.write(payload)
+
+
+def _read_json(path):
+    with open(path) as f:
+        return f.read()
+
+
+def _get_or_compute(path, compute, read, write):
+    try:
+        value = read(path)
+        _touch(path)
+        return value
+    except FileNotFoundError:
+        pass
+    with file_lock(lock_path(path)):
+        # Un autre processus a pu calculer l'entrée pendant l'attente du verrou
+        if os.path.exists(path):
+            _touch(path)
+            return read(path)
+        value = compute()
+        _write_atomic(path, lambda tmp_path: write(tmp_path, value))
+    evict()
+    return value
+
+
+def frame(name, key, compute):
+    """DataFrame cached on disk under ``(name, key)``; ``compute()`` builds it on a miss."""
+    return _get_or_compute(entry_path(name, key, '.arrow'), compute, _read_frame, _write_frame)
+
+
+def figure(name, key, compute):
+    """Plotly figure cached on disk as JSON; ``compute()`` builds it on a miss."""
+    import plotly.io as pio
+
+    payload = _get_or_compute(entry_path(name, key, '.json'), lambda: compute().to_json(),
+                              _read_json, _write_json)
+    return pio.from_json(payload)
+
+
+def entries():
+    """``(path, size, last use)`` of every cache entry, most recently used first."""
+    found = []
+    if os.path.isdir(CACHE_PATH):
+        for directory in os.scandir(CACHE_PATH):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.endswith(EXTENSIONS):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    found.append((entry.path, stat.st_size, stat.st_mtime))
+    return sorted(found, key=lambda entry: entry[2], reverse=True)
+
+
+def evict(max_bytes=None):
+    """Remove the least recently used entries beyond ``max_bytes``; returns the removed paths."""
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    removed = []
+    with file_lock(os.path.join(CACHE_PATH, ".eviction.lock")):
+        total = 0
+        for path, size, _ in entries():
+            total += size
+            if total <= max_bytes:
+                continue
+            # Le verrou de l'entrée est conservé : un processus peut l'attendre encore
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def preload(max_bytes=PRELOAD_BYTES):
+    """Read the most recently used entries so their pages are in the OS cache; returns their count."""
+    loaded, total = 0, 0
+    for path, size, _ in entries():
+        if total + size > max_bytes:
+            break
+        with contextlib.suppress(FileNotFoundError), open(path, 'rb') as f:
+            while f.read(1024 * 1024):
+                pass
+            loaded += 1
+            total += size
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache disque des tables dérivées et des graphiques")
+    parser.add_argument('command', choices=['warm', 'status', 'clear'])
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        # Import différé : le préchauffage passe par les chargeurs du tableau de bord
+        from dashboard import data
+
+        start = time.perf_counter()
+        data.warm_up()
+        print(f"Cache préchauffé en {time.perf_counter() - start:.1f} s, "
+              f"{preload()} entrée(s) chargée(s) en mémoire")
+    elif args.command == 'status':
+        found = entries()
+        by_name = {}
+        for path, size, _ in found:
+            name = os.path.basename(os.path.dirname(path))
+            count, total = by_name.get(name, (0, 0))
+            by_name[name] = (count + 1, total + size)
+        for name, (count, total) in sorted(by_name.items()):
+            print(f"{name:12} {count:5} entrée(s)  {total / 1e6:8.1f} Mo")
+        print(f"Total : {sum(size for _, size, _ in found) / 1e6:.1f} Mo sur {MAX_BYTES / 1e6:.0f} Mo")
+    else:
+        removed = evict(max_bytes=0)
+        print(f"{len(removed)} entrée(s) supprimée(s)")
+
+
+if __name__ == '__main__':
+    main()
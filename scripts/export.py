@@ -0,0 +1,138 @@
+"""Streaming export of filtered datasets as Parquet, CSV or Excel.
+
+Datasets are written once to a columnar store (one Parquet file per
+dataset, under ``data/store``). Exports then scan that store with the
+selection pushed down as a pyarrow filter and write record batch after
+record batch to the output, so the full filtered table never exists as a
+DataFrame in memory.
+"""
+# Standard library imports
+import os
+import tempfile
+
+# Third-party imports
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import catalog
+import loaders
+
+# Constants
+STORE_PATH = os.path.join(loaders.DATA_PATH, "store")
+BATCH_SIZE = 64_000
+ROW_GROUP_SIZE = 128_000
+EXCEL_MAX_ROWS = 1_048_575
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+DATASETS = {
+    'scores': loaders.load_scores,
+    'sector': loaders.load_sector,
+    'clubs': loaders.load_clubs,
+}
+
+FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+}
+
+
+def store_path(name, version=None):
+    return os.path.join(STORE_PATH, f"{name}-{version or catalog.version(f'store/{name}')}.parquet")
+
+
+def build_store(names=None):
+    """Write each dataset to the columnar store (atomically, via a temporary file)."""
+    os.makedirs(STORE_PATH, exist_ok=True)
+    for name in names or DATASETS:
+        path = store_path(name)
+        table = pa.Table.from_pandas(DATASETS[name](), preserve_index=False)
+        pq.write_table(table, path + ".tmp", row_group_size=ROW_GROUP_SIZE)
+        os.replace(path + ".tmp", path)
+        catalog.record(f"store/{name}", path)
+
+
+def open_dataset(name):
+    if not os.path.exists(store_path(name)):
+        build_store([name])
+    return ds.dataset(store_path(name), format='parquet')
+
+
+def build_filter(filters):
+    """pyarrow expression from ``{column: value or list of values}`` (None = no filter)."""
+    expression = None
+    for column, value in (filters or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        condition = ds.field(column).isin(list(values))
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def iter_batches(name, filters=None, columns=None, batch_size=BATCH_SIZE):
+    """Record batches of a dataset, with the filter pushed down into the Parquet scan."""
+    dataset = open_dataset(name)
+    scanner = dataset.scanner(columns=columns, filter=build_filter(filters), batch_size=batch_size)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch
+
+
+def count_rows(name, filters=None):
+    return open_dataset(name).count_rows(filter=build_filter(filters))
+
+
+def _write_csv(batches, schema, out):
+    with pa_csv.CSVWriter(out, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+def _write_parquet(batches, schema, out):
+    with pq.ParquetWriter(out, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch, row_group_size=ROW_GROUP_SIZE)
+
+
+def _write_xlsx(batches, schema, out):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("export")
+    sheet.append(schema.names)
+    n_rows = 0
+    for batch in batches:
+        n_rows += batch.num_rows
+        if n_rows > EXCEL_MAX_ROWS:
+            raise ValueError("La sélection dépasse la limite de lignes d'Excel : exportez en CSV ou Parquet.")
+        for row in zip(*(column.to_pylist() for column in batch.columns)):
+            sheet.append(row)
+    workbook.save(out)
+
+
+WRITERS = {'csv': _write_csv, 'parquet': _write_parquet, 'xlsx': _write_xlsx}
+
+
+def write_export(name, fmt, out, filters=None, columns=None):
+    """Stream the filtered dataset to ``out`` (path or binary file object) in ``fmt``."""
+    dataset = open_dataset(name)
+    schema = dataset.schema if columns is None else pa.schema([dataset.schema.field(c) for c in columns])
+    # Les colonnes dictionnaire (catégories) sont écrites en clair pour le CSV
+    if fmt == 'csv':
+        schema = pa.schema([pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f
+                            for f in schema])
+        batches = (batch.cast(schema) for batch in iter_batches(name, filters, columns))
+    else:
+        batches = iter_batches(name, filters, columns)
+    WRITERS[fmt](batches, schema, out)
+
+
+def export_file(name, fmt, filters=None, columns=None):
+    """Export to a spooled temporary file (on disk beyond 16 MB), rewound for reading."""
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    write_export(name, fmt, out, filters, columns)
+    out.seek(0)
+    return out
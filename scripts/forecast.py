@@ -0,0 +1,194 @@
+"""Batched next-season forecasts of the sport and economic scores.
+
+Every entity series of a level is a row of one ``(entities, seasons)``
+matrix (see :func:`lags.season_matrices`). Seasons stay in their columns:
+a missing season is a gap, never closed by shifting the values. Only the
+rows observed in the last season get a forecast, one season ahead; all of
+them are fitted at once:
+
+* exponential smoothing, ETS(A,N,N), and damped-trend Holt share one
+  error-correction recursion run over a grid of smoothing parameters,
+  vectorized over ``(entities, grid)``;
+* AR(1) and AR(2) with intercept are fitted by batched least squares
+  (stacked normal equations solved in one ``np.linalg.solve`` call) on the
+  complete windows only; non-stationary fits are discarded.
+
+Each entity keeps the model with the lowest AIC among the fits with more
+residuals than parameters + 1. Intervals use the one-step residual spread
+and are clipped to the score range. Results are cached on disk under their
+catalog version.
+
+    python scripts/forecast.py
+"""
+# Standard library imports
+import argparse
+import itertools
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import lags
+import loaders
+
+# Constants
+FORECASTS_PATH = os.path.join(loaders.DATA_PATH, "forecasts")
+LEVELS = ['region', 'departement', 'ville']
+SCORES = ['score_sportif', 'score_economique']
+SCORE_RANGE = (0.0, 1.0)
+MIN_OBSERVATIONS = 4
+Z_95 = 1.96
+
+ALPHAS = [0.1, 0.3, 0.5, 0.7, 0.9]
+# (alpha, beta, phi) : beta = phi = 0 donne le lissage exponentiel simple
+SMOOTHING_GRID = ([(alpha, 0.0, 0.0) for alpha in ALPHAS]
+                  + list(itertools.product(ALPHAS, [0.05, 0.2, 0.5], [0.8, 0.9, 0.98])))
+AR_ORDERS = [1, 2]
+
+
+def _fit_smoothing(y):
+    """Best (by SSE) ETS / damped-trend fit of each row; returns SSE, n_residuals, forecast, n_params."""
+    grid = np.array(SMOOTHING_GRID)
+    alpha, beta, phi = (grid[:, i][None, :] for i in range(3))
+    n_rows = len(y)
+    level = np.full((n_rows, len(grid)), np.nan)
+    trend = np.zeros((n_rows, len(grid)))
+    sse = np.zeros((n_rows, len(grid)))
+    m = np.zeros(n_rows)
+
+    for t in range(y.shape[1]):
+        obs = y[:, t][:, None]
+        started = ~np.isnan(level)
+        has_obs = ~np.isnan(obs)
+        # Saison manquante : le niveau avance avec la tendance, sans correction
+        error = np.where(started & has_obs, obs - (level + phi * trend), 0.0)
+        sse += error ** 2
+        m += (started[:, 0] & has_obs[:, 0])
+        level = np.where(started, level + phi * trend + alpha * error, np.where(has_obs, obs, np.nan))
+        trend = np.where(started, phi * trend + alpha * beta * error, 0.0)
+
+    forecasts = level + phi * trend
+    n_params = np.where(beta == 0, 2, 4)[0]
+
+    # Meilleure configuration de chaque famille (lissage simple / tendance amortie)
+    best = {}
+    for name, family in [('ets', beta[0] == 0), ('tendance_amortie', beta[0] > 0)]:
+        columns = np.flatnonzero(family)
+        choice = columns[np.argmin(sse[:, columns], axis=1)]
+        rows = np.arange(n_rows)
+        best[name] = (sse[rows, choice], m, forecasts[rows, choice], n_params[choice])
+    return best
+
+
+def _stationary(phi):
+    """Whether each row of AR coefficients ``(rows, p)``, lag 1 first, is stationary."""
+    n_rows, p = phi.shape
+    companion = np.zeros((n_rows, p, p))
+    companion[:, 0, :] = phi
+    companion[:, np.arange(1, p), np.arange(p - 1)] = 1.0
+    return np.abs(np.linalg.eigvals(companion)).max(axis=1) < 1
+
+
+def _fit_ar(y, p):
+    """Batched least-squares AR(p) with intercept; returns SSE, n_residuals, forecast, n_params."""
+    windows = np.lib.stride_tricks.sliding_window_view(y, p + 1, axis=1)  # (rows, n_cols - p, p + 1)
+    target = windows[..., -1]
+    design = np.concatenate([np.ones(target.shape + (1,)), windows[..., :-1]], axis=2)
+    # Seules les fenêtres complètes (sans saison manquante) entrent dans l'ajustement
+    mask = ~(np.isnan(target) | np.isnan(design).any(axis=2))
+    target = np.where(mask, target, 0.0)
+    design = np.where(mask[..., None], design, 0.0)
+
+    xtx = np.einsum('rti,rtj->rij', design, design) + 1e-8 * np.eye(p + 1)
+    xty = np.einsum('rti,rt->ri', design, target)
+    coef = np.linalg.solve(xtx, xty[..., None])[..., 0]
+    residuals = np.where(mask, target - np.einsum('rti,ri->rt', design, coef), 0.0)
+    m = mask.sum(axis=1)
+
+    # NaN si l'une des p dernières saisons manque ; rejet des ajustements non stationnaires
+    forecast = coef[:, 0] + (coef[:, 1:] * y[:, -p:]).sum(axis=1)
+    forecast = np.where(_stationary(coef[:, :0:-1]), forecast, np.nan)
+    return (residuals ** 2).sum(axis=1), m, forecast, p + 1
+
+
+def forecast_matrix(matrix):
+    """Next-season forecast of every row: point, 95 % bounds and selected model.
+
+    Rows not observed in the last season get no forecast (model ``'aucun'``).
+    """
+    n_obs = (~np.isnan(matrix)).sum(axis=1)
+    current = ~np.isnan(matrix[:, -1])
+    candidates = _fit_smoothing(matrix)
+    for p in AR_ORDERS:
+        candidates[f'ar{p}'] = _fit_ar(matrix, p)
+
+    names = list(candidates)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        aic = np.column_stack([
+            np.where((m > k + 1) & np.isfinite(forecast),
+                     m * np.log(np.maximum(sse, 1e-12) / m) + 2 * k, np.inf)
+            for sse, m, forecast, k in candidates.values()
+        ])
+        best = np.argmin(aic, axis=1)
+        rows = np.arange(len(matrix))
+        point = np.column_stack([c[2] for c in candidates.values()])[rows, best]
+        sse = np.column_stack([c[0] for c in candidates.values()])[rows, best]
+        m = np.column_stack([c[1] for c in candidates.values()])[rows, best]
+        sigma = np.sqrt(sse / m)
+
+    # Séries trop courtes : dernière valeur observée, sans intervalle
+    short = (n_obs < MIN_OBSERVATIONS) | ~np.isfinite(aic[rows, best])
+    point = np.where(short, matrix[:, -1], point)
+    half_width = np.where(short, np.nan, Z_95 * sigma)
+    model = np.where(short, 'naif', np.array(names, dtype=object)[best])
+
+    point = np.where(current, np.clip(point, *SCORE_RANGE), np.nan)
+    low = np.clip(point - half_width, *SCORE_RANGE)
+    high = np.clip(point + half_width, *SCORE_RANGE)
+    return point, low, high, np.where(current, model, 'aucun')
+
+
+def forecast_scores(df_scores, level):
+    """Next-season forecast of both scores for every entity of ``level``."""
+    entities, seasons, sport, eco = lags.season_matrices(df_scores, level)
+    result = pd.DataFrame({level: entities, 'annee': seasons[-1] + 1})
+    for score, matrix in zip(SCORES, [sport, eco]):
+        point, low, high, model = forecast_matrix(matrix)
+        result[f'{score}_prevision'] = point
+        result[f'{score}_bas'] = low
+        result[f'{score}_haut'] = high
+        result[f'{score}_modele'] = model
+    return result
+
+
+def result_path(level, version):
+    return os.path.join(FORECASTS_PATH, version, f"previsions_{level}.parquet")
+
+
+def load_forecasts(level, df_scores=None):
+    """Forecasts of one level for the current scores archive, computed once per version."""
+    path = result_path(level, catalog.version('previsions'))
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df_scores = loaders.load_scores() if df_scores is None else df_scores
+        forecast_scores(df_scores, level).to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        catalog.record('previsions', path)
+    return pd.read_parquet(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prévision des scores de la saison suivante")
+    parser.add_argument('--levels', nargs='+', choices=LEVELS, default=LEVELS)
+    args = parser.parse_args()
+
+    df_scores = loaders.load_scores()
+    for level in args.levels:
+        df = load_forecasts(level, df_scores)
+        print(f"{len(df)} prévisions {level} ({df['score_sportif_modele'].value_counts().to_dict()})")
+
+
+if __name__ == '__main__':
+    main()
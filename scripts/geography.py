@@ -0,0 +1,210 @@
+"""Canonical registry of régions, départements and communes.
+
+Every table in the project spells places differently (``'ile de france'``,
+``'Île-de-France'``, ``'Pas-de-Calais'``, ``'pas de calais'``, ``62``...).
+The registry gives each entity a dense integer id per level, its INSEE code,
+its canonical name, its parent and a set of normalised name variants.
+Whole columns are resolved at once: only the distinct values are normalised
+and hashed, then the ids are broadcast back with NumPy indexing.
+"""
+# Standard library imports
+import json
+import re
+import unicodedata
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+LEVELS = ('region', 'departement', 'commune')
+UNKNOWN = -1
+AMBIGUOUS = -2
+
+# Régions (codes INSEE 2016) et leurs départements
+REGIONS = {
+    '11': ("Île-de-France", ['75', '77', '78', '91', '92', '93', '94', '95']),
+    '24': ("Centre-Val de Loire", ['18', '28', '36', '37', '41', '45']),
+    '27': ("Bourgogne-Franche-Comté", ['21', '25', '39', '58', '70', '71', '89', '90']),
+    '28': ("Normandie", ['14', '27', '50', '61', '76']),
+    '32': ("Hauts-de-France", ['02', '59', '60', '62', '80']),
+    '44': ("Grand Est", ['08', '10', '51', '52', '54', '55', '57', '67', '68', '88']),
+    '52': ("Pays de la Loire", ['44', '49', '53', '72', '85']),
+    '53': ("Bretagne", ['22', '29', '35', '56']),
+    '75': ("Nouvelle-Aquitaine", ['16', '17', '19', '23', '24', '33', '40', '47', '64', '79', '86', '87']),
+    '76': ("Occitanie", ['09', '11', '12', '30', '31', '32', '34', '46', '48', '65', '66', '81', '82']),
+    '84': ("Auvergne-Rhône-Alpes", ['01', '03', '07', '15', '26', '38', '42', '43', '63', '69', '73', '74']),
+    '93': ("Provence-Alpes-Côte d'Azur", ['04', '05', '06', '13', '83', '84']),
+    '94': ("Corse", ['2A', '2B']),
+    '01': ("Guadeloupe", ['971']),
+    '02': ("Martinique", ['972']),
+    '03': ("Guyane", ['973']),
+    '04': ("La Réunion", ['974']),
+    '06': ("Mayotte", ['976']),
+}
+
+# Départements d'outre-mer, absents du GeoJSON des départements métropolitains
+OUTRE_MER = {'971': "Guadeloupe", '972': "Martinique", '973': "Guyane", '974': "La Réunion", '976': "Mayotte"}
+
+# Noms courts et régions d'avant 2016, fusionnées dans leur région actuelle
+REGION_ALIASES = {
+    '11': ['idf', 'ile de france', 'region parisienne'],
+    '24': ['centre'],
+    '27': ['bfc', 'bourgogne', 'franche comte'],
+    '28': ['basse normandie', 'haute normandie'],
+    '32': ['hdf', 'nord pas de calais', 'picardie'],
+    '44': ['alsace', 'champagne ardenne', 'lorraine', 'alsace champagne ardenne lorraine'],
+    '75': ['aquitaine', 'limousin', 'poitou charentes', 'aquitaine limousin poitou charentes'],
+    '76': ['languedoc roussillon', 'midi pyrenees', 'languedoc roussillon midi pyrenees'],
+    '84': ['aura', 'auvergne', 'rhone alpes'],
+    '93': ['paca', 'provence alpes cote azur'],
+}
+
+
+def normalize_name(name):
+    """Accent-, case- and punctuation-insensitive key for a place name."""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode().lower()
+    text = re.sub(r"[-'’_./()]", ' ', text)
+    text = re.sub(r'\bste\b', 'sainte', re.sub(r'\bst\b', 'saint', text))
+    return ' '.join(text.split())
+
+
+def _code_variants(code):
+    """INSEE code spellings found in the sources: '01', '1', '2A'..."""
+    variants = {code.lower()}
+    if code.isdigit():
+        variants.add(str(int(code)))
+    return variants
+
+
+class GeoRegistry:
+    """Entities per level (dense int ids) with a hashed normalised-name lookup."""
+
+    def __init__(self, regions, departements, communes=None):
+        self.tables = {'region': regions, 'departement': departements}
+        if communes is not None:
+            self.tables['commune'] = communes
+        self._lookup = {level: self._build_lookup(level) for level in self.tables}
+        if 'commune' in self.tables:
+            # Les homonymes sont désambiguïsés par leur département
+            communes = self.tables['commune']
+            self._commune_by_parent = {
+                (normalize_name(nom), parent): i
+                for i, nom, parent in zip(communes.index, communes['nom'], communes['parent_id'])
+            }
+
+    @classmethod
+    def from_geojson(cls, departements_path, communes_path=None):
+        """Build the registry from the département (and optionally commune) GeoJSON files."""
+        regions = pd.DataFrame([{'code': code, 'nom': nom} for code, (nom, _) in REGIONS.items()])
+        region_of = {dep: i for i, (_, deps) in enumerate(REGIONS.values()) for dep in deps}
+
+        with open(departements_path, 'r') as f:
+            features = json.load(f)['features']
+        dep_names = {feat['properties']['code']: feat['properties']['nom'] for feat in features}
+        dep_names.update(OUTRE_MER)
+        departements = pd.DataFrame([{'code': code, 'nom': nom} for code, nom in sorted(dep_names.items())])
+        departements['parent_id'] = departements['code'].map(region_of).fillna(UNKNOWN).astype('int32')
+
+        communes = None
+        if communes_path is not None:
+            with open(communes_path, 'r') as f:
+                features = json.load(f)['features']
+            communes = pd.DataFrame([{'code': str(feat['properties']['code']), 'nom': feat['properties']['nom']}
+                                     for feat in features])
+            dep_id = pd.Series(departements.index, index=departements['code'])
+            dep_code = np.where(communes['code'].str.startswith('97'), communes['code'].str[:3], communes['code'].str[:2])
+            communes['parent_id'] = pd.Series(dep_code).map(dep_id).fillna(UNKNOWN).astype('int32').to_numpy()
+        return cls(regions, departements, communes)
+
+    def _build_lookup(self, level):
+        table = self.tables[level]
+        lookup = {}
+        for i, code, nom in zip(table.index, table['code'], table['nom']):
+            keys = {normalize_name(nom)}
+            if level != 'commune':
+                keys |= _code_variants(code)
+            if level == 'region':
+                keys |= set(REGION_ALIASES.get(code, []))
+            for key in keys:
+                # Un nom partagé par plusieurs entités ne peut pas être résolu seul
+                lookup[key] = AMBIGUOUS if lookup.get(key, i) != i else i
+        if level == 'commune':
+            for i, code in zip(table.index, table['code']):
+                lookup[code.lower()] = i
+                lookup[code.lstrip('0').lower()] = i
+        return lookup
+
+    def __len__(self):
+        return sum(len(t) for t in self.tables.values())
+
+    def names(self, level):
+        return self.tables[level]['nom'].to_numpy()
+
+    def codes(self, level):
+        return self.tables[level]['code'].to_numpy()
+
+    def parents(self, level, ids):
+        """Parent ids of ``ids`` (UNKNOWN stays UNKNOWN)."""
+        ids = np.asarray(ids)
+        parent = self.tables[level]['parent_id'].to_numpy()
+        return np.where(ids >= 0, parent[np.clip(ids, 0, None)], UNKNOWN).astype('int32')
+
+    def resolve(self, values, level, parent_ids=None):
+        """Vectorized resolution of a column of names/codes to int ids (-1 unknown, -2 ambiguous)."""
+        values = pd.Series(values)
+        if parent_ids is not None and level == 'commune':
+            codes, uniques = pd.MultiIndex.from_arrays([values, np.asarray(parent_ids)]).factorize()
+            keys = [(normalize_name(name), parent) for name, parent in uniques]
+            ids = np.array([self._commune_by_parent.get(key, self._lookup[level].get(key[0], UNKNOWN))
+                            for key in keys], dtype='int32')
+        else:
+            codes, uniques = pd.factorize(values)
+            lookup = self._lookup[level]
+            ids = np.array([lookup.get(normalize_name(value), UNKNOWN) for value in uniques], dtype='int32')
+        if len(ids) == 0:
+            return np.full(len(values), UNKNOWN, dtype='int32')
+        return np.where(codes >= 0, ids[np.clip(codes, 0, None)], UNKNOWN).astype('int32')
+
+    def categorize(self, values, level):
+        """Canonical-name categorical whose codes are the registry ids.
+
+        Values the registry cannot resolve are kept verbatim as extra
+        categories after the registry entities, so nothing is silently lost.
+        """
+        if level == 'commune':
+            raise ValueError("Commune names are not unique: use resolve() ids instead")
+        values = pd.Series(values)
+        ids = self.resolve(values, level)
+        categories = list(self.names(level))
+        unresolved = values[(ids < 0) & values.notna()]
+        if len(unresolved):
+            extra, extra_codes = np.unique(unresolved.astype(str), return_inverse=True)
+            ids = ids.copy()
+            ids[np.flatnonzero((ids < 0) & values.notna().to_numpy())] = len(categories) + extra_codes
+            categories += [e for e in extra]
+        ids[ids < 0] = -1
+        return pd.Categorical.from_codes(ids, categories=pd.Index(categories, dtype=object))
+
+    def fill_regions(self, regions, departements):
+        """``regions`` with the unresolved names replaced by the région of their département, when known."""
+        regions = pd.Series(regions)
+        departement_ids = self.resolve(departements, 'departement')
+        missing = (self.resolve(regions, 'region') < 0) & (departement_ids >= 0)
+        if not missing.any():
+            return regions
+        regions = regions.astype(object)
+        regions[missing] = self.names('region')[self.parents('departement', departement_ids[missing])]
+        return regions
+
+    def code_of(self, values, level):
+        """INSEE codes for a column of names (None when unresolved)."""
+        ids = self.resolve(values, level)
+        codes = self.codes(level).astype(object)
+        return np.where(ids >= 0, codes[np.clip(ids, 0, None)], None)
+
+    def is_outre_mer(self, values, level='departement'):
+        """Boolean mask of overseas entities, replacing hand-written exclusion lists."""
+        codes = pd.Series(self.code_of(values, level), dtype=object)
+        if level == 'region':
+            return codes.isin([code for code, (_, deps) in REGIONS.items() if deps[0] in OUTRE_MER]).to_numpy()
+        return codes.isin(list(OUTRE_MER)).to_numpy()
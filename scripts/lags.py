@@ -0,0 +1,108 @@
+"""Lagged cross-correlation between the sport and economic scores.
+
+Scores are laid out as dense ``(entities, seasons)`` matrices (NaN for
+missing seasons). The economic matrix is padded and viewed through a
+sliding window so that every lag from ``-max_lag`` to ``+max_lag`` is a
+slice of one ``(entities, lags, seasons)`` array; all correlations then
+come from a single masked pass of sums over the season axis.
+
+A positive lag ``k`` pairs the sport score of season ``t`` with the
+economic score of season ``t + k``: sport leads the economy.
+
+    python scripts/lags.py
+"""
+# Standard library imports
+import argparse
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import loaders
+import rollup
+
+# Constants
+LAGS_PATH = os.path.join(loaders.DATA_PATH, "lags")
+LEVELS = ['region', 'departement', 'ville']
+MAX_LAG = 3
+MIN_PERIODS = 4
+
+
+def season_matrices(df_scores, level):
+    """Entity names, seasons and the ``(entities, seasons)`` sport and economic matrices."""
+    df = rollup.score_rollup(df_scores)[level]
+    df[level] = df[level].astype(str)
+    entity_codes, entities = pd.factorize(df[level], sort=True)
+    seasons = np.arange(df['annee'].min(), df['annee'].max() + 1)
+    sport = np.full((len(entities), len(seasons)), np.nan)
+    eco = np.full((len(entities), len(seasons)), np.nan)
+    season_codes = df['annee'].to_numpy() - seasons[0]
+    sport[entity_codes, season_codes] = df['score_sportif'].to_numpy()
+    eco[entity_codes, season_codes] = df['score_economique'].to_numpy()
+    return entities, seasons, sport, eco
+
+
+def lagged_correlations(sport, eco, max_lag=MAX_LAG, min_periods=MIN_PERIODS):
+    """``(entities, 2 * max_lag + 1)`` Pearson correlations for lags ``-max_lag..max_lag``.
+
+    Only seasons where both series are present are paired; correlations
+    with fewer than ``min_periods`` pairs are NaN.
+    """
+    n_seasons = sport.shape[1]
+    padded = np.pad(eco, ((0, 0), (max_lag, max_lag)), constant_values=np.nan)
+    # shifted[:, j, t] = eco[:, t + lag] avec lag = j - max_lag
+    shifted = np.lib.stride_tricks.sliding_window_view(padded, n_seasons, axis=1)
+    x = np.broadcast_to(sport[:, None, :], shifted.shape)
+
+    valid = ~(np.isnan(x) | np.isnan(shifted))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, shifted, 0.0)
+    n = valid.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sx, sy = x.sum(axis=2), y.sum(axis=2)
+        sxy = (x * y).sum(axis=2) - sx * sy / n
+        sxx = (x * x).sum(axis=2) - sx * sx / n
+        syy = (y * y).sum(axis=2) - sy * sy / n
+        r = sxy / np.sqrt(sxx * syy)
+    r[n < min_periods] = np.nan
+    return r
+
+
+def lag_table(df_scores, level, max_lag=MAX_LAG, min_periods=MIN_PERIODS):
+    """One row per entity: correlation at every lag, best lag and its strength."""
+    entities, _, sport, eco = season_matrices(df_scores, level)
+    r = lagged_correlations(sport, eco, max_lag, min_periods)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    df = pd.DataFrame(r, columns=[f'decalage_{lag:+d}' for lag in lags])
+    df.insert(0, level, entities)
+    # Meilleur décalage : corrélation la plus forte en valeur absolue
+    has_value = ~np.isnan(r).all(axis=1)
+    best = np.argmax(np.where(np.isnan(r), -1, np.abs(r)), axis=1)
+    df['meilleur_decalage'] = np.where(has_value, lags[best], np.nan)
+    df['force'] = np.where(has_value, r[np.arange(len(r)), best], np.nan)
+    return df
+
+
+def result_path(level, version=None):
+    return os.path.join(LAGS_PATH, f"decalages_{level}-{version or catalog.version('decalages')}.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corrélations décalées entre score sportif et score économique")
+    parser.add_argument('--max-lag', type=int, default=MAX_LAG)
+    parser.add_argument('--min-periods', type=int, default=MIN_PERIODS)
+    args = parser.parse_args()
+
+    df_scores = loaders.load_scores()
+    os.makedirs(LAGS_PATH, exist_ok=True)
+    for level in LEVELS:
+        lag_table(df_scores, level, args.max_lag, args.min_periods).to_csv(result_path(level), index=False)
+        catalog.record('decalages', result_path(level))
+        print(f"Décalages {level} écrits dans {result_path(level)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""In-season ingestion of match results and standings.
+
+Results arrive as JSON Lines files dropped in ``data/flux/entrant`` (write
+the file elsewhere, then move it there: the directory is the queue). Each
+line is either a match or a standings row::
+
+    {"type": "match", "sport": "rugby", "saison": 2024, "division": 1,
+     "domicile": "Toulouse", "exterieur": "Castres", "score_domicile": 30, "score_exterieur": 10}
+    {"type": "classement", "sport": "rugby", "saison": 2024, "division": 1,
+     "club": "Toulouse", "classement": 1, "points": 60, "joues": 20, "difference": 150}
+
+Matches update the points of both clubs (scale ``points`` of each sport in
+:data:`sport_scores.SPORTS`) and re-rank their division; standings rows set
+a club's line as published. Only what changed is recomputed: the
+club-seasons whose division or rank moved, the communes of those clubs,
+and the départements and régions of those communes. A club's other
+components (European run, fill rate) are carried over from its last known
+season until the season is consolidated by the batch build.
+
+Live tables are written to ``data/flux/scores`` and the ``VERSION`` file is
+replaced last: the dashboard keys its caches on that file (catalog entry
+``direct``), so the next rerun of each session reads the new standings.
+Each batch also appends the updated entities to ``invalidations.jsonl``.
+
+Invalid lines (unknown sport or type, missing key, non-numeric value) are
+skipped and reported; they are copied to ``data/flux/rejetes`` with the
+reason. A file that cannot be read, or whose batch fails, is moved there
+whole instead of staying in the queue.
+
+    python scripts/live_scores.py watch --interval 30
+    python scripts/live_scores.py ingest resultats.jsonl
+"""
+# Standard library imports
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import disk_cache
+import loaders
+import sport_scores
+
+# Constants
+FLUX_PATH = os.path.join(loaders.DATA_PATH, "flux")
+INBOX_PATH = os.path.join(FLUX_PATH, "entrant")
+DONE_PATH = os.path.join(FLUX_PATH, "traites")
+REJECTED_PATH = os.path.join(FLUX_PATH, "rejetes")
+SCORES_PATH = os.path.join(FLUX_PATH, "scores")
+STANDINGS_PATH = os.path.join(FLUX_PATH, "classements.parquet")
+VERSION_PATH = os.path.join(FLUX_PATH, "VERSION")
+INVALIDATIONS_PATH = os.path.join(FLUX_PATH, "invalidations.jsonl")
+LEVELS = ['club', 'commune', 'departement', 'region']
+LEAGUE = ['sport', 'fin_saison', 'division']
+STANDING_COLUMNS = LEAGUE + ['club', 'joues', 'points', 'difference', 'classement']
+REQUIRED = {
+    'match': {'texte': ['domicile', 'exterieur'], 'nombre': ['score_domicile', 'score_exterieur']},
+    'classement': {'texte': ['club'], 'nombre': []},
+}
+
+
+def _write_atomic(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_state():
+    """Standings and live score tables (the batch scores on first use)."""
+    if os.path.exists(STANDINGS_PATH):
+        standings = pd.read_parquet(STANDINGS_PATH)
+    else:
+        dtypes = {'sport': 'object', 'club': 'object', 'fin_saison': 'int64', 'division': 'int64'}
+        standings = pd.DataFrame({column: pd.Series(dtype=dtypes.get(column, 'float64'))
+                                  for column in STANDING_COLUMNS})
+    tables = {}
+    for level in LEVELS:
+        path = os.path.join(SCORES_PATH, f"{level}.parquet")
+        tables[level] = pd.read_parquet(path) if os.path.exists(path) else sport_scores.load_sport_scores(level)
+    tables['club']['sport'] = tables['club']['sport'].astype(str)
+    return standings, tables
+
+
+def _is_number(value):
+    try:
+        return not isinstance(value, bool) and np.isfinite(float(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def check_record(record, sports=sport_scores.SPORTS):
+    """Reason why ``record`` cannot be applied, or None when it is valid."""
+    if not isinstance(record, dict):
+        return "ligne qui n'est pas un objet JSON"
+    if record.get('type') not in REQUIRED:
+        return f"type inconnu : {record.get('type')!r}"
+    if not isinstance(record.get('sport'), str) or record['sport'] not in sports:
+        return f"sport inconnu : {record.get('sport')!r}"
+    required = REQUIRED[record['type']]
+    missing = [key for key in ['saison', 'division'] + required['texte'] + required['nombre'] if record.get(key) is None]
+    if missing:
+        return f"clé(s) absente(s) : {', '.join(missing)}"
+    numbers = ['saison', 'division'] + required['nombre']
+    if record['type'] == 'classement':
+        numbers += [column for column in STANDING_COLUMNS[4:] if record.get(column) is not None]
+    invalid = [key for key in numbers if not _is_number(record[key])]
+    if invalid:
+        return f"valeur(s) non numérique(s) : {', '.join(invalid)}"
+    return None
+
+
+def read_records(path, sports=sport_scores.SPORTS):
+    """Valid records of a JSON Lines file, and the ``(line, reason)`` of the rejected ones."""
+    records, rejected = [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                reason = check_record(record, sports)
+            except ValueError as e:
+                reason = f"JSON invalide : {e}"
+            if reason is None:
+                records.append(record)
+            else:
+                rejected.append((line.rstrip('\n'), reason))
+    return records, rejected
+
+
+def _reject_file(path, reason):
+    """Move a file out of the queue to ``rejetes``, with the reason next to it."""
+    print(f"{path} : rejeté ({reason})", file=sys.stderr)
+    os.makedirs(REJECTED_PATH, exist_ok=True)
+    target = os.path.join(REJECTED_PATH, os.path.basename(path))
+    if os.path.dirname(os.path.abspath(path)) == INBOX_PATH:
+        shutil.move(path, target)
+    with open(target + ".erreurs", 'a', encoding='utf-8') as f:
+        f.write(reason + "\n")
+
+
+def _reject_lines(path, rejected):
+    """Copy the rejected lines of a file to ``rejetes``, with their reasons."""
+    os.makedirs(REJECTED_PATH, exist_ok=True)
+    target = os.path.join(REJECTED_PATH, os.path.basename(path))
+    with open(target, 'a', encoding='utf-8') as f, open(target + ".erreurs", 'a', encoding='utf-8') as errors:
+        for line, reason in rejected:
+            print(f"{path} : ligne ignorée ({reason})", file=sys.stderr)
+            f.write(line + "\n")
+            errors.write(reason + "\n")
+
+
+def apply_records(standings, records, sports=sport_scores.SPORTS):
+    """Standings after ``records``; re-ranks the divisions that received matches."""
+    lines = {tuple(key): dict(zip(STANDING_COLUMNS[4:], values)) for key, values in zip(
+        standings[STANDING_COLUMNS[:4]].itertuples(index=False), standings[STANDING_COLUMNS[4:]].to_numpy())}
+    reranked = set()
+    for record in records:
+        league = (record['sport'], int(record['saison']), int(record['division']))
+        if record['type'] == 'classement':
+            line = lines.setdefault(league + (record['club'],), dict.fromkeys(STANDING_COLUMNS[4:], np.nan))
+            line.update({column: float(record[column]) for column in STANDING_COLUMNS[4:] if column in record})
+            continue
+
+        scale = sports[record['sport']].get('points', sport_scores.POINTS)
+        home, away = record['score_domicile'], record['score_exterieur']
+        for club, scored, conceded in ((record['domicile'], home, away), (record['exterieur'], away, home)):
+            line = lines.setdefault(league + (club,), dict.fromkeys(STANDING_COLUMNS[4:], np.nan))
+            outcome = 'victoire' if scored > conceded else ('nul' if scored == conceded else 'defaite')
+            line['joues'] = np.nan_to_num(line['joues']) + 1
+            line['points'] = np.nan_to_num(line['points']) + scale[outcome]
+            line['difference'] = np.nan_to_num(line['difference']) + scored - conceded
+        reranked.add(league)
+
+    table = pd.DataFrame([key + tuple(line[c] for c in STANDING_COLUMNS[4:]) for key, line in lines.items()],
+                         columns=STANDING_COLUMNS).astype({'fin_saison': 'int64', 'division': 'int64'})
+    if reranked:
+        in_reranked = pd.Series(list(zip(*(table[c] for c in LEAGUE)))).isin(reranked).to_numpy()
+        ranked = table[in_reranked].sort_values(['points', 'difference', 'club'], ascending=[False, False, True])
+        table.loc[ranked.index, 'classement'] = ranked.groupby(LEAGUE).cumcount().to_numpy() + 1.0
+    return table
+
+
+def changed_rows(before, after):
+    """Standings rows whose rank is new or different."""
+    merged = after.merge(before[LEAGUE + ['club', 'classement']], on=LEAGUE + ['club'], how='left',
+                         suffixes=('', '_avant'))
+    moved = merged['classement'].notna() & (merged['classement'] != merged['classement_avant'])
+    return merged.loc[moved, STANDING_COLUMNS]
+
+
+def update_clubs(clubs, changes, sports=sport_scores.SPORTS):
+    """Club score table with the changed club-seasons rescored; returns it and the updated rows."""
+    clubs = clubs.reset_index(drop=True)
+    key = ['sport', 'club', 'fin_saison']
+    changes = changes.rename(columns={'classement': 'classement_direct', 'division': 'division_directe'})
+    changes = changes[changes['sport'].isin(list(sports))]
+    # Clubs hors du territoire suivi : comptés dans le classement, pas dans les scores
+    latest = clubs.sort_values('fin_saison').drop_duplicates(['sport', 'club'], keep='last')
+    changes = changes[changes.set_index(['sport', 'club']).index.isin(latest.set_index(['sport', 'club']).index)]
+    if changes.empty:
+        return clubs, clubs.iloc[0:0]
+
+    existing = clubs.set_index(key).index
+    new_keys = changes.set_index(key).index.difference(existing)
+    if len(new_keys):
+        # Nouvelle saison : métadonnées et autres composantes reprises de la dernière saison connue
+        new_rows = new_keys.to_frame(index=False).merge(latest.drop(columns='fin_saison'), on=['sport', 'club'])
+        clubs = pd.concat([clubs, new_rows[clubs.columns]], ignore_index=True)
+
+    keys = clubs.set_index(key).index
+    rows = keys.isin(changes.set_index(key).index)
+    lookup = changes.drop_duplicates(key, keep='last').set_index(key).reindex(keys[rows])
+    clubs.loc[rows, 'division'] = lookup['division_directe'].to_numpy(dtype='float64')
+    clubs.loc[rows, 'classement'] = lookup['classement_direct'].to_numpy(dtype='float64')
+    updated = clubs.loc[rows]
+    s = pd.Categorical(updated['sport'], categories=list(sports)).codes
+    clubs.loc[rows, 'composante_classement'], clubs.loc[rows, 'composante_division'] = sport_scores.rank_components(
+        sports, s, updated['fin_saison'].to_numpy(), updated['division'].to_numpy(),
+        updated['classement'].to_numpy(dtype='float64'))
+    clubs.loc[rows, 'score'] = sport_scores.weighted_score(clubs.loc[rows], sports)
+    return clubs, clubs.loc[rows]
+
+
+def _replace(table, fresh, column, values):
+    kept = table[~table[column].astype(str).isin(values)]
+    fresh = fresh.reindex(columns=table.columns.union(fresh.columns, sort=False))
+    return pd.concat([kept, fresh], ignore_index=True)
+
+
+def update_aggregates(tables, updated_clubs):
+    """Communes, départements and régions of the updated clubs recomputed, every level rescaled."""
+    communes = set(updated_clubs['code_commune'].astype(str))
+    clubs = tables['club']
+    fresh = sport_scores.commune_scores(clubs[clubs['code_commune'].astype(str).isin(communes)])
+    tables['commune'] = _replace(tables['commune'], fresh, 'code_commune', communes)
+    affected = {'commune': sorted(communes)}
+
+    # Communes des régions touchées : couvrent aussi leurs départements, agrégés dans la même passe
+    regions = set(fresh['region'].astype(str))
+    rolled = sport_scores.aggregate(tables['commune'][tables['commune']['region'].astype(str).isin(regions)])
+    for level in ('departement', 'region'):
+        names = set(fresh[level].astype(str))
+        result = rolled[level]
+        tables[level] = _replace(tables[level], result[result[level].astype(str).isin(names)], level, names)
+        affected[level] = sorted(names)
+
+    # Le maximum des communes peut avoir changé : mise à l'échelle de tous les niveaux
+    scale = tables['commune']['score_brut'].max()
+    for level in ('commune', 'departement', 'region'):
+        tables[level]['score_sportif'] = tables[level]['score_brut'] / scale
+    return affected
+
+
+def process(records):
+    """Apply a batch of records and publish the live tables; returns the updated entities."""
+    standings, tables = load_state()
+    after = apply_records(standings, records)
+    tables['club'], updated = update_clubs(tables['club'], changed_rows(standings, after))
+    affected = update_aggregates(tables, updated) if len(updated) else {}
+
+    os.makedirs(SCORES_PATH, exist_ok=True)
+    _write_atomic(after, STANDINGS_PATH)
+    for level in LEVELS:
+        _write_atomic(tables[level], os.path.join(SCORES_PATH, f"{level}.parquet"))
+    affected['club'] = sorted(updated['club'].astype(str).unique()) if len(updated) else []
+    with open(INVALIDATIONS_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(dict(affected, horodatage=time.strftime('%Y-%m-%dT%H:%M:%S')), ensure_ascii=False) + "\n")
+    # Dernière écriture : change la version lue par le tableau de bord
+    with open(VERSION_PATH + ".tmp", 'w') as f:
+        f.write(uuid.uuid4().hex)
+    os.replace(VERSION_PATH + ".tmp", VERSION_PATH)
+    return affected
+
+
+def ingest(paths):
+    """Process files in name order under the ingestion lock and move them to ``traites``.
+
+    Invalid lines are skipped; unreadable files, and the files of a batch
+    that fails, go to ``rejetes``.
+    """
+    with disk_cache.file_lock(os.path.join(FLUX_PATH, ".ingestion.lock")):
+        records, read = [], []
+        for path in paths:
+            try:
+                file_records, rejected = read_records(path)
+            except (OSError, UnicodeDecodeError) as e:
+                _reject_file(path, f"{type(e).__name__}: {e}")
+                continue
+            if rejected:
+                _reject_lines(path, rejected)
+            records += file_records
+            read.append(path)
+        try:
+            affected = process(records) if records else {}
+        except Exception as e:
+            for path in read:
+                _reject_file(path, f"{type(e).__name__}: {e}")
+            return 0, {}
+        os.makedirs(DONE_PATH, exist_ok=True)
+        for path in read:
+            if os.path.dirname(os.path.abspath(path)) == INBOX_PATH:
+                shutil.move(path, os.path.join(DONE_PATH, os.path.basename(path)))
+    return len(records), affected
+
+
+def pending():
+    if not os.path.isdir(INBOX_PATH):
+        return []
+    return sorted(os.path.join(INBOX_PATH, name) for name in os.listdir(INBOX_PATH) if name.endswith('.jsonl'))
+
+
+def load_live_scores(level):
+    """Live table of one level (None until the first batch was ingested)."""
+    path = os.path.join(SCORES_PATH, f"{level}.parquet")
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion des résultats et classements en cours de saison")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    watch_parser = subparsers.add_parser('watch', help=f"Surveiller {INBOX_PATH}")
+    watch_parser.add_argument('--interval', type=float, default=30, help="Secondes entre deux passages")
+    ingest_parser = subparsers.add_parser('ingest', help="Traiter des fichiers JSON Lines")
+    ingest_parser.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        n_records, affected = ingest(args.paths)
+        print(f"{n_records} enregistrement(s), {len(affected.get('commune', []))} commune(s) mise(s) à jour")
+        return
+
+    os.makedirs(INBOX_PATH, exist_ok=True)
+    print(f"En attente de fichiers dans {INBOX_PATH}")
+    while True:
+        paths = pending()
+        if paths:
+            start = time.perf_counter()
+            n_records, affected = ingest(paths)
+            print(f"{time.strftime('%H:%M:%S')} {n_records} enregistrement(s) de {len(paths)} fichier(s), "
+                  f"{len(affected.get('commune', []))} commune(s) mise(s) à jour en {time.perf_counter() - start:.2f} s",
+                  flush=True)
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
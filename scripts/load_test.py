@@ -0,0 +1,393 @@
+"""Load test of the dashboard: simulated users against one Streamlit server.
+
+The app is started locally (or an already running server is targeted with
+``--url``) and each simulated user opens its own websocket session, as a
+browser tab does, then replays :data:`SCENARIO`: granularity, région and
+ville selectors, sector filters, browsing a sheet of the scores archive and
+its pages. Each step sends the new widget state and waits for the end of
+the rerun; the time in between is the rerun latency the user would see.
+Switching between ``st.tabs`` stays in the browser (every tab is rendered
+at each rerun), so it costs the server nothing by itself.
+
+Levels of concurrent users are played one after the other on the same
+server. For each level the run records p50/p95/p99 latency and throughput,
+and the CPU and RSS of the server are sampled the whole time. Results go
+to ``data/bench/charge/<date>/``:
+
+* ``latences.csv``: one row per rerun;
+* ``ressources.csv``: CPU and RSS over time;
+* ``capacite.csv`` and ``capacite.html``: the capacity curve.
+
+The reported capacity is the largest level whose p95 stays within
+``--budget``.
+
+    python scripts/load_test.py --users 1 2 5 10 20 --duration 60
+    python scripts/load_test.py --url http://localhost:8501 --pid 12345
+"""
+# Standard library imports
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import loaders
+
+try:
+    import psutil
+except ImportError:  # Linux : lecture directe de /proc
+    psutil = None
+
+# Constants
+SCRIPTS_PATH = os.path.dirname(os.path.abspath(__file__))
+LOAD_PATH = os.path.join(loaders.DATA_PATH, "bench", "charge")
+APP_PATH = os.path.join(SCRIPTS_PATH, "app.py")
+USERS = [1, 2, 5, 10, 20]
+DURATION_SECONDS = 60
+THINK_SECONDS = (1.0, 3.0)
+BUDGET_SECONDS = 2.0
+SAMPLE_SECONDS = 0.5
+START_TIMEOUT = 120
+RERUN_TIMEOUT = 300
+PERCENTILES = [50, 95, 99]
+
+# Étapes d'une visite : widget visé (libellé ou clé) et action ; les onglets ne passent pas par le serveur
+SCENARIO = [
+    ('Sélectionnez une granularité', 'choisir'),
+    ('Sélectionnez une région', 'choisir'),
+    ('ville_selector', 'choisir'),
+    ('Région:', 'choisir'),
+    ('Secteur:', 'choisir'),
+    ('Sélectionner une feuille:', 'choisir'),
+    ('viewer_page', 'suivant'),
+    ('dept_selector', 'choisir'),
+]
+WIDGETS = ('selectbox', 'radio', 'multiselect', 'number_input')
+
+
+def _proto():
+    # Import différé : protobuf de la version de Streamlit installée
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.proto.Selectbox_pb2 import Selectbox
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    # Versions récentes : valeur des sélecteurs transmise en texte, avant : par indice
+    return BackMsg, ForwardMsg, WidgetState, 'raw_value' in Selectbox.DESCRIPTOR.fields_by_name
+
+
+class Session:
+    """One simulated user: a websocket session replaying :data:`SCENARIO`."""
+
+    def __init__(self, url, rng):
+        self.url = url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream'
+        self.rng = rng
+        self.widgets = {}
+        self.states = {}
+        self.BackMsg, self.ForwardMsg, self.WidgetState, self.by_text = _proto()
+
+    async def __aenter__(self):
+        import websockets
+
+        self.socket = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None,
+                                               open_timeout=START_TIMEOUT)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.socket.close()
+
+    async def rerun(self):
+        """Send the current widget states and wait for the end of the run; returns ``(seconds, status)``.
+
+        A run that displayed an exception reports it as its status instead of
+        ``FINISHED_SUCCESSFULLY``.
+        """
+        msg = self.BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.socket.send(msg.SerializeToString())
+        widgets = {}
+        exception = None
+        while True:
+            forward = self.ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.socket.recv(), RERUN_TIMEOUT))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                widget = element.WhichOneof('type')
+                if widget == 'exception':
+                    # Exception affichée dans la page : le script se termine quand même « avec succès »
+                    exception = exception or f"EXCEPTION {element.exception.type}: {element.exception.message}"
+                elif widget in WIDGETS:
+                    proto = getattr(element, widget)
+                    widgets.setdefault(proto.label, (widget, proto))
+                    widgets[proto.id] = (widget, proto)
+            elif kind == 'script_finished':
+                status = self.ForwardMsg.ScriptFinishedStatus.Name(forward.script_finished)
+                if status != 'FINISHED_EARLY_FOR_RERUN':
+                    self.widgets = widgets
+                    return time.perf_counter() - start, exception or status
+                exception = None
+
+    def _find(self, target):
+        if target in self.widgets:
+            return self.widgets[target]
+        # Widgets avec clé : identifiant terminé par la clé
+        return next((w for wid, w in self.widgets.items() if wid.endswith(f'-{target}')), None)
+
+    def act(self, target, action):
+        """Change the widget ``target`` as a user would; False when it is not on the page."""
+        found = self._find(target)
+        if found is None:
+            return False
+        widget, proto = found
+        options = list(getattr(proto, 'options', []))
+        state = self.WidgetState(id=proto.id)
+        if widget in ('selectbox', 'radio'):
+            if not options:
+                return False
+            index = self.rng.randrange(len(options))
+            if self.by_text:
+                state.string_value = options[index]
+            else:
+                state.int_value = index
+        elif widget == 'multiselect':
+            if not options:
+                return False
+            indices = sorted(self.rng.sample(range(len(options)), self.rng.randint(1, len(options))))
+            if self.by_text:
+                state.string_array_value.data.extend(options[i] for i in indices)
+            else:
+                state.int_array_value.data.extend(indices)
+        else:
+            previous = self.states.get(proto.id)
+            value = (previous.double_value or previous.int_value) if previous else proto.default
+            value = value + proto.step if action == 'suivant' else proto.default
+            if proto.has_max and value > proto.max:
+                value = proto.min if proto.has_min else proto.default
+            if self.by_text or proto.data_type == proto.FLOAT:
+                state.double_value = value
+            else:
+                state.int_value = int(value)
+        self.states[proto.id] = state
+        return True
+
+
+async def _user(url, user_id, deadline, level, rows, seed):
+    rng = random.Random(seed * 1000 + user_id)
+    async with Session(url, rng) as session:
+        seconds, status = await session.rerun()
+        rows.append((level, user_id, time.time(), 'ouverture', seconds, status))
+        step = 0
+        while time.time() < deadline:
+            await asyncio.sleep(rng.uniform(*THINK_SECONDS))
+            target, action = SCENARIO[step % len(SCENARIO)]
+            step += 1
+            if not session.act(target, action):
+                continue
+            seconds, status = await session.rerun()
+            rows.append((level, user_id, time.time(), target, seconds, status))
+
+
+async def run_level(url, n_users, duration, seed=0):
+    """Reruns of ``n_users`` concurrent users during ``duration`` seconds."""
+    rows = []
+    deadline = time.time() + duration
+    # Arrivées étalées sur une seconde, comme des visiteurs réels
+    tasks = []
+    for user_id in range(n_users):
+        tasks.append(asyncio.create_task(_user(url, user_id, deadline, n_users, rows, seed)))
+        await asyncio.sleep(1 / n_users)
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Exception):
+            rows.append((n_users, -1, time.time(), 'erreur', np.nan, f"{type(result).__name__}: {result}"))
+    return rows
+
+
+def _proc_stats(pid):
+    """Cumulated CPU seconds and RSS bytes of ``pid`` read from /proc."""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f'/proc/{pid}/statm') as f:
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return cpu, rss
+
+
+def process_stats(pid):
+    """Cumulated CPU seconds and RSS bytes of the server and its child processes."""
+    if psutil is None:
+        return _proc_stats(pid)
+    cpu, rss = 0.0, 0
+    process = psutil.Process(pid)
+    for p in [process] + process.children(recursive=True):
+        try:
+            times = p.cpu_times()
+            cpu += times.user + times.system
+            rss += p.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return cpu, rss
+
+
+class ResourceSampler(threading.Thread):
+    """Background sampling of the server CPU (% of one core) and RSS."""
+
+    def __init__(self, pid, interval=SAMPLE_SECONDS):
+        super().__init__(name='echantillonnage', daemon=True)
+        self.pid, self.interval = pid, interval
+        self.level = 0
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        previous_cpu, previous_time = process_stats(self.pid)[0], time.perf_counter()
+        while not self._done.wait(self.interval):
+            try:
+                cpu, rss = process_stats(self.pid)
+            except (FileNotFoundError, ProcessLookupError):
+                break
+            now = time.perf_counter()
+            self.samples.append((self.level, time.time(), 100 * (cpu - previous_cpu) / (now - previous_time), rss))
+            previous_cpu, previous_time = cpu, now
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def start_server(port):
+    """Start ``streamlit run app.py`` headless on ``port``; returns the process once it answers."""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH, '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none',
+         '--server.enableStaticServing', 'true'],
+        cwd=SCRIPTS_PATH, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://localhost:{port}'
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Le serveur Streamlit s'est arrêté (code {process.returncode})")
+        try:
+            with urllib.request.urlopen(f'{url}/_stcore/health', timeout=2) as response:
+                if response.status == 200:
+                    return process, url
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"Le serveur Streamlit ne répond pas après {START_TIMEOUT} s")
+
+
+def capacity_curve(latencies, resources, budget=BUDGET_SECONDS):
+    """Latency percentiles, throughput and resources of every level of users."""
+    rows = []
+    for level, group in latencies.groupby('utilisateurs'):
+        reruns = group[(group['etape'] != 'erreur') & group['secondes'].notna()]
+        used = resources[resources['utilisateurs'] == level]
+        duration = group['horodatage'].max() - group['horodatage'].min()
+        row = {'utilisateurs': level, 'reruns': len(reruns),
+               'erreurs': int((group['etape'] == 'erreur').sum() + (reruns['statut'] != 'FINISHED_SUCCESSFULLY').sum()),
+               'reruns_par_s': len(reruns) / duration if duration > 0 else np.nan}
+        for p in PERCENTILES:
+            row[f'p{p}_s'] = np.percentile(reruns['secondes'], p) if len(reruns) else np.nan
+        row['cpu_moyen_pct'] = used['cpu_pct'].mean()
+        row['rss_max_mo'] = used['rss_mo'].max()
+        rows.append(row)
+    curve = pd.DataFrame(rows)
+    curve['dans_le_budget'] = curve['p95_s'] <= budget
+    return curve
+
+
+def curve_figure(curve, budget=BUDGET_SECONDS):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("Latence des reruns", "Ressources du serveur"),
+                        specs=[[{}, {'secondary_y': True}]])
+    for p in PERCENTILES:
+        fig.add_trace(go.Scatter(x=curve['utilisateurs'], y=curve[f'p{p}_s'], mode='lines+markers', name=f"p{p}"),
+                      row=1, col=1)
+    fig.add_hline(y=budget, line_dash='dash', annotation_text="budget", row=1, col=1)
+    fig.add_trace(go.Scatter(x=curve['utilisateurs'], y=curve['cpu_moyen_pct'], mode='lines+markers',
+                             name="CPU moyen (%)"), row=1, col=2)
+    fig.add_trace(go.Scatter(x=curve['utilisateurs'], y=curve['rss_max_mo'], mode='lines+markers',
+                             name="RSS max (Mo)"), row=1, col=2, secondary_y=True)
+    fig.update_xaxes(title_text="Utilisateurs simultanés", type='log')
+    fig.update_yaxes(title_text="Secondes", row=1, col=1)
+    fig.update_layout(title="Courbe de capacité d'un réplica", template='plotly_white')
+    return fig
+
+
+def run(url, pid, levels, duration, seed=0):
+    """Play every level of users; returns the latency and resource tables."""
+    sampler = ResourceSampler(pid) if pid else None
+    if sampler:
+        sampler.start()
+    rows = []
+    try:
+        for n_users in levels:
+            if sampler:
+                sampler.level = n_users
+            rows += asyncio.run(run_level(url, n_users, duration, seed))
+            print(f"{n_users:4} utilisateur(s) : {sum(r[0] == n_users for r in rows)} rerun(s)")
+    finally:
+        if sampler:
+            sampler.stop()
+    latencies = pd.DataFrame(rows, columns=['utilisateurs', 'utilisateur', 'horodatage', 'etape', 'secondes', 'statut'])
+    resources = pd.DataFrame(sampler.samples if sampler else [],
+                             columns=['utilisateurs', 'horodatage', 'cpu_pct', 'rss_octets'])
+    resources['rss_mo'] = resources.pop('rss_octets') / 1e6
+    return latencies, resources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du tableau de bord Streamlit")
+    parser.add_argument('--users', type=int, nargs='+', default=USERS, help="Paliers d'utilisateurs simultanés")
+    parser.add_argument('--duration', type=float, default=DURATION_SECONDS, help="Durée de chaque palier (s)")
+    parser.add_argument('--budget', type=float, default=BUDGET_SECONDS, help="p95 acceptable d'un rerun (s)")
+    parser.add_argument('--url', help="Serveur déjà lancé (sinon app.py est démarrée localement)")
+    parser.add_argument('--pid', type=int, help="Processus du serveur déjà lancé, pour mesurer CPU et RSS")
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        process, url = start_server(args.port)
+        pid = process.pid
+    try:
+        # Session de préchauffage : les caches froids ne comptent pas dans les paliers
+        asyncio.run(run_level(url, 1, 0, args.seed))
+        latencies, resources = run(url, pid, sorted(args.users), args.duration, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    curve = capacity_curve(latencies, resources, args.budget)
+    directory = os.path.join(LOAD_PATH, time.strftime('%Y%m%d-%H%M%S'))
+    os.makedirs(directory, exist_ok=True)
+    latencies.to_csv(os.path.join(directory, "latences.csv"), index=False)
+    resources.to_csv(os.path.join(directory, "ressources.csv"), index=False)
+    curve.to_csv(os.path.join(directory, "capacite.csv"), index=False)
+    curve_figure(curve, args.budget).write_html(os.path.join(directory, "capacite.html"), include_plotlyjs='cdn')
+
+    print(curve.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    within = curve.loc[curve['dans_le_budget'], 'utilisateurs']
+    print(f"Capacité estimée : {within.max() if len(within) else 0} utilisateur(s) simultané(s) "
+          f"avec un p95 ≤ {args.budget:.1f} s → {directory}")
+
+
+if __name__ == '__main__':
+    main()
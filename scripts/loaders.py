@@ -0,0 +1,174 @@
+# Standard library imports
+import functools
+import hashlib
+import os
+import zipfile
+
+# Third-party imports
+import pandas as pd
+
+import geography
+
+# Constants
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_PATH, "data")
+SCORES_ZIP = os.path.join(DATA_PATH, "Scores-final.zip")
+COMMUNES_GEOJSON = os.path.join(DATA_PATH, "communes.geojson")
+DEPARTEMENTS_GEOJSON = os.path.join(DATA_PATH, "departements.geojson")
+MAIN_TABLE = os.path.join(DATA_PATH, "main_table_2012_2023 - new_main_table_2012_2023.csv")
+SECTOR_CSV = os.path.join(DATA_PATH, "df_filtered_secteurs_88.csv")
+CLUBS_XLSX = os.path.join(DATA_PATH, "score_sport.xlsx")
+CORR_DPT_CSV = os.path.join(DATA_PATH, "corr_dpt.csv")
+
+# Pondérations du score sectoriel (Outil_secteur.ipynb)
+SECTOR_WEIGHTS = {'part_effectif': 0.5, 'part_entreprise': 0.5}
+
+SECTOR_DTYPES = {
+    'code_postal': 'category',
+    'region': 'category',
+    'departement': 'category',
+    'zone': 'category',
+    'grand_secteur_d_activite': 'category',
+    'secteur_na17': 'category',
+    'secteur_na38': 'category',
+    'secteur_na88': 'category',
+    'année': 'int32',
+    'nb_effectif': 'float32',
+    'nb_effectif_total': 'float32',
+    'nb_entreprise': 'float32',
+    'nb_entreprise_total': 'float32'
+}
+
+
+def parse_annee(series):
+    """Convert season labels such as '2 012' or '2012.0' to integer years."""
+    return series.astype(str).str.replace(r'\.0$', '', regex=True).str.replace(r'\D', '', regex=True).astype(int)
+
+
+def file_version(path, chunk_size=1024 * 1024):
+    """Short content hash of a source file, used to key derived results."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def load_registry():
+    """Geographic registry, with communes when their GeoJSON is available."""
+    communes_path = COMMUNES_GEOJSON if os.path.exists(COMMUNES_GEOJSON) else None
+    return geography.GeoRegistry.from_geojson(DEPARTEMENTS_GEOJSON, communes_path)
+
+
+def canonicalize_geography(df):
+    """Replace région/département name columns by registry-coded categoricals."""
+    registry = load_registry()
+    if 'region' in df.columns and 'departement' in df.columns:
+        df['region'] = registry.fill_regions(df['region'], df['departement'])
+    for level in ('region', 'departement'):
+        if level in df.columns:
+            df[level] = registry.categorize(df[level], level)
+    return df
+
+
+def read_scores():
+    """Raw commune-level sport and economic scores of the scores archive (see :mod:`schema`)."""
+    with zipfile.ZipFile(SCORES_ZIP) as z:
+        with z.open("Scores/scores.xlsx") as f:
+            return pd.read_excel(f)
+
+
+def read_department_scores():
+    """Raw département-level scores of the scores archive (the series of ``correlation_departement``)."""
+    with zipfile.ZipFile(SCORES_ZIP) as z:
+        with z.open("Scores/scores.xlsx") as f:
+            return pd.read_excel(f, sheet_name='departement')
+
+
+def read_correlations():
+    """Raw per-département correlations (sheet df_total of score_correlation.xlsx)."""
+    with zipfile.ZipFile(SCORES_ZIP) as z:
+        with z.open("Scores/score_correlation.xlsx") as f:
+            return pd.read_excel(f, sheet_name='df_total')
+
+
+def read_department_correlations():
+    """Raw per-département correlations of ``corr_dpt.csv`` (decimal commas)."""
+    return pd.read_csv(CORR_DPT_CSV, dtype=str)
+
+
+def read_club_sheet(sheet_name):
+    """Raw sheet of the club workbook; season and commune columns named alike in every sheet."""
+    df = pd.read_excel(CLUBS_XLSX, sheet_name=sheet_name, dtype={'code_commune': str, 'code commune': str})
+    df.columns = df.columns.str.strip()
+    return df.rename(columns={'fin saison': 'fin_saison', 'code commune': 'code_commune'})
+
+
+def read_clubs():
+    """Raw club table (one row per club and season) from the concat_sports sheet."""
+    return read_club_sheet("concat_sports")
+
+
+def read_main_table():
+    """Raw club x season table the scores are computed from."""
+    return pd.read_csv(MAIN_TABLE)
+
+
+def read_sector():
+    """URSSAF sector dataset with the 50/50 score_sectoriel derived."""
+    df = pd.read_csv(SECTOR_CSV, dtype=SECTOR_DTYPES, low_memory=False)
+
+    if 'score_sectoriel' not in df.columns:
+        df["part_effectif"] = (df["nb_effectif"] / df["nb_effectif_total"] * 100).round(2)
+        df["part_entreprise"] = (df["nb_entreprise"] / df["nb_entreprise_total"] * 100).round(2)
+        df['score_sectoriel'] = sum(weight * df[col] for col, weight in SECTOR_WEIGHTS.items())
+        min_score = df['score_sectoriel'].min()
+        max_score = df['score_sectoriel'].max()
+        df['score_sectoriel'] = (df['score_sectoriel'] - min_score) / (max_score - min_score)
+
+    return df
+
+
+def _load_clean(name):
+    # Imports différés : schema et compact s'appuient sur ce module
+    import compact
+    import schema
+
+    df = schema.load_clean(name)
+    return compact.compact(df) if compact.ENABLED else df
+
+
+def load_scores():
+    """Validated commune-level sport and economic scores."""
+    return _load_clean('scores')
+
+
+def load_department_scores():
+    """Validated département-level sport and economic scores."""
+    return _load_clean('scores_departement')
+
+
+def load_correlations():
+    """Validated per-département sport/economy correlation (score_correlation.xlsx)."""
+    return _load_clean('correlations')
+
+
+def load_department_correlations():
+    """Validated per-département correlation of ``corr_dpt.csv``."""
+    return _load_clean('correlations_dpt')
+
+
+def load_clubs():
+    """Validated club table (one row per club and season)."""
+    return _load_clean('clubs')
+
+
+def load_main_table():
+    """Validated club x season table (Calcul_score notebook cleaning, done at ingest)."""
+    return _load_clean('main_table')
+
+
+def load_sector():
+    """Validated URSSAF sector dataset with its score_sectoriel."""
+    return _load_clean('sector')
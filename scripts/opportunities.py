@@ -0,0 +1,169 @@
+"""Ranked opportunity table: every (département or zone) x NA88 sector pair.
+
+"Ma recherche" checks one pair at a time: département correlation >= 0.7
+and 5-year growth of the sector score >= 2 %. Here the same criteria are
+evaluated for all pairs at once. Yearly mean scores of every pair come
+from one ``bincount`` over an integer ``(pair, year)`` key, the 5-year
+window of each pair is located with a reversed cumulative count, and a
+composite score (correlation, growth, clubs) ranks the pairs within each
+région. The table is persisted as Parquet, keyed by its catalog version,
+and filtered with pushdown when displayed.
+
+    python scripts/opportunities.py
+"""
+# Standard library imports
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+import catalog
+import export
+import loaders
+import resampling
+import stats
+
+# Constants
+OPPORTUNITIES_PATH = os.path.join(loaders.DATA_PATH, "store", "opportunites")
+UNITS = ['departement', 'zone']
+GROWTH_YEARS = 5
+CORRELATION_THRESHOLD = 0.7
+GROWTH_THRESHOLD = 2.0
+TOP_K = 10
+
+# Pondérations du score d'opportunité (chaque composante ramenée entre 0 et 1)
+OPPORTUNITY_WEIGHTS = {'correlation': 0.4, 'croissance': 0.4, 'clubs': 0.2}
+
+
+def sector_growth(df_sector, unit, sector_column='secteur_na88', years=GROWTH_YEARS):
+    """Growth (%) of the mean score over the last ``years`` years of data of every unit x sector pair."""
+    units = df_sector[unit].astype('category')
+    sectors = df_sector[sector_column].astype('category')
+    year = df_sector['année'].to_numpy(dtype='int64')
+    u = units.cat.codes.to_numpy().astype('int64')
+    s = sectors.cat.codes.to_numpy().astype('int64')
+    score = df_sector['score_sectoriel'].to_numpy(dtype='float64')
+    valid = (u >= 0) & (s >= 0) & ~np.isnan(score)
+    first_year = year[valid].min()
+    n_sectors, n_years = len(sectors.cat.categories), year[valid].max() - first_year + 1
+    n_pairs = len(units.cat.categories) * n_sectors
+
+    key = (u * n_sectors + s)[valid] * n_years + (year[valid] - first_year)
+    counts = np.bincount(key, minlength=n_pairs * n_years).reshape(n_pairs, n_years)
+    means = np.bincount(key, score[valid], n_pairs * n_years).reshape(n_pairs, n_years)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means /= counts
+
+    # Fenêtre des 5 dernières années présentes : compte cumulé depuis la fin
+    present = counts > 0
+    from_end = np.cumsum(present[:, ::-1], axis=1)[:, ::-1] * present
+    has_window = present.sum(axis=1) >= years
+    start = np.argmax(from_end == years, axis=1)
+    end = n_years - 1 - np.argmax(present[:, ::-1], axis=1)
+    rows = np.arange(n_pairs)
+    score_start, score_end = means[rows, start], means[rows, end]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = np.where(has_window & (score_start > 0), (score_end - score_start) / score_start * 100, np.nan)
+
+    pairs = pd.DataFrame({
+        unit: np.repeat(units.cat.categories.to_numpy(), n_sectors),
+        sector_column: np.tile(sectors.cat.categories.to_numpy(), len(units.cat.categories)),
+        'croissance_5_ans': growth,
+        'score_sectoriel': score_end,
+    })
+    return pairs[present.any(axis=1)]
+
+
+def _unit_attributes(df_sector, unit):
+    """Région and département of every unit (first row of the sector table)."""
+    columns = ['region'] + (['departement'] if unit != 'departement' else [])
+    return df_sector.drop_duplicates(unit)[[unit] + columns].astype(str).set_index(unit)
+
+
+def _rescale(values):
+    values = np.asarray(values, dtype='float64')
+    low, high = np.nanmin(values), np.nanmax(values)
+    return np.zeros_like(values) if high == low else (values - low) / (high - low)
+
+
+def build_opportunities(df_sector, df_correlations, df_clubs, df_intervals=None, units=UNITS):
+    """Ranked table of every unit x sector pair with its criteria and composite score."""
+    correlation = df_correlations.assign(departement=df_correlations['departement'].astype(str)) \
+        .groupby('departement')['correlation_departement'].mean()
+    clubs = df_clubs.assign(departement=df_clubs['departement'].astype(str)) \
+        .groupby('departement')['club'].nunique()
+    # p-valeur de cette même corrélation (saisons du département rééchantillonnées), affichée à côté
+    p_value = None if df_intervals is None else \
+        df_intervals.assign(departement=df_intervals['departement'].astype(str)).set_index('departement')['p_value']
+
+    tables = []
+    for unit in units:
+        df = sector_growth(df_sector, unit)
+        df[unit] = df[unit].astype(str)
+        df = df.join(_unit_attributes(df_sector, unit), on=unit)
+        departement = df[unit] if unit == 'departement' else df['departement']
+        df['correlation'] = departement.map(correlation).to_numpy()
+        df['nb_clubs'] = departement.map(clubs).fillna(0).astype(int).to_numpy()
+        if p_value is not None:
+            df['p_value'] = departement.map(p_value).to_numpy()
+        df = df.rename(columns={unit: 'territoire'})
+        df.insert(0, 'niveau', unit)
+        if unit == 'departement':
+            df['departement'] = df['territoire']
+        tables.append(df)
+    df = pd.concat(tables, ignore_index=True)
+
+    # Score composite : corrélation, croissance (rang centile, robuste aux extrêmes) et clubs
+    growth_rank = df.groupby('niveau')['croissance_5_ans'].rank(pct=True)
+    components = {
+        'correlation': df['correlation'].clip(lower=0).fillna(0).to_numpy(),
+        'croissance': growth_rank.fillna(0).to_numpy(),
+        'clubs': _rescale(np.log1p(df['nb_clubs'])),
+    }
+    df['score_opportunite'] = sum(weight * components[name] for name, weight in OPPORTUNITY_WEIGHTS.items())
+    # Même règle que « Ma recherche »
+    df['recommande'] = (df['correlation'] >= CORRELATION_THRESHOLD) & (df['croissance_5_ans'] >= GROWTH_THRESHOLD)
+
+    # Rang dans chaque région et niveau : le top-k d'une région est un simple filtre
+    group = pd.factorize(df['niveau'] + '|' + df['region'])[0]
+    df['rang_region'] = stats.rank_within(group, df['score_opportunite'].to_numpy())
+    return df.sort_values(['niveau', 'region', 'rang_region']).reset_index(drop=True)
+
+
+def open_opportunities():
+    """Arrow dataset of the ranked table for the current sources, built on first use."""
+    path = os.path.join(OPPORTUNITIES_PATH, f"{catalog.version('opportunites')}.parquet")
+    if not os.path.exists(path):
+        os.makedirs(OPPORTUNITIES_PATH, exist_ok=True)
+        df_scores = loaders.load_scores()
+        df_intervals = resampling.score_correlation_intervals(df_scores, 'departement', processes=1)
+        df = build_opportunities(loaders.load_sector(), loaders.load_correlations(), loaders.load_clubs(),
+                                 df_intervals)
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        catalog.record('opportunites', path)
+    return ds.dataset(path, format='parquet')
+
+
+def top_opportunities(niveau='departement', region=None, k=TOP_K, recommended_only=False, sector=None):
+    """Best ``k`` pairs of each région (or of one région), read with the filters pushed down."""
+    expression = export.build_filter({'niveau': niveau, 'region': region, 'secteur_na88': sector})
+    if sector is None and not recommended_only:
+        expression &= ds.field('rang_region') <= k
+    elif recommended_only:
+        expression &= ds.field('recommande')
+    df = open_opportunities().to_table(filter=expression).to_pandas()
+    # Avec un filtre supplémentaire, le top-k est repris sur les couples restants
+    df = df.sort_values('score_opportunite', ascending=False).groupby('region', sort=False).head(k)
+    return df.reset_index(drop=True)
+
+
+def main():
+    df = open_opportunities().to_table().to_pandas()
+    print(f"{len(df)} couples territoire x secteur, dont {int(df['recommande'].sum())} recommandés")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""Standalone HTML report of every région and département.
+
+Each report gathers what the dashboard shows for one territory: score
+evolution with the forecast, sport/economy correlation with its interval,
+breakdown of the clubs by sport, sector growth table and a map of the
+départements concerned. Figures come from :mod:`dashboard.figures`, the
+builders of the app.
+
+The tables are loaded once and handed to a process pool; each worker
+renders its reports independently. Reports reference a single copy of
+``plotly.min.js`` next to them, so they open offline and stay small.
+A report carries the catalog version of its inputs and is rebuilt only
+when that version changed (``--force`` rebuilds everything).
+
+    python scripts/reports.py
+    python scripts/reports.py --levels departement --processes 4
+"""
+# Standard library imports
+import argparse
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party imports
+import pandas as pd
+
+import catalog
+import forecast
+import loaders
+import opportunities
+import resampling
+import rollup
+
+# Constants
+REPORTS_PATH = os.path.join(loaders.DATA_PATH, "rapports")
+PLOTLY_JS = "plotly.min.js"
+LEVELS = ['region', 'departement']
+LEVEL_LABELS = {'region': "Région", 'departement': "Département"}
+EVOLUTION_TITLES = {'region': "Evolution des scores pour la région {}",
+                    'departement': "Evolution des scores pour le département {}"}
+N_SECTORS = 10
+
+_WORKER = {}
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<meta name="sporteco-version" content="{version}">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: auto; padding: 20px; color: #2c3e50; }}
+h1 {{ color: #0aa2bf; }}
+.carte {{ display: inline-block; padding: 15px 30px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }}
+.colonnes {{ display: flex; gap: 20px; }}
+.colonnes > div {{ flex: 1; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ padding: 4px 8px; border-bottom: 1px solid #ddd; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+footer {{ margin-top: 40px; font-size: 0.8em; color: #6c757d; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+<footer>Généré le {date} · données {version}</footer>
+</body>
+</html>
+"""
+
+
+def report_path(level, code):
+    return os.path.join(REPORTS_PATH, level, f"{code}.html")
+
+
+def report_version(path):
+    """Catalog version written in an existing report (None when absent)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            head = f.read(1024)
+    except FileNotFoundError:
+        return None
+    marker = '<meta name="sporteco-version" content="'
+    start = head.find(marker)
+    return head[start + len(marker):head.find('"', start + len(marker))] if start >= 0 else None
+
+
+def load_inputs():
+    """Every table the reports need, loaded once for all of them."""
+    df_scores = loaders.load_scores()
+    inputs = {
+        'version': catalog.version('rapports'),
+        'registry': loaders.load_registry(),
+        'correlations': loaders.load_correlations(),
+        'clubs': loaders.load_clubs(),
+        'averages': {}, 'intervals': {}, 'growth': {},
+    }
+    with open(loaders.DEPARTEMENTS_GEOJSON, 'r') as f:
+        inputs['geojson'] = json.load(f)
+    df_sector = loaders.load_sector()
+    averages = rollup.score_rollup(df_scores)
+    for level in LEVELS:
+        inputs['averages'][level] = averages[level]
+        path = resampling.result_path(level)
+        inputs['intervals'][level] = pd.read_csv(path) if os.path.exists(path) else \
+            resampling.score_correlation_intervals(df_scores, level)
+        inputs['growth'][level] = opportunities.sector_growth(df_sector, level)
+        # Prévisions calculées ici une fois, lues ensuite par les workers
+        forecast.load_forecasts(level, df_scores)
+    return inputs
+
+
+def _init_worker(inputs):
+    _WORKER.update(inputs)
+
+
+def _correlation_section(level, name):
+    """Stored correlation (as on the map and in the app) with its bootstrap interval and p-value."""
+    df_corr = _WORKER['correlations']
+    values = df_corr.loc[df_corr[level].astype(str) == name, f'correlation_{level}']
+    correlation = values.iloc[0] if len(values) else None
+    if correlation is None or pd.isna(correlation):
+        return "<p>Corrélation non disponible.</p>"
+    intervals = _WORKER['intervals'][level]
+    interval = intervals[intervals[level].astype(str) == name]
+    detail = ""
+    if len(interval):
+        row = interval.iloc[0]
+        detail = (f"IC 95 % [{row['ic_bas']:.2f} ; {row['ic_haut']:.2f}] · p = {row['p_value']:.3f} · "
+                  f"{row['n_saisons']} saisons")
+    return f'<div class="carte"><h2>{correlation:.3f}</h2><p>{detail}</p></div>'
+
+
+def _sector_table(level, name):
+    growth = _WORKER['growth'][level]
+    rows = growth[(growth[level].astype(str) == name) & growth['croissance_5_ans'].notna()]
+    if rows.empty:
+        return "<p>Pas assez d'années de données sectorielles.</p>"
+    rows = rows.nlargest(N_SECTORS, 'croissance_5_ans')
+    table = pd.DataFrame({
+        "Secteur": rows['secteur_na88'].astype(str),
+        "Croissance sur 5 ans (%)": rows['croissance_5_ans'].round(1),
+        "Score sectoriel": rows['score_sectoriel'].round(3),
+    })
+    return table.to_html(index=False, border=0)
+
+
+def _map_codes(level, name):
+    """Codes of the départements drawn on the map and of those highlighted."""
+    registry = _WORKER['registry']
+    dep_codes = registry.codes('departement')
+    dep_regions = registry.parents('departement', range(len(dep_codes)))
+    if level == 'region':
+        region_id = registry.resolve([name], 'region')[0]
+        codes = dep_codes[dep_regions == region_id]
+        return codes, codes
+    dep_id = registry.resolve([name], 'departement')[0]
+    return dep_codes[dep_regions == dep_regions[dep_id]], [dep_codes[dep_id]]
+
+
+def render_report(level, name):
+    """Body of the report of one territory."""
+    from dashboard import figures
+
+    def embed(fig):
+        return fig.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})
+
+    averages = _WORKER['averages'][level]
+    history = averages[averages[level].astype(str) == name].sort_values('annee')
+    sections = [
+        "<h2>Évolution des scores</h2>",
+        embed(figures.score_evolution_figure(history, level, name, EVOLUTION_TITLES[level].format(name))),
+        "<h2>Corrélation Sport-Économie</h2>",
+        _correlation_section(level, name),
+    ]
+
+    clubs = _WORKER['clubs']
+    clubs = clubs[clubs[level].astype(str) == name]
+    sport_counts = clubs.drop_duplicates('club')['sport'].astype(str).str.capitalize().value_counts()
+    club_html = embed(figures.club_pie_figure(sport_counts, f"Clubs par sport ({int(sport_counts.sum())})")) \
+        if len(sport_counts) else "<p>Aucun club n'a été trouvé.</p>"
+
+    codes, highlight = _map_codes(level, name)
+    df_corr = _WORKER['correlations']
+    corr_by_code = pd.Series(df_corr['correlation_departement'].to_numpy(),
+                             index=_WORKER['registry'].code_of(df_corr['departement'], 'departement'))
+    corr_by_code = corr_by_code[corr_by_code.index.notna()]
+    map_codes = [code for code in codes if code in corr_by_code.index]
+    map_html = embed(figures.department_map_figure(_WORKER['geojson'], map_codes, corr_by_code[map_codes],
+                                                   highlight)) \
+        if map_codes else "<p>Carte non disponible.</p>"
+
+    sections += [
+        '<div class="colonnes">',
+        f"<div><h2>Clubs</h2>{club_html}</div>",
+        f"<div><h2>Carte des corrélations</h2>{map_html}</div>",
+        "</div>",
+        "<h2>Secteurs en croissance</h2>",
+        _sector_table(level, name),
+    ]
+    return "\n".join(sections)
+
+
+def _write_report(task):
+    level, code, name = task
+    path = report_path(level, code)
+    title = f"{LEVEL_LABELS[level]} · {name}"
+    page = _TEMPLATE.format(title=html.escape(title), body=render_report(level, name),
+                            version=_WORKER['version'], plotly_js=f"../{PLOTLY_JS}",
+                            date=time.strftime('%d/%m/%Y'))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_plotly_js():
+    """Single copy of plotly.js shared by every report."""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(REPORTS_PATH, PLOTLY_JS)
+    version_path = path + ".version"
+    if os.path.exists(path) and os.path.exists(version_path):
+        with open(version_path) as f:
+            if f.read() == plotly.__version__:
+                return path
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    os.replace(path + ".tmp", path)
+    with open(version_path, 'w') as f:
+        f.write(plotly.__version__)
+    return path
+
+
+def write_index(tasks):
+    links = {level: [] for level in LEVELS}
+    for level, code, name in sorted(tasks, key=lambda task: task[2]):
+        links[level].append(f'<li><a href="{level}/{code}.html">{html.escape(name)}</a></li>')
+    body = "\n".join(f"<h2>{LEVEL_LABELS[level]}s</h2>\n<ul>\n" + "\n".join(items) + "\n</ul>"
+                     for level, items in links.items() if items)
+    path = os.path.join(REPORTS_PATH, "index.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(_TEMPLATE.format(title="Rapports territoriaux", body=body, version=catalog.version('rapports'),
+                                 plotly_js=PLOTLY_JS, date=time.strftime('%d/%m/%Y')))
+    return path
+
+
+def build_reports(levels=LEVELS, processes=None, force=False):
+    """Render the reports whose data changed; returns ``(written, up to date)`` counts."""
+    inputs = load_inputs()
+    registry = inputs['registry']
+    tasks = []
+    for level in levels:
+        present = set(inputs['averages'][level][level].astype(str))
+        for code, name in zip(registry.codes(level), registry.names(level)):
+            if name in present:
+                tasks.append((level, code, name))
+
+    for level in levels:
+        os.makedirs(os.path.join(REPORTS_PATH, level), exist_ok=True)
+    write_plotly_js()
+    write_index(tasks)
+    todo = [task for task in tasks if force or report_version(report_path(task[0], task[1])) != inputs['version']]
+    if processes == 1:
+        _init_worker(inputs)
+        written = [_write_report(task) for task in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(inputs,)) as pool:
+            written = list(pool.map(_write_report, todo, chunksize=4))
+    return len(written), len(tasks) - len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapports HTML autonomes par région et par département")
+    parser.add_argument('--levels', nargs='+', choices=LEVELS, default=LEVELS)
+    parser.add_argument('--processes', type=int, default=None, help="Nombre de processus (tous les cœurs par défaut)")
+    parser.add_argument('--force', action='store_true', help="Reconstruire aussi les rapports à jour")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written, up_to_date = build_reports(args.levels, args.processes, args.force)
+    print(f"{written} rapport(s) écrit(s), {up_to_date} à jour, en {time.perf_counter() - start:.1f} s "
+          f"→ {os.path.join(REPORTS_PATH, 'index.html')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Bootstrap intervals and permutation tests for per-entity correlations.
+
+Each entity (région, département or commune) only has a dozen seasons, so
+its sport/economy correlation is noisy. Seasons are resampled for every
+entity at once: rows are sorted by entity and a ``(n_rows, n_resamples)``
+index array draws, for each row, a random row of the same entity segment
+(bootstrap) or a random within-segment permutation (permutation test).
+Correlations of all resamples then come from one
+:func:`stats.segment_pearson` pass. Resamples are processed in chunks over
+a process pool, each chunk with its own independent random stream.
+
+The series resampled are those of the stored correlations
+(``score_correlation.xlsx``), so each interval and p-value belongs to the
+correlation shown next to it:
+
+* communes: the rows of the ``commune`` sheet of ``scores.xlsx``, per INSEE code;
+* départements: the rows of its ``departement`` sheet;
+* régions: the yearly mean of their départements in that sheet.
+
+    python scripts/resampling.py --level ville --resamples 2000
+"""
+# Standard library imports
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import loaders
+import rollup
+import stats
+
+# Constants
+RESAMPLING_PATH = os.path.join(loaders.DATA_PATH, "resampling")
+N_RESAMPLES = 2000
+CHUNK_SIZE = 100
+CONFIDENCE = 0.95
+
+_WORKER = {}
+
+
+def bootstrap_indices(starts, counts, n_resamples, rng):
+    """``(n_rows, n_resamples)`` row indices drawn with replacement inside each entity segment."""
+    offsets = np.repeat(starts, counts)
+    sizes = np.repeat(counts, counts)
+    return (offsets + (rng.random((n_resamples, len(offsets))) * sizes).astype('int64')).T
+
+
+def permutation_indices(segment_ids, n_resamples, rng):
+    """``(n_rows, n_resamples)`` row indices shuffled inside each entity segment (sorted ids)."""
+    # Une clé aléatoire dans [0, 1) ajoutée à l'identifiant garde chaque ligne dans son segment
+    keys = segment_ids + rng.random((n_resamples, len(segment_ids)))
+    return np.argsort(keys, axis=1).T
+
+
+def _init_worker(state):
+    _WORKER.update(state)
+
+
+def _resample_chunk(task):
+    """Bootstrap correlations and permutation exceedance counts for one chunk."""
+    n_resamples, seed = task
+    rng = np.random.default_rng(seed)
+    x, y, starts, counts = _WORKER['x'], _WORKER['y'], _WORKER['starts'], _WORKER['counts']
+
+    idx = bootstrap_indices(starts, counts, n_resamples, rng)
+    boot = stats.segment_pearson(starts, x[idx], y[idx])
+
+    idx = permutation_indices(_WORKER['segment_ids'], n_resamples, rng)
+    perm = stats.segment_pearson(starts, np.broadcast_to(x[:, None], idx.shape), y[idx])
+    # Test bilatéral : permutations au moins aussi extrêmes que la corrélation observée
+    exceed = (np.abs(perm) >= np.abs(_WORKER['observed'])[:, None] - 1e-12).sum(axis=1)
+    return boot.astype('float32'), exceed
+
+
+def correlation_intervals(entities, x, y, n_resamples=N_RESAMPLES, confidence=CONFIDENCE,
+                          processes=None, seed=0, min_periods=3):
+    """Observed correlation, bootstrap interval and permutation p-value of every entity.
+
+    ``entities``, ``x`` and ``y`` are aligned 1-D arrays (one row per entity
+    and season). Returns one row per entity with ``correlation``, ``ic_bas``,
+    ``ic_haut``, ``p_value`` and ``n_saisons``.
+    """
+    frame = pd.DataFrame({'entity': np.asarray(entities), 'x': x, 'y': y}).dropna()
+    frame = frame.sort_values('entity', kind='stable')
+    segment_ids, names = pd.factorize(frame['entity'])
+    starts = stats.group_starts(segment_ids)
+    counts = np.diff(np.r_[starts, len(segment_ids)])
+    x = frame['x'].to_numpy(dtype='float64')
+    y = frame['y'].to_numpy(dtype='float64')
+    observed = stats.segment_pearson(starts, x[:, None], y[:, None], min_periods)[:, 0]
+
+    state = {'x': x, 'y': y, 'starts': starts, 'counts': counts,
+             'segment_ids': segment_ids.astype('float64'), 'observed': observed}
+    sizes = [min(CHUNK_SIZE, n_resamples - i) for i in range(0, n_resamples, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = list(zip(sizes, seeds))
+    if processes == 1:
+        _init_worker(state)
+        results = [_resample_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(state,)) as pool:
+            results = list(pool.map(_resample_chunk, tasks))
+
+    boot = np.hstack([r[0] for r in results])
+    exceed = np.sum([r[1] for r in results], axis=0)
+    alpha = (1 - confidence) / 2
+    quantiles = [alpha, 1 - alpha]
+    low, high = np.quantile(boot, quantiles, axis=1)
+    # Rééchantillons dégénérés (valeurs constantes) : quantiles sans les NaN, pour ces seules lignes
+    degenerate = np.isnan(low) | np.isnan(high)
+    if degenerate.any():
+        with np.errstate(all='ignore'):
+            low[degenerate], high[degenerate] = np.nanquantile(boot[degenerate], quantiles, axis=1)
+    p_value = (exceed + 1) / (n_resamples + 1)
+    p_value[np.isnan(observed)] = np.nan
+    return pd.DataFrame({
+        'entite': names,
+        'correlation': observed,
+        'ic_bas': low,
+        'ic_haut': high,
+        'p_value': p_value,
+        'n_saisons': counts,
+    })
+
+
+def correlation_series(df_scores, level, df_departements=None):
+    """Season series behind the stored correlation of every entity of ``level``: ``(keys, frame)``."""
+    if level == 'ville':
+        return df_scores['code_commune'].astype(str), df_scores
+    df_departements = loaders.load_department_scores() if df_departements is None else df_departements
+    if level == 'departement':
+        return df_departements['departement'].astype(str), df_departements
+    df = rollup.rollup(df_departements, rollup.SCORES, ('departement', 'region'))['region']
+    return df['region'].astype(str), df
+
+
+def score_correlation_intervals(df_scores, level, df_departements=None, **kwargs):
+    """Intervals and p-values of the stored sport/economy correlation of every entity of ``level``.
+
+    ``correlation`` is recomputed from the same series; it matches the
+    workbook value up to the rounding of the sheets (about 0.002).
+    """
+    keys, df = correlation_series(df_scores, level, df_departements)
+    result = correlation_intervals(keys, df['score_sportif'], df['score_economique'], **kwargs)
+    if level != 'ville':
+        return result.rename(columns={'entite': level})
+    # Communes rééchantillonnées par code INSEE, affichées sous leur nom
+    first = df_scores.drop_duplicates('code_commune')
+    names = pd.Series(first['ville'].astype(str).to_numpy(), index=first['code_commune'].astype(str).to_numpy())
+    result = result.rename(columns={'entite': 'code_commune'})
+    result.insert(0, 'ville', result['code_commune'].map(names).to_numpy())
+    return result
+
+
+def result_path(level, version=None):
+    return os.path.join(RESAMPLING_PATH, f"correlations_{level}-{version or catalog.version('intervalles')}.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intervalles de confiance des corrélations sport-économie")
+    parser.add_argument('--level', choices=['region', 'departement', 'ville'], default='ville')
+    parser.add_argument('--resamples', type=int, default=N_RESAMPLES)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = score_correlation_intervals(loaders.load_scores(), args.level, n_resamples=args.resamples,
+                                         processes=args.processes, seed=args.seed)
+    os.makedirs(RESAMPLING_PATH, exist_ok=True)
+    result.to_csv(result_path(args.level), index=False)
+    catalog.record('intervalles', result_path(args.level))
+    print(f"{len(result)} corrélations écrites dans {result_path(args.level)}")
+
+
+if __name__ == '__main__':
+    main()
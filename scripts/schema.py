@@ -0,0 +1,281 @@
+"""Ingest-time validation and canonicalisation of the datasets.
+
+Each dataset has a declarative schema: the type of each column, whether it
+may be missing and its plausible range. ``ingest`` reads the raw source
+once, coerces every column to its declared type (decimal commas, narrow
+no-break spaces, season labels such as ``'2 012'``), resolves régions and
+départements against the geographic registry and checks:
+
+* values that could not be coerced (they would otherwise silently become NaN);
+* missing values in required columns (those rows are dropped);
+* values outside the declared range;
+* places unknown to the registry and départements whose région disagrees
+  with the row's région.
+
+The typed table is written as Parquet with its quality report next to it,
+both keyed by the catalog version of the clean table.
+Runtime loaders (``loaders.load_*``) read that artefact and trust its types.
+
+    python scripts/schema.py
+"""
+# Standard library imports
+import argparse
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import loaders
+
+# Constants
+CLEAN_PATH = os.path.join(loaders.DATA_PATH, "store", "clean")
+N_EXAMPLES = 5
+
+# Types : float, annee (libellé de saison), category, text, geo (région ou département du registre)
+SCHEMAS = {
+    'scores': {
+        'region': {'type': 'geo'},
+        'departement': {'type': 'geo'},
+        'ville': {'type': 'text', 'nullable': False},
+        'annee': {'type': 'annee', 'nullable': False, 'range': (1990, 2100)},
+        'score_sportif': {'type': 'float', 'range': (0, None)},
+        'score_economique': {'type': 'float', 'range': (0, None)},
+    },
+    'scores_departement': {
+        'region': {'type': 'geo'},
+        'departement': {'type': 'geo', 'nullable': False},
+        'annee': {'type': 'annee', 'nullable': False, 'range': (1990, 2100)},
+        'score_sportif': {'type': 'float', 'range': (0, None)},
+        'score_economique': {'type': 'float', 'range': (0, None)},
+    },
+    'correlations': {
+        'departement': {'type': 'geo', 'nullable': False},
+        'correlation_departement': {'type': 'float', 'range': (-1, 1)},
+    },
+    'correlations_dpt': {
+        'departement': {'type': 'geo', 'nullable': False},
+        'correlation_departement': {'type': 'float', 'range': (-1, 1)},
+    },
+    'clubs': {
+        'region': {'type': 'geo'},
+        'departement': {'type': 'geo'},
+        'club': {'type': 'text', 'nullable': False},
+        'sport': {'type': 'category', 'nullable': False},
+        'ville': {'type': 'text'},
+        'code_commune': {'type': 'text', 'required': False},
+        'longitude': {'type': 'float', 'range': (-180, 180), 'required': False},
+        'latitude': {'type': 'float', 'range': (-90, 90), 'required': False},
+        # Entrées du score sportif (sport_scores.py)
+        'fin_saison': {'type': 'annee', 'range': (1990, 2100), 'required': False},
+        'division': {'type': 'float', 'range': (1, None), 'required': False},
+        'classement': {'type': 'float', 'range': (1, None), 'required': False},
+        'score_event': {'type': 'float', 'range': (0, None), 'required': False},
+        'nb_licences': {'type': 'float', 'range': (0, None), 'required': False},
+    },
+    'main_table': {
+        'region': {'type': 'geo'},
+        'departement': {'type': 'geo'},
+        'fin_saison': {'type': 'annee', 'nullable': False, 'range': (1990, 2100)},
+        'taux_remplissage': {'type': 'float', 'range': (0, None)},
+        'score_event': {'type': 'float', 'range': (0, None)},
+        'taux_chomage': {'type': 'float', 'range': (0, 100)},
+        # Séparateur de milliers ',' dans la source (Calcul_score)
+        'nb_crea_entreprise': {'type': 'float', 'range': (0, None), 'thousands': ','},
+        'salaire_median': {'type': 'float', 'range': (0, None)},
+    },
+    'sector': {
+        'region': {'type': 'geo'},
+        'departement': {'type': 'geo'},
+        'zone': {'type': 'category'},
+        'secteur_na88': {'type': 'category', 'nullable': False},
+        'année': {'type': 'annee', 'nullable': False, 'range': (1990, 2100), 'dtype': 'int32'},
+        'nb_effectif': {'type': 'float', 'range': (0, None), 'dtype': 'float32'},
+        'nb_entreprise': {'type': 'float', 'range': (0, None), 'dtype': 'float32'},
+        'score_sectoriel': {'type': 'float', 'range': (0, 1)},
+    },
+}
+
+READERS = {
+    'scores': loaders.read_scores,
+    'scores_departement': loaders.read_department_scores,
+    'correlations': loaders.read_correlations,
+    'correlations_dpt': loaders.read_department_correlations,
+    'clubs': loaders.read_clubs,
+    'main_table': loaders.read_main_table,
+    'sector': loaders.read_sector,
+}
+
+def dataset_version(name):
+    """Catalog version of the clean table of ``name`` (sources, registry and this module)."""
+    return catalog.version(f"clean/{name}")
+
+
+def clean_path(name, version=None):
+    return os.path.join(CLEAN_PATH, f"{name}-{version or dataset_version(name)}.parquet")
+
+
+def report_path(name, version=None):
+    return os.path.join(CLEAN_PATH, f"{name}-{version or dataset_version(name)}.qualite.csv")
+
+
+def parse_float(values, thousands=None):
+    """Numbers written with decimal commas, spaces or narrow no-break spaces as floats."""
+    if values.dtype.kind in 'biuf':
+        return values.astype('float64')
+    text = values.astype(str).str.replace('[\\s\xa0\u202f]', '', regex=True)
+    text = text.str.replace(',', '') if thousands == ',' else text.str.replace(',', '.')
+    return pd.to_numeric(text, errors='coerce')
+
+
+def parse_season(values):
+    """Season labels such as '2 012' or '2012.0' as years (NaN when no year can be read)."""
+    if values.dtype.kind in 'iu':
+        return values.astype('float64')
+    text = values.astype(str).str.replace(r'\.0$', '', regex=True).str.replace(r'\D', '', regex=True)
+    return pd.to_numeric(text.where(text != ''), errors='coerce')
+
+
+def _examples(values):
+    return ', '.join(map(str, pd.unique(values.astype(str))[:N_EXAMPLES]))
+
+
+def _issue(name, column, check, mask, values):
+    return {'jeu': name, 'colonne': column, 'controle': check,
+            'n_lignes': int(mask.sum()), 'exemples': _examples(values[mask])}
+
+
+def _coerce(name, column, spec, values, registry, issues):
+    """Column converted to its declared type; failed conversions are reported."""
+    kind = spec['type']
+    present = values.notna()
+    if not pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+        present &= values.astype(str).str.strip() != ''
+    if kind == 'geo':
+        clean = registry.categorize(values.where(present), column)
+        n_known = len(registry.names(column))
+        unknown = present.to_numpy() & (np.asarray(clean.codes) >= n_known)
+        if unknown.any():
+            issues.append(_issue(name, column, 'reference', unknown, values))
+        return pd.Series(clean, index=values.index)
+    if kind == 'category':
+        return values.where(present).astype('category')
+    if kind == 'text':
+        return values.where(present).astype(str).str.strip().where(present)
+
+    clean = parse_season(values) if kind == 'annee' else parse_float(values, spec.get('thousands'))
+    failed = present & clean.isna()
+    if failed.any():
+        issues.append(_issue(name, column, 'type', failed, values))
+    return clean
+
+
+def validate(name, df, registry=None):
+    """Typed copy of ``df`` following the schema of ``name`` and its quality report."""
+    registry = registry or loaders.load_registry()
+    schema = SCHEMAS[name]
+    issues = []
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+
+    missing = [c for c, spec in schema.items() if spec.get('required', True) and c not in df.columns]
+    if missing:
+        raise ValueError(f"{name} : colonnes absentes de la source : {', '.join(missing)}")
+
+    if 'region' in schema and {'region', 'departement'} <= set(df.columns):
+        # Région inconnue (ancien découpage, faute...) : celle du département
+        df['region'] = registry.fill_regions(df['region'], df['departement'])
+    for column, spec in schema.items():
+        if column in df.columns:
+            df[column] = _coerce(name, column, spec, df[column], registry, issues)
+
+    # Lignes sans valeur dans une colonne obligatoire : écartées
+    dropped = pd.Series(False, index=df.index)
+    for column, spec in schema.items():
+        if column in df.columns and not spec.get('nullable', True):
+            empty = df[column].isna()
+            if empty.any():
+                issues.append(_issue(name, column, 'valeurs_manquantes', empty, df[column]))
+                dropped |= empty
+    df = df[~dropped]
+
+    for column, spec in schema.items():
+        if column not in df.columns or 'range' not in spec:
+            continue
+        low, high = spec['range']
+        values = df[column]
+        outside = pd.Series(False, index=values.index)
+        if low is not None:
+            outside |= values < low
+        if high is not None:
+            outside |= values > high
+        if outside.any():
+            issues.append(_issue(name, column, 'plage', outside, values))
+
+    # Cohérence département / région
+    if schema.get('region', {}).get('type') == 'geo' and schema.get('departement', {}).get('type') == 'geo' \
+            and {'region', 'departement'} <= set(df.columns):
+        dep_ids = df['departement'].cat.codes.to_numpy()
+        region_ids = df['region'].cat.codes.to_numpy()
+        known = (dep_ids >= 0) & (dep_ids < len(registry.names('departement'))) \
+            & (region_ids >= 0) & (region_ids < len(registry.names('region')))
+        expected = registry.parents('departement', np.where(known, dep_ids, -1))
+        inconsistent = known & (expected >= 0) & (expected != region_ids)
+        if inconsistent.any():
+            issues.append(_issue(name, 'departement', 'coherence', inconsistent,
+                                 df['departement'].astype(str) + ' / ' + df['region'].astype(str)))
+
+    for column, spec in schema.items():
+        if column in df.columns and spec['type'] in ('float', 'annee'):
+            dtype = spec.get('dtype', 'int64' if spec['type'] == 'annee' else 'float64')
+            if dtype.startswith('int') and df[column].isna().any():
+                dtype = 'float64'
+            df[column] = df[column].astype(dtype)
+
+    report = pd.DataFrame(issues, columns=['jeu', 'colonne', 'controle', 'n_lignes', 'exemples'])
+    report.loc[len(report)] = [name, '', 'lignes_valides', len(df), '']
+    return df.reset_index(drop=True), report
+
+
+def ingest(name, force=False):
+    """Validate the source of ``name`` and write its typed Parquet and quality report; returns the report."""
+    version = dataset_version(name)
+    path = clean_path(name, version)
+    if os.path.exists(path) and not force:
+        return pd.read_csv(report_path(name, version), keep_default_na=False)
+    os.makedirs(CLEAN_PATH, exist_ok=True)
+    df, report = validate(name, READERS[name]())
+    df.to_parquet(path + ".tmp", index=False)
+    report.to_csv(report_path(name, version), index=False)
+    os.replace(path + ".tmp", path)
+    catalog.record(f"clean/{name}", path)
+    catalog.record(f"clean/{name}", report_path(name, version))
+    return report
+
+
+def load_clean(name):
+    """Typed, validated table of ``name`` (ingested on first use for the current sources)."""
+    path = clean_path(name)
+    if not os.path.exists(path):
+        ingest(name)
+    return pd.read_parquet(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation et typage des jeux de données à l'ingestion")
+    parser.add_argument('--datasets', nargs='+', choices=list(SCHEMAS), default=list(SCHEMAS))
+    parser.add_argument('--force', action='store_true', help="Refaire l'ingestion même si les sources n'ont pas changé")
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        report = ingest(name, force=args.force)
+        n_rows = int(report.loc[report['controle'] == 'lignes_valides', 'n_lignes'].iloc[0])
+        problems = report[report['controle'] != 'lignes_valides']
+        print(f"{name} : {n_rows} lignes valides, {len(problems)} contrôle(s) en échec")
+        for row in problems.itertuples():
+            print(f"  - {row.colonne} [{row.controle}] {row.n_lignes} ligne(s) : {row.exemples}")
+
+
+if __name__ == '__main__':
+    main()
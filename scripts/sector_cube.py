@@ -0,0 +1,157 @@
+"""Location-quotient cube: ville x NA88 sector x year.
+
+The sector table is sorted once on a single integer key
+``(ville, sector, year)``; duplicate rows are summed with ``reduceat`` and
+every indicator is derived in that order with ``bincount`` totals and
+neighbour comparisons, without any pandas groupby:
+
+* shares of the ville's employees and companies (totals summed over the
+  cube, i.e. over the sectors of the ville and year);
+* location quotient ``(e_vs / E_v) / (E_s / E)`` for each year;
+* year-over-year growth of employees and companies (``pct_change`` within
+  ville and sector, as in ``urssaf.ipynb``);
+* shift-share decomposition of the employee change between consecutive
+  years into national, sector-mix and local components;
+* the enriched ``score_sectoriel`` of ``urssaf.ipynb`` (0.3 employee
+  share, 0.3 company share, 0.2 growth, 0.2 localisation index), min-max
+  normalised.
+
+Only non-empty cells are stored (coordinate format), as Parquet sorted by
+ville, sector and year, keyed by its catalog version.
+"""
+# Standard library imports
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+import catalog
+import export
+import loaders
+import stats
+
+# Constants
+SECTOR_CSV = loaders.SECTOR_CSV
+CUBE_PATH = os.path.join(loaders.DATA_PATH, "store", "cube_secteurs")
+
+# Pondérations du score sectoriel enrichi (urssaf.ipynb)
+ENRICHED_WEIGHTS = {'part_effectif': 0.3, 'part_entreprise': 0.3, 'croissance': 0.2, 'indice_localisation': 0.2}
+GEOGRAPHY = ['region', 'departement', 'zone']
+
+
+def _previous(values, same_group):
+    """Value of the previous row when it belongs to the same group, NaN otherwise."""
+    previous = np.r_[np.nan, values[:-1]]
+    return np.where(same_group, previous, np.nan)
+
+
+def build_cube(df_sector, sector_column='secteur_na88'):
+    """One row per non-empty ville x sector x year cell with every indicator."""
+    villes = df_sector['ville'].astype('category')
+    sectors = df_sector[sector_column].astype('category')
+    years = df_sector['année'].to_numpy(dtype='int64')
+    v = villes.cat.codes.to_numpy().astype('int64')
+    s = sectors.cat.codes.to_numpy().astype('int64')
+    valid = (v >= 0) & (s >= 0)
+    first_year = years[valid].min()
+    n_sectors, n_years = len(sectors.cat.categories), years[valid].max() - first_year + 1
+
+    # Tri unique sur une clé entière (ville, secteur, année)
+    key = (v * n_sectors + s) * n_years + (years - first_year)
+    rows = np.flatnonzero(valid)[np.argsort(key[valid], kind='stable')]
+    sorted_key = key[rows]
+    starts = stats.group_starts(sorted_key)
+    cell = sorted_key[starts]
+    cv, cs, cy = cell // (n_sectors * n_years), (cell // n_years) % n_sectors, cell % n_years
+    effectif = np.add.reduceat(np.nan_to_num(df_sector['nb_effectif'].to_numpy(dtype='float64')[rows]), starts)
+    entreprise = np.add.reduceat(np.nan_to_num(df_sector['nb_entreprise'].to_numpy(dtype='float64')[rows]), starts)
+
+    # Totaux par ville-année, secteur-année et année
+    ville_year = cv * n_years + cy
+    sector_year = cs * n_years + cy
+    total_ville = np.bincount(ville_year, effectif, (cv.max() + 1) * n_years)
+    total_ville_ent = np.bincount(ville_year, entreprise, (cv.max() + 1) * n_years)
+    total_sector = np.bincount(sector_year, effectif, n_sectors * n_years)
+    total_year = np.bincount(cy, effectif, n_years)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        part_effectif = effectif / total_ville[ville_year]
+        part_entreprise = entreprise / total_ville_ent[ville_year]
+        quotient = part_effectif / (total_sector[sector_year] / total_year[cy])
+
+        # Ligne précédente du même couple ville-secteur (pct_change du notebook)
+        same = np.r_[False, (cv[1:] == cv[:-1]) & (cs[1:] == cs[:-1])]
+        prev_effectif = _previous(effectif, same)
+        prev_entreprise = _previous(entreprise, same)
+        croissance_effectif = effectif / prev_effectif - 1
+        croissance_entreprise = entreprise / prev_entreprise - 1
+
+        # Shift-share entre deux années consécutives
+        consecutive = same & (np.r_[-1, cy[:-1]] == cy - 1)
+        base = np.where(consecutive, prev_effectif, np.nan)
+        prev_year = np.maximum(cy - 1, 0)
+        growth_national = total_year[cy] / total_year[prev_year] - 1
+        growth_sector = total_sector[sector_year] / total_sector[cs * n_years + prev_year] - 1
+        effet_national = base * growth_national
+        effet_sectoriel = base * (growth_sector - growth_national)
+        effet_local = (effectif - base) - effet_national - effet_sectoriel
+
+        # Indice de localisation du notebook : effectif / moyenne nationale du secteur
+        sector_mean = np.bincount(cs, effectif, n_sectors) / np.bincount(cs, minlength=n_sectors)
+        indice_localisation = effectif / sector_mean[cs]
+
+    growth = np.nan_to_num((croissance_effectif + croissance_entreprise) / 2, nan=0.0, posinf=0.0, neginf=0.0)
+    components = {'part_effectif': part_effectif, 'part_entreprise': part_entreprise,
+                  'croissance': growth, 'indice_localisation': indice_localisation}
+    raw = sum(weight * np.nan_to_num(components[name]) for name, weight in ENRICHED_WEIGHTS.items())
+    score = (raw - raw.min()) / (raw.max() - raw.min())
+
+    cube = pd.DataFrame({
+        'ville': pd.Categorical.from_codes(cv, villes.cat.categories),
+        sector_column: pd.Categorical.from_codes(cs, sectors.cat.categories),
+        'année': (cy + first_year).astype('int32'),
+        'nb_effectif': effectif,
+        'nb_entreprise': entreprise,
+        'part_effectif': part_effectif,
+        'part_entreprise': part_entreprise,
+        'quotient_localisation': quotient,
+        'croissance_effectif': croissance_effectif,
+        'croissance_entreprise': croissance_entreprise,
+        'effet_national': effet_national,
+        'effet_sectoriel': effet_sectoriel,
+        'effet_local': effet_local,
+        'indice_localisation': indice_localisation,
+        'score_sectoriel': score,
+    })
+    # Rattachement géographique de chaque ville (sa première ligne dans l'ordre trié)
+    ville_starts = stats.group_starts(v[rows])
+    position = np.zeros(len(villes.cat.categories), dtype='int64')
+    position[v[rows][ville_starts]] = np.arange(len(ville_starts))
+    for column in GEOGRAPHY:
+        if column in df_sector.columns:
+            values = df_sector[column].iloc[rows[ville_starts]]
+            cube.insert(cube.columns.get_loc('année'), column, values.iloc[position[cv]].to_numpy())
+    return cube
+
+
+def cube_path(version=None):
+    version = version or catalog.version('cube_secteurs')
+    return os.path.join(CUBE_PATH, f"{version}.parquet")
+
+
+def open_cube():
+    """Arrow dataset of the cube for the current sector CSV, built on first use."""
+    path = cube_path()
+    if not os.path.exists(path):
+        os.makedirs(CUBE_PATH, exist_ok=True)
+        build_cube(loaders.load_sector()).to_parquet(path + ".tmp", index=False, row_group_size=export.ROW_GROUP_SIZE)
+        os.replace(path + ".tmp", path)
+        catalog.record('cube_secteurs', path)
+    return ds.dataset(path, format='parquet')
+
+
+def query_cube(filters=None, columns=None):
+    """Cells matching ``{column: value or list}`` filters, read with the filter pushed down."""
+    return open_cube().to_table(columns=columns, filter=export.build_filter(filters)).to_pandas()
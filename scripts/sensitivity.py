@@ -0,0 +1,197 @@
+"""Monte Carlo sensitivity of rankings and correlations to the scoring weights.
+
+Weight vectors (plus the min-max / z-score normalisation choice) are drawn
+with a Saltelli design: two base matrices A and B and, for every factor,
+A with that column taken from B. Each chunk of scenarios is evaluated as
+matrix products over the stacked components of :class:`weights.WeightModel`
+(one column per scenario), with per-entity correlations from a single
+``reduceat`` pass and per-season rankings from column-wise argsorts. Chunks
+are spread over a process pool.
+
+The result gives, for every entity, the 5-50-95 % interval of its rank in
+the reference season and of its sport/economy correlation, and first-order
+and total Sobol indices of each factor on three aggregate outputs.
+
+    python scripts/sensitivity.py --level departement --samples 1024
+"""
+# Standard library imports
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import loaders
+import stats
+import weights
+
+# Constants
+SENSITIVITY_PATH = os.path.join(loaders.DATA_PATH, "sensitivity")
+FACTORS = list(weights.SPORT_WEIGHTS) + list(weights.ECO_WEIGHTS) + ['normalisation']
+OUTPUTS = ['correlation_moyenne', 'stabilite_rang_sportif', 'stabilite_rang_economique']
+SPREAD = 0.5
+CHUNK_SIZE = 64
+
+_WORKER = {}
+
+
+def scenario_weights(unit, zscore_scale, spread=SPREAD):
+    """Map unit-cube samples to effective weights (notebook weights ± ``spread``, normalisation)."""
+    default = np.array(list(weights.SPORT_WEIGHTS.values()) + list(weights.ECO_WEIGHTS.values()))
+    w = default * (1 - spread + 2 * spread * unit[:, :-1])
+    use_zscore = unit[:, -1] >= 0.5
+    # Une normalisation z-score revient à remettre chaque composante min-max à l'échelle
+    return w * np.where(use_zscore[:, None], zscore_scale, 1.0)
+
+
+def _spearman_to(ranks, reference):
+    """Spearman correlation of every rank column with a reference ranking."""
+    centered = ranks - ranks.mean(axis=0)
+    ref = reference - reference.mean()
+    return (centered * ref[:, None]).sum(axis=0) / np.sqrt((centered ** 2).sum(axis=0) * (ref ** 2).sum())
+
+
+def _init_worker(state):
+    _WORKER.update(state)
+
+
+def _evaluate(task):
+    """Evaluate one chunk of scenarios (columns) over every entity."""
+    unit, spread, keep_entities = task
+    w = scenario_weights(unit, _WORKER['zscore_scale'], spread)
+    n_sport = len(weights.SPORT_WEIGHTS)
+    sport = _WORKER['sport'] @ w[:, :n_sport].T
+    eco = _WORKER['eco'] @ w[:, n_sport:].T
+
+    correlation = stats.segment_pearson(_WORKER['starts'], sport, eco)
+    ref_rows = _WORKER['ref_rows']
+    rank_sport = stats.column_ranks(sport[ref_rows])
+    rank_eco = stats.column_ranks(eco[ref_rows])
+    outputs = np.column_stack([
+        np.nanmean(correlation, axis=0),
+        _spearman_to(rank_sport, _WORKER['baseline_rank_sport']),
+        _spearman_to(rank_eco, _WORKER['baseline_rank_eco']),
+    ])
+    if not keep_entities:
+        return outputs, None, None, None
+    rank_dtype = 'uint16' if len(ref_rows) < 2 ** 16 else 'int32'
+    return outputs, rank_sport.astype(rank_dtype), rank_eco.astype(rank_dtype), correlation.astype('float32')
+
+
+def _model_state(model, reference_year):
+    """Arrays shipped once to every worker: valid rows, segments, reference rankings."""
+    valid = ~(np.isnan(model.sport_matrix).any(axis=1) | np.isnan(model.eco_matrix).any(axis=1))
+    codes = model.entity_codes[valid]
+    years = model.years[valid]
+    sport, eco = model.sport_matrix[valid], model.eco_matrix[valid]
+    ref_rows = np.flatnonzero(years == reference_year)
+    starts = stats.group_starts(codes)
+    baseline_sport, baseline_eco = model.scores(weights.SPORT_WEIGHTS, weights.ECO_WEIGHTS)
+    return {
+        'sport': sport,
+        'eco': eco,
+        'starts': starts,
+        'ref_rows': ref_rows,
+        'baseline_rank_sport': stats.column_ranks(baseline_sport[valid][ref_rows][:, None])[:, 0].astype('float64'),
+        'baseline_rank_eco': stats.column_ranks(baseline_eco[valid][ref_rows][:, None])[:, 0].astype('float64'),
+        'zscore_scale': model.zscore_scale,
+        'entity_codes': codes[starts],
+        'ref_entity_codes': codes[ref_rows],
+    }
+
+
+def _sobol(outputs, n):
+    """First-order (Saltelli 2010) and total (Jansen) indices from the A, B, AB_i blocks."""
+    f_a, f_b = outputs[:n], outputs[n:2 * n]
+    variance = np.var(np.vstack([f_a, f_b]), axis=0)
+    rows = []
+    for i, factor in enumerate(FACTORS):
+        f_ab = outputs[(2 + i) * n:(3 + i) * n]
+        first = np.mean(f_b * (f_ab - f_a), axis=0) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=0) / variance
+        for j, output in enumerate(OUTPUTS):
+            rows.append({'facteur': factor, 'sortie': output,
+                         'indice_premier_ordre': first[j], 'indice_total': total[j]})
+    return pd.DataFrame(rows)
+
+
+def run_sensitivity(model, n_samples=1024, spread=SPREAD, processes=None, reference_year=None, seed=0):
+    """Return ``(per-entity intervals, Sobol indices)`` for a :class:`weights.WeightModel`."""
+    reference_year = int(np.max(model.years)) if reference_year is None else reference_year
+    state = _model_state(model, reference_year)
+
+    rng = np.random.default_rng(seed)
+    a = rng.random((n_samples, len(FACTORS)))
+    b = rng.random((n_samples, len(FACTORS)))
+    blocks = [a, b]
+    for i in range(len(FACTORS)):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        blocks.append(ab)
+
+    # Les blocs A et B servent aussi aux intervalles par entité
+    tasks = [(block[i:i + CHUNK_SIZE], spread, k < 2)
+             for k, block in enumerate(blocks) for i in range(0, n_samples, CHUNK_SIZE)]
+    if processes == 1:
+        _init_worker(state)
+        results = [_evaluate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(state,)) as pool:
+            results = list(pool.map(_evaluate, tasks))
+
+    outputs = np.vstack([r[0] for r in results])
+    entity_results = [r for r in results if r[1] is not None]
+    rank_sport = np.hstack([r[1] for r in entity_results])
+    rank_eco = np.hstack([r[2] for r in entity_results])
+    correlation = np.hstack([r[3] for r in entity_results])
+
+    entities = model.entities
+    df_ranks = pd.DataFrame({
+        model.level: entities[state['ref_entity_codes']],
+        'rang_sportif_reference': state['baseline_rank_sport'].astype(int),
+        'rang_economique_reference': state['baseline_rank_eco'].astype(int),
+    })
+    for name, ranks in [('rang_sportif', rank_sport), ('rang_economique', rank_eco)]:
+        p05, p50, p95 = np.percentile(ranks, [5, 50, 95], axis=1)
+        df_ranks[f'{name}_p05'], df_ranks[f'{name}_p50'], df_ranks[f'{name}_p95'] = p05, p50, p95
+
+    with np.errstate(all='ignore'):
+        corr_p05, corr_p95 = np.nanpercentile(correlation, [5, 95], axis=1)
+    df_corr = pd.DataFrame({model.level: entities[state['entity_codes']],
+                            'correlation_p05': corr_p05, 'correlation_p95': corr_p95})
+    df_entities = df_ranks.merge(df_corr, on=model.level, how='left')
+    df_entities['annee_reference'] = reference_year
+    return df_entities, _sobol(outputs, n_samples)
+
+
+def result_paths(level, version=None):
+    version = version or catalog.version('sensibilite')
+    return (os.path.join(SENSITIVITY_PATH, f"{level}_intervalles-{version}.csv"),
+            os.path.join(SENSITIVITY_PATH, f"{level}_sobol-{version}.csv"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse de sensibilité des pondérations des scores")
+    parser.add_argument('--level', choices=['region', 'departement', 'ville'], default='departement')
+    parser.add_argument('--samples', type=int, default=1024, help="Taille des matrices A et B")
+    parser.add_argument('--spread', type=float, default=SPREAD, help="Variation relative des poids (0.5 = ±50 %%)")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model = weights.WeightModel(weights.build_components(loaders.load_main_table()), args.level)
+    df_entities, df_sobol = run_sensitivity(model, args.samples, args.spread, args.processes, seed=args.seed)
+    os.makedirs(SENSITIVITY_PATH, exist_ok=True)
+    entities_path, sobol_path = result_paths(args.level)
+    df_entities.to_csv(entities_path, index=False)
+    df_sobol.to_csv(sobol_path, index=False)
+    catalog.record('sensibilite', entities_path)
+    catalog.record('sensibilite', sobol_path)
+    print(f"Résultats écrits dans {entities_path} et {sobol_path}")
+
+
+if __name__ == '__main__':
+    main()
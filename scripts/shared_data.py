@@ -0,0 +1,162 @@
+"""Datasets shared by every Streamlit process through memory-mapped Arrow files.
+
+Each dataset of :data:`export.DATASETS` is published once as an
+uncompressed Arrow IPC file (``data/store/shared/<name>/<version>.arrow``)
+and a ``CURRENT`` file names the version to serve. Processes memory-map
+the file: pages live in the OS page cache and are shared by all replicas,
+so each process only pays for what it touches.
+
+Frames are built on top of the mapping without copies where pandas allows
+it: numeric columns (NaN kept as values, not Arrow nulls) become read-only
+NumPy views, text columns stay Arrow-backed (``pd.ArrowDtype``) and only
+categorical codes are materialised. Publishing a new version is atomic
+(write, then replace ``CURRENT``); processes notice the change on their
+next access and switch, the previous mapping being released once unused.
+A process finding ``CURRENT`` behind the catalog version publishes the
+new version itself rather than serve a stale frame.
+
+Enabled in the app with ``SPORTECO_SHARED_DATA=1``; publish with
+
+    python scripts/shared_data.py publish
+"""
+# Standard library imports
+import argparse
+import os
+import threading
+
+# Third-party imports
+import pandas as pd
+import pyarrow as pa
+
+import catalog
+import export
+import loaders
+
+# Constants
+SHARED_PATH = os.path.join(loaders.DATA_PATH, "store", "shared")
+ENABLED = os.environ.get('SPORTECO_SHARED_DATA', '') not in ('', '0')
+KEEP_VERSIONS = 2
+
+_lock = threading.Lock()
+_frames = {}
+
+
+def _dataset_dir(name):
+    return os.path.join(SHARED_PATH, name)
+
+
+def _to_arrow(df):
+    """Arrow table keeping NaN as float values so numeric columns map back without a copy."""
+    arrays = {}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind in 'biuf':
+            arrays[str(column)] = pa.array(values.to_numpy())
+        else:
+            arrays[str(column)] = pa.Array.from_pandas(values)
+    return pa.table(arrays)
+
+
+def publish(name, df=None, version=None):
+    """Write a new version of ``name`` and make it the one served; returns the version."""
+    version = version or catalog.version(f"partage/{name}")
+    directory = _dataset_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{version}.arrow")
+    if not os.path.exists(path):
+        table = _to_arrow(export.DATASETS[name]() if df is None else df)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=table.num_rows or None)
+        os.replace(tmp_path, path)
+        catalog.record(f"partage/{name}", path)
+
+    tmp_current = os.path.join(directory, f"CURRENT.{os.getpid()}.tmp")
+    with open(tmp_current, 'w') as f:
+        f.write(version)
+    os.replace(tmp_current, os.path.join(directory, "CURRENT"))
+
+    # Anciennes versions supprimées : les processus qui les lisent gardent leur mapping.
+    # Le fichier servi est toujours conservé, même republié après une version plus récente.
+    versions = sorted((entry for entry in os.scandir(directory)
+                       if entry.name.endswith('.arrow') and entry.path != path),
+                      key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[KEEP_VERSIONS - 1:]:
+        os.remove(entry.path)
+    return version
+
+
+def current_version(name):
+    with open(os.path.join(_dataset_dir(name), "CURRENT")) as f:
+        return f.read().strip()
+
+
+def open_table(name, version=None):
+    """Zero-copy Arrow table of one published version (the current one by default)."""
+    version = version or current_version(name)
+    source = pa.memory_map(os.path.join(_dataset_dir(name), f"{version}.arrow"), 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def _to_frame(table):
+    return table.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.string(): pd.ArrowDtype(pa.string()),
+                      pa.large_string(): pd.ArrowDtype(pa.large_string())}.get
+    )
+
+
+def load_frame(name):
+    """DataFrame of the current version, shared by every caller of this process.
+
+    A shallow copy is returned: adding or replacing columns is local to the
+    caller, while the underlying buffers stay read-only views of the mapping.
+    The dataset is republished first when its sources or code changed since
+    the served version.
+    """
+    expected = catalog.version(f"partage/{name}")
+    current_path = os.path.join(_dataset_dir(name), "CURRENT")
+    if not os.path.exists(current_path) or current_version(name) != expected:
+        publish(name, version=expected)
+    version = current_version(name)
+    with _lock:
+        cached = _frames.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, _to_frame(open_table(name, version)))
+            _frames[name] = cached
+    return cached[1].copy(deep=False)
+
+
+def memory_report(name):
+    """Bytes of the served frame that are views of the mapping vs. private copies."""
+    frame = load_frame(name)
+    report = {'partage': 0, 'prive': 0}
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.ArrowDtype):
+            shared = True
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            shared = False
+        else:
+            shared = not values.to_numpy(copy=False).flags.writeable
+        report['partage' if shared else 'prive'] += values.memory_usage(index=False, deep=False)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publication des jeux de données partagés (Arrow mappé en mémoire)")
+    parser.add_argument('command', choices=['publish', 'report'])
+    parser.add_argument('--datasets', nargs='+', choices=list(export.DATASETS), default=list(export.DATASETS))
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        if args.command == 'publish':
+            print(f"{name} : version {publish(name)} publiée")
+        else:
+            report = memory_report(name)
+            print(f"{name} : {report['partage'] / 1e6:.1f} Mo partagés, {report['prive'] / 1e6:.1f} Mo privés")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Nearest-neighbour search over city score trajectories.
+
+Each city is described by its sport and economic score series, gaps
+interpolated and every series z-normalised so that only the shape of the
+trajectory matters. A KD-tree is built once over the PAA (piecewise
+aggregate approximation) of those vectors; PAA distances lower-bound the
+Euclidean distance, so the tree returns a small candidate set that is then
+re-ranked with Euclidean distance (the lower bound makes a second range
+query enough for an exact answer) or a windowed DTW computed for all
+candidates at once.
+"""
+# Standard library imports
+import time
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+import lags
+
+# Constants
+PAA_SEGMENTS = 6
+MIN_OBSERVATIONS = 4
+CANDIDATE_FACTOR = 10
+DTW_WINDOW = 2
+
+
+def z_normalize(matrix):
+    """Row-wise z-score; constant rows become zeros."""
+    std = matrix.std(axis=1, keepdims=True)
+    return (matrix - matrix.mean(axis=1, keepdims=True)) / np.where(std > 0, std, 1)
+
+
+def paa(matrix, n_segments=PAA_SEGMENTS):
+    """Piecewise aggregate approximation, scaled so that distances lower-bound Euclidean ones."""
+    segments = np.array_split(np.arange(matrix.shape[1]), n_segments)
+    return np.column_stack([matrix[:, s].mean(axis=1) * np.sqrt(len(s)) for s in segments])
+
+
+def _interpolate(matrix):
+    """Fill missing seasons linearly, extending the first/last value at the edges."""
+    return pd.DataFrame(matrix).interpolate(axis=1, limit_direction='both').to_numpy()
+
+
+def dtw_distances(query, candidates, window=DTW_WINDOW):
+    """DTW distance between one ``(n_seasons,)`` series and each row of ``candidates``.
+
+    The dynamic programme runs over seasons only (Sakoe-Chiba band of
+    ``window``), every candidate being updated in the same vectorized step.
+    """
+    n = len(query)
+    cost = np.full((len(candidates), n + 1, n + 1), np.inf)
+    cost[:, 0, 0] = 0
+    for i in range(1, n + 1):
+        for j in range(max(1, i - window), min(n, i + window) + 1):
+            d = (query[i - 1] - candidates[:, j - 1]) ** 2
+            cost[:, i, j] = d + np.minimum(np.minimum(cost[:, i - 1, j], cost[:, i, j - 1]), cost[:, i - 1, j - 1])
+    return np.sqrt(cost[:, n, n])
+
+
+class TrajectoryIndex:
+    """KD-tree over the PAA embeddings of z-normalised sport and economic trajectories."""
+
+    def __init__(self, df_scores, level='ville'):
+        entities, self.seasons, sport, eco = lags.season_matrices(df_scores, level)
+        enough = ((~np.isnan(sport)).sum(axis=1) >= MIN_OBSERVATIONS) & \
+                 ((~np.isnan(eco)).sum(axis=1) >= MIN_OBSERVATIONS)
+        self.level = level
+        self.entities = pd.Index(entities[enough])
+        self.sport = z_normalize(_interpolate(sport[enough]))
+        self.eco = z_normalize(_interpolate(eco[enough]))
+        self.vectors = np.hstack([self.sport, self.eco])
+        self.tree = cKDTree(np.hstack([paa(self.sport), paa(self.eco)]))
+
+    def _euclidean(self, i, candidates):
+        return np.sqrt(((self.vectors[candidates] - self.vectors[i]) ** 2).sum(axis=1))
+
+    def similar(self, entity, k=10, metric='euclidean'):
+        """Return ``(k most similar entities with their distance, elapsed ms)``."""
+        start = time.perf_counter()
+        i = self.entities.get_loc(entity)
+        n_candidates = min(len(self.entities), CANDIDATE_FACTOR * k + 1)
+        _, candidates = self.tree.query(self.tree.data[i], k=n_candidates)
+        candidates = np.atleast_1d(candidates)
+        candidates = candidates[candidates != i]
+
+        if metric == 'dtw':
+            distance = (dtw_distances(self.sport[i], self.sport[candidates])
+                        + dtw_distances(self.eco[i], self.eco[candidates]))
+        else:
+            distance = self._euclidean(i, candidates)
+            # La distance PAA minore la distance exacte : tout voisin plus proche que le
+            # k-ième candidat est dans cette boule, ce qui rend le résultat exact
+            radius = np.sort(distance)[min(k, len(distance)) - 1]
+            candidates = np.array(self.tree.query_ball_point(self.tree.data[i], radius), dtype='int64')
+            candidates = candidates[candidates != i]
+            distance = self._euclidean(i, candidates)
+        order = np.argsort(distance)[:k]
+        result = pd.DataFrame({self.level: self.entities[candidates[order]], 'distance': distance[order]})
+        result.index = np.arange(1, len(result) + 1)
+        return result, (time.perf_counter() - start) * 1000
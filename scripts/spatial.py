@@ -0,0 +1,97 @@
+"""Spatial index of French communes.
+
+Commune polygons and centroids are loaded once, projected to Lambert-93
+(EPSG:2154, metres) and the centroids indexed in a shapely STRtree. Located
+rows such as clubs are indexed the same way, so radius queries ("clubs
+within 30 km of this commune") and catchment counts for every commune hit
+the tree rather than looping over every pair. The clubs of
+``score_sport.xlsx`` have no coordinates: they are placed at the centroid
+of their ``code_commune``.
+"""
+# Third-party imports
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+import loaders
+
+# Constants
+WGS84 = "EPSG:4326"
+LAMBERT93 = "EPSG:2154"
+
+
+class CommuneIndex:
+    """Commune polygons and centroids, the centroids held in an STRtree."""
+
+    def __init__(self, communes):
+        communes = communes.to_crs(LAMBERT93).reset_index(drop=True)
+        self.codes = communes['code'].astype(str).to_numpy()
+        self.names = communes['nom'].to_numpy()
+        self.polygons = communes.geometry.to_numpy()
+        self.centroids = shapely.centroid(self.polygons)
+        self.centroid_tree = shapely.STRtree(self.centroids)
+        self.position = pd.Series(np.arange(len(self.codes)), index=self.codes)
+
+    @classmethod
+    def from_geojson(cls, path=loaders.COMMUNES_GEOJSON):
+        return cls(gpd.read_file(path))
+
+    @staticmethod
+    def project_points(lon, lat):
+        """WGS84 longitude/latitude arrays to Lambert-93 shapely points."""
+        points = gpd.GeoSeries(gpd.points_from_xy(lon, lat), crs=WGS84).to_crs(LAMBERT93)
+        return points.to_numpy()
+
+    def centroid(self, code):
+        return self.centroids[self.position[str(code)]]
+
+    def centroids_of(self, codes):
+        """Lambert-93 centroid of the commune of each INSEE code (None when unknown)."""
+        codes = pd.Series(codes, dtype=object).astype(str).str.zfill(5)
+        position = self.position.reindex(codes).to_numpy()
+        known = ~np.isnan(position)
+        result = np.full(len(codes), None, dtype=object)
+        result[known] = self.centroids[position[known].astype('int64')]
+        return result
+
+    def communes_within(self, code, radius_km):
+        """INSEE codes of communes whose centroid lies within ``radius_km`` of a commune."""
+        idx = self.centroid_tree.query(self.centroid(code), predicate='dwithin', distance=radius_km * 1000)
+        return self.codes[np.sort(idx)]
+
+
+class PointIndex:
+    """STRtree over arbitrary located rows (clubs, venues...) for radius queries."""
+
+    def __init__(self, df, lon_col='longitude', lat_col='latitude', points=None):
+        if points is None:
+            df = df.dropna(subset=[lon_col, lat_col])
+            points = CommuneIndex.project_points(df[lon_col], df[lat_col])
+        self.df = df.reset_index(drop=True)
+        self.points = np.asarray(points)
+        self.tree = shapely.STRtree(self.points)
+
+    @classmethod
+    def from_communes(cls, df, index, code_col='code_commune'):
+        """Rows located at the centroid of their commune (rows of unknown communes dropped)."""
+        points = index.centroids_of(df[code_col])
+        known = pd.notna(points)
+        return cls(df[known], points=points[known])
+
+    def within(self, center, radius_km):
+        """Rows within ``radius_km`` of a Lambert-93 point, with their distance in km."""
+        idx = np.sort(self.tree.query(center, predicate='dwithin', distance=radius_km * 1000))
+        rows = self.df.iloc[idx].copy()
+        rows['distance_km'] = shapely.distance(self.points[idx], center) / 1000
+        return rows.sort_values('distance_km')
+
+    def counts_within(self, centers, radius_km):
+        """Number of rows within ``radius_km`` of each center, in one tree query."""
+        center_idx, _ = self.tree.query(centers, predicate='dwithin', distance=radius_km * 1000)
+        return np.bincount(center_idx, minlength=len(centers))
+
+
+def catchment_club_counts(index, clubs, radius_km):
+    """Clubs within ``radius_km`` of every commune centroid, as a Series keyed by INSEE code."""
+    return pd.Series(clubs.counts_within(index.centroids, radius_km), index=index.codes, name='nb_clubs_proches')
@@ -0,0 +1,273 @@
+"""Sport score of every club, commune, département and région, for all sports.
+
+``Calcul_score (4).ipynb`` scores football only (20-team table, divisions
+1 and 2, stadium fill rate). The ``concat_sports`` sheet holds every sport
+with its own league sizes; here each sport is described in :data:`SPORTS`
+and all sports and seasons are scored in one vectorized pass:
+
+* ``classement``: position in the stacked divisions of the season
+  (``size of the divisions above + rank``), normalised as
+  ``(N - position) / (N - 1)`` where ``N`` is the total number of clubs of
+  the sport's divisions that season;
+* ``division``: optional coefficient of each division;
+* any other component is a column of the club table (European run,
+  stadium fill rate...), min-max normalised within the sport.
+
+A club's score is the weighted sum of its components. Clubs of one sport
+and commune add up, as in the notebook (Paris = PSG + Paris FC); the
+commune score sums its sports weighted by their share of the commune's
+licences and is scaled by the maximum, as in ``Scores/scores.xlsx``. Départements and régions are the mean of their
+communes, rolled up together (:mod:`rollup`).
+
+Adding a sport is an entry of :data:`SPORTS`, or of a JSON file of the
+same shape given with ``--config``.
+
+    python scripts/sport_scores.py
+    python scripts/sport_scores.py --config sports.json
+"""
+# Standard library imports
+import argparse
+import json
+import os
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import catalog
+import loaders
+import rollup
+
+# Constants
+SPORT_SCORES_PATH = os.path.join(loaders.DATA_PATH, "store", "scores_sportifs")
+LEVELS = ['commune', 'departement', 'region']
+BUILT_IN = ('classement', 'division')
+
+# Pondérations communes aux sports (concat_sports) ; le football ajoute le taux de remplissage
+WEIGHTS = {'classement': 0.5, 'parcours_europeen': 0.25}
+
+# divisions : nombre de clubs par division ; tailles_par_saison : exceptions (saisons incluses)
+# colonnes : composante -> colonne de la table des clubs ; complements : feuille qui apporte d'autres colonnes
+# points : barème des matchs pour les classements en cours de saison (live_scores.py)
+POINTS = {'victoire': 3, 'nul': 1, 'defaite': 0}
+SPORTS = {
+    'football': {
+        'divisions': {1: 20, 2: 20},
+        'poids': dict(WEIGHTS, remplissage=0.15),
+        'colonnes': {'parcours_europeen': 'score_event', 'remplissage': 'taux_remplissage'},
+        'complements': {'feuille': 'foot', 'colonnes': ['taux_remplissage']},
+    },
+    'basket': {
+        'divisions': {1: 18, 2: 18},
+        'points': {'victoire': 2, 'nul': 1, 'defaite': 1},
+        'poids': WEIGHTS,
+        'colonnes': {'parcours_europeen': 'score_event'},
+    },
+    'handball': {
+        'divisions': {1: 14, 2: 16},
+        'points': {'victoire': 2, 'nul': 1, 'defaite': 0},
+        'poids': WEIGHTS,
+        'colonnes': {'parcours_europeen': 'score_event'},
+    },
+    'hockey': {
+        'divisions': {1: 14, 2: 14},
+        'tailles_par_saison': [{'saisons': [2017, 2023], 'divisions': {1: 12}},
+                               {'saisons': [2020, 2020], 'divisions': {1: 11}}],
+        'poids': WEIGHTS,
+        'colonnes': {'parcours_europeen': 'score_event'},
+    },
+    'rugby': {
+        'divisions': {1: 14, 2: 16},
+        'points': {'victoire': 4, 'nul': 2, 'defaite': 0},
+        'poids': WEIGHTS,
+        'colonnes': {'parcours_europeen': 'score_event'},
+    },
+}
+
+
+def load_config(path):
+    """Sports of a JSON file (same shape as :data:`SPORTS`, division keys as text) merged over the defaults."""
+    with open(path) as f:
+        custom = json.load(f)
+    sports = dict(SPORTS)
+    for sport, spec in custom.items():
+        spec = dict(spec)
+        spec['divisions'] = {int(d): size for d, size in spec['divisions'].items()}
+        spec['tailles_par_saison'] = [dict(rule, divisions={int(d): size for d, size in rule['divisions'].items()})
+                                      for rule in spec.get('tailles_par_saison', [])]
+        if 'coefficients_division' in spec:
+            spec['coefficients_division'] = {int(d): c for d, c in spec['coefficients_division'].items()}
+        sports[sport] = spec
+    return sports
+
+
+def league_tables(sports, seasons):
+    """``(sports, seasons, divisions + 1)`` clubs above each division and ``(sports, seasons)`` league sizes."""
+    n_divisions = max(max(spec['divisions']) for spec in sports.values())
+    sizes = np.zeros((len(sports), len(seasons), n_divisions + 1))
+    for i, spec in enumerate(sports.values()):
+        for division, size in spec['divisions'].items():
+            sizes[i, :, division] = size
+        for rule in spec.get('tailles_par_saison', []):
+            first, last = rule['saisons']
+            in_rule = (seasons >= first) & (seasons <= last)
+            for division, size in rule['divisions'].items():
+                sizes[i, in_rule, division] = size
+    above = np.cumsum(sizes, axis=2) - sizes
+    return above, sizes.sum(axis=2)
+
+
+def add_complements(df_clubs, sports):
+    """Club table with the extra columns some sports read from their own sheet."""
+    df = df_clubs.copy()
+    for sport, spec in sports.items():
+        if 'complements' not in spec:
+            continue
+        columns = spec['complements']['colonnes']
+        extra = loaders.read_club_sheet(spec['complements']['feuille'])[['club', 'fin_saison'] + columns]
+        extra = extra.drop_duplicates(['club', 'fin_saison'])
+        is_sport = (df['sport'].astype(str) == sport).to_numpy()
+        merged = df.loc[is_sport, ['club', 'fin_saison']].merge(extra, on=['club', 'fin_saison'], how='left')
+        for column in columns:
+            if column not in df.columns:
+                df[column] = np.nan
+            df.loc[is_sport, column] = merged[column].to_numpy()
+    return df
+
+
+def rank_components(sports, sport_codes, fin_saison, division, classement):
+    """``classement`` and ``division`` components of club-seasons given as aligned arrays."""
+    fin_saison = fin_saison.astype('int64')
+    seasons = np.arange(fin_saison.min(), fin_saison.max() + 1)
+    y = fin_saison - seasons[0]
+    d = np.nan_to_num(division.astype('float64'), nan=0).astype('int64')
+    above, league_size = league_tables(sports, seasons)
+    known = (d >= 1) & (d < above.shape[2])
+    d = np.clip(d, 0, above.shape[2] - 1)
+
+    position = np.where(known, above[sport_codes, y, d] + classement, np.nan)
+    size = league_size[sport_codes, y]
+    coefficients = np.full((len(sports), above.shape[2]), np.nan)
+    for i, spec in enumerate(sports.values()):
+        for div, coefficient in spec.get('coefficients_division', {}).items():
+            coefficients[i, div] = coefficient
+    return (size - position) / (size - 1), np.where(known, coefficients[sport_codes, d], np.nan)
+
+
+def weighted_score(df_scores, sports):
+    """Weighted sum of the ``composante_*`` columns with the weights of each row's sport."""
+    names = [c[len('composante_'):] for c in df_scores.columns if c.startswith('composante_')]
+    s = pd.Categorical(df_scores['sport'].astype(str), categories=list(sports)).codes
+    weights = np.array([[spec['poids'].get(c, 0.0) for c in names] for spec in sports.values()])
+    matrix = df_scores[[f'composante_{c}' for c in names]].to_numpy(dtype='float64')
+    # Composante absente pour un club : contribution nulle, comme dans le notebook
+    return (np.nan_to_num(matrix) * weights[s]).sum(axis=1)
+
+
+def club_scores(df_clubs, sports=SPORTS):
+    """Score of every club and season, with its components, for all configured sports at once."""
+    df = df_clubs[df_clubs['sport'].astype(str).isin(list(sports))].reset_index(drop=True)
+    s = pd.Categorical(df['sport'].astype(str), categories=list(sports)).codes
+
+    components = {}
+    components['classement'], components['division'] = rank_components(
+        sports, s, df['fin_saison'].to_numpy(), df['division'].to_numpy(), df['classement'].to_numpy(dtype='float64'))
+
+    # Autres composantes : colonne de la table des clubs, min-max au sein du sport
+    other = sorted({c for spec in sports.values() for c in spec['poids'] if c not in BUILT_IN})
+    for component in other:
+        values = np.full(len(df), np.nan)
+        for i, spec in enumerate(sports.values()):
+            column = spec.get('colonnes', {}).get(component)
+            if column in df.columns:
+                rows = s == i
+                values[rows] = df.loc[rows, column].to_numpy(dtype='float64')
+        grouped = pd.Series(values).groupby(s)
+        low, high = grouped.transform('min').to_numpy(), grouped.transform('max').to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            components[component] = np.where(high > low, (values - low) / (high - low), 0.0 * values)
+
+    result = df[['region', 'departement', 'ville', 'code_commune', 'club', 'sport', 'fin_saison',
+                 'division', 'classement', 'nb_licences']].copy()
+    for component, values in components.items():
+        result[f'composante_{component}'] = values
+    result['score'] = weighted_score(result, sports)
+    return result
+
+
+def commune_scores(df_club_scores):
+    """Licence-weighted sum of the sport scores of every commune and season, scaled to a maximum of 1.
+
+    ``score_brut`` keeps the unscaled sum, so that communes can be
+    recomputed alone and the whole table rescaled afterwards.
+    """
+    df = df_club_scores.copy()
+    df['sport'] = df['sport'].astype(str)
+    places = df.groupby('code_commune')[['ville', 'departement', 'region']].first()
+    by_sport = df.groupby(['code_commune', 'sport', 'fin_saison'])['score'].sum()
+    # Part de chaque sport dans les licences de la commune (médiane des saisons)
+    licences = df.groupby(['code_commune', 'sport'])['nb_licences'].median()
+    shares = licences / licences.groupby(level='code_commune').transform('sum')
+    weighted = by_sport * shares.reindex(by_sport.droplevel('fin_saison').index).fillna(0).to_numpy()
+    score = weighted.groupby(level=['code_commune', 'fin_saison']).sum()
+    table = by_sport.unstack('sport').add_prefix('score_')
+    table['score_brut'] = score
+    table['score_sportif'] = score / score.max()
+    table = table.reset_index().rename(columns={'fin_saison': 'annee'})
+    return places.reset_index().merge(table, on='code_commune')
+
+
+def aggregate(df_communes):
+    """Mean commune scores of every département and région and season, in one rollup."""
+    columns = [c for c in df_communes.columns if c.startswith('score_')]
+    levels = rollup.rollup(df_communes, columns, ('code_commune', 'departement', 'region'))
+    return {level: levels[level] for level in ('departement', 'region')}
+
+
+def compute_all(df_clubs=None, sports=SPORTS):
+    """Club, commune, département and région scores from the validated club table."""
+    df_clubs = loaders.load_clubs() if df_clubs is None else df_clubs
+    clubs = club_scores(add_complements(df_clubs, sports), sports)
+    communes = commune_scores(clubs)
+    return dict({'club': clubs, 'commune': communes}, **aggregate(communes))
+
+
+def result_path(level, version=None):
+    return os.path.join(SPORT_SCORES_PATH, f"{level}-{version or catalog.version('scores_sportifs')}.parquet")
+
+
+def load_sport_scores(level):
+    """Scores of one level (club, commune, departement, region) for the current sources."""
+    path = result_path(level)
+    if not os.path.exists(path):
+        write_all(compute_all())
+    return pd.read_parquet(path)
+
+
+def write_all(results, version=None):
+    os.makedirs(SPORT_SCORES_PATH, exist_ok=True)
+    for level, df in results.items():
+        path = result_path(level, version)
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        if version is None:
+            catalog.record('scores_sportifs', path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score sportif multi-sports par club, commune, département et région")
+    parser.add_argument('--config', help="Fichier JSON de sports (ajoutés ou remplaçant ceux par défaut)")
+    args = parser.parse_args()
+
+    sports = load_config(args.config) if args.config else SPORTS
+    results = compute_all(sports=sports)
+    # Une configuration personnalisée n'est pas une version du catalogue : clé = contenu du fichier
+    write_all(results, version=f"config-{loaders.file_version(args.config)}" if args.config else None)
+    clubs = results['club']
+    for sport, count in clubs['sport'].astype(str).value_counts().sort_index().items():
+        print(f"{sport:10} {count:5} club-saisons")
+    print(f"{len(results['commune'])} commune-saisons → {SPORT_SCORES_PATH}")
+
+
+if __name__ == '__main__':
+    main()
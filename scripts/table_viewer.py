@@ -0,0 +1,127 @@
+"""Server-side paginated view over the score workbooks.
+
+Each sheet of ``Scores-final.zip`` is converted once to Parquet, under the
+catalog version of the archive (entry ``feuilles``), and then
+memory-mapped as an Arrow table. Sorting uses per-column permutation
+indexes computed on first use and kept with the view; filtering builds a
+boolean mask; only the rows of the visible page are taken from the table
+and converted to pandas for display.
+"""
+# Standard library imports
+import io
+import os
+import re
+import time
+import zipfile
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import catalog
+import loaders
+
+# Constants
+SHEETS_PATH = os.path.join(loaders.DATA_PATH, "store", "sheets")
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def list_workbooks(zip_path=loaders.SCORES_ZIP):
+    """``{file name: [sheet names]}`` for every Excel file in the archive."""
+    from openpyxl import load_workbook
+
+    workbooks = {}
+    with zipfile.ZipFile(zip_path) as z:
+        for member in z.namelist():
+            if member.endswith(('.xlsx', '.xls')):
+                workbook = load_workbook(io.BytesIO(z.read(member)), read_only=True)
+                workbooks[os.path.basename(member)] = workbook.sheetnames
+                workbook.close()
+    return workbooks
+
+
+def _sheet_path(file_name, sheet_name, version):
+    slug = re.sub(r'\W+', '_', f"{os.path.splitext(file_name)[0]}__{sheet_name}")
+    return os.path.join(SHEETS_PATH, version, f"{slug}.parquet")
+
+
+def load_sheet(file_name, sheet_name, zip_path=loaders.SCORES_ZIP):
+    """Arrow table of a sheet, converted from Excel on first access then memory-mapped."""
+    path = _sheet_path(file_name, sheet_name, catalog.version('feuilles'))
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with zipfile.ZipFile(zip_path) as z:
+            df = pd.read_excel(io.BytesIO(z.read(f"Scores/{file_name}")), sheet_name=sheet_name)
+        # Colonnes mixtes (texte et nombres) stockées en texte
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].astype('string')
+        df.columns = [str(c) for c in df.columns]
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path + ".tmp")
+        os.replace(path + ".tmp", path)
+        catalog.record('feuilles', path)
+    return pq.read_table(path, memory_map=True)
+
+
+class SheetView:
+    """Sort/filter/paginate an Arrow table without materialising it."""
+
+    def __init__(self, table):
+        self.table = table
+        self.columns = table.column_names
+        self._sort_index = {}
+
+    def is_numeric(self, column):
+        return pa.types.is_integer(self.table.schema.field(column).type) or \
+            pa.types.is_floating(self.table.schema.field(column).type)
+
+    def value_range(self, column):
+        result = pc.min_max(self.table[column])
+        return result['min'].as_py(), result['max'].as_py()
+
+    def sort_index(self, column):
+        """Ascending row permutation for ``column`` (nulls last), computed once."""
+        if column not in self._sort_index:
+            self._sort_index[column] = pc.sort_indices(self.table, sort_keys=[(column, 'ascending')]).to_numpy()
+        return self._sort_index[column]
+
+    def mask(self, column=None, text=None, value_range=None):
+        """Boolean mask for a substring filter (text columns) or a range (numeric columns)."""
+        if column is None:
+            return None
+        values = self.table[column]
+        if value_range is not None:
+            low, high = value_range
+            condition = pc.and_(pc.greater_equal(values, low), pc.less_equal(values, high))
+        elif text:
+            condition = pc.match_substring(pc.cast(values, pa.string()), text, ignore_case=True)
+        else:
+            return None
+        return pc.fill_null(condition, False).to_numpy(zero_copy_only=False)
+
+    def query(self, columns=None, sort_by=None, descending=False, mask=None, offset=0, limit=PAGE_SIZES[0]):
+        """Return ``(page DataFrame, matching row count, elapsed ms)``."""
+        start = time.perf_counter()
+        if sort_by is not None:
+            order = self.sort_index(sort_by)
+            if descending:
+                # Inverser en gardant les valeurs manquantes à la fin
+                n_valid = len(order) - self.table[sort_by].null_count
+                order = np.concatenate([order[:n_valid][::-1], order[n_valid:]])
+            if mask is not None:
+                order = order[mask[order]]
+        else:
+            order = np.flatnonzero(mask) if mask is not None else None
+
+        total = self.table.num_rows if order is None else len(order)
+        if order is None:
+            page = self.table.slice(offset, limit)
+        else:
+            page = self.table.take(pa.array(order[offset:offset + limit]))
+        if columns:
+            page = page.select(columns)
+        df_page = page.to_pandas()
+        df_page.index = np.arange(offset, offset + len(df_page)) + 1
+        return df_page, total, (time.perf_counter() - start) * 1000
@@ -0,0 +1,487 @@
+"""Offline vector tiles for the commune-level choropleth.
+
+Fetch the commune polygons once, then build the tiles:
+
+    python scripts/tiles.py fetch
+    python scripts/tiles.py build
+
+The archive is a standard MBTiles file (SQLite) holding gzipped Mapbox Vector
+Tiles with a single ``communes`` layer. Each feature carries its INSEE code,
+name, one attribute per metric and year (``sport_2023``, ``eco_2023``...), the
+commune correlation and the sector growth, so the map can restyle any
+year/metric client-side without regenerating anything.
+
+``build`` also exports the archive as static ``{z}/{x}/{y}.pbf`` files under
+``scripts/static``, which Streamlit serves itself (``server.enableStaticServing``)
+at a URL relative to the page, so the browser reaches the tiles wherever the
+app is deployed. A tile server run apart (``serve``, host and port from
+``--host``/``--port`` or ``SPORTECO_TILES_HOST``/``SPORTECO_TILES_PORT``) can
+replace it with ``SPORTECO_TILES_URL``:
+
+    python scripts/tiles.py serve --host 0.0.0.0 --port 8765
+    SPORTECO_TILES_URL=https://tuiles.example.org/{z}/{x}/{y}.pbf streamlit run scripts/app.py
+"""
+# Standard library imports
+import argparse
+import gzip
+import json
+import math
+import os
+import shutil
+import sqlite3
+import struct
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import shape
+
+import catalog
+import loaders
+
+# Constants
+COMMUNES_MBTILES = os.path.join(loaders.DATA_PATH, "tiles", "communes.mbtiles")
+# Même source que departements.geojson (propriétés code et nom)
+COMMUNES_GEOJSON_URL = ("https://raw.githubusercontent.com/gregoiredavid/france-geojson/master/"
+                        "communes-version-simplifiee.geojson")
+# Fichiers statiques servis par Streamlit : scripts/static/... -> app/static/...
+STATIC_TILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "tiles", "communes")
+STATIC_TILES_URL = "app/static/tiles/communes/{version}/{{z}}/{{x}}/{{y}}.pbf"
+TILE_HOST = os.environ.get('SPORTECO_TILES_HOST', '127.0.0.1')
+TILE_PORT = int(os.environ.get('SPORTECO_TILES_PORT', '8765'))
+LAYER_NAME = "communes"
+EXTENT = 4096
+BUFFER = 64
+MIN_ZOOM = 5
+MAX_ZOOM = 12
+EARTH_RADIUS = 6378137.0
+ORIGIN = math.pi * EARTH_RADIUS
+
+GEOM_POLYGON = 3
+CMD_MOVE_TO, CMD_LINE_TO, CMD_CLOSE_PATH = 1, 2, 7
+
+
+# --- Encodage protobuf minimal (spécification Mapbox Vector Tile 2.1) ---
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field, payload):
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed_field(field, values):
+    return _bytes_field(field, b''.join(_varint(v) for v in values))
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 31)
+
+
+def _encode_value(value):
+    if isinstance(value, str):
+        return _bytes_field(1, value.encode('utf-8'))
+    return _key(3, 1) + struct.pack('<d', float(value))
+
+
+def _ring_commands(ring, cursor):
+    """Encode one closed ring (without its closing point) as MVT commands."""
+    commands = [CMD_MOVE_TO | (1 << 3)]
+    x, y = ring[0]
+    commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+    cursor = (x, y)
+    commands.append(CMD_LINE_TO | ((len(ring) - 1) << 3))
+    for x, y in ring[1:]:
+        commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+        cursor = (x, y)
+    commands.append(CMD_CLOSE_PATH | (1 << 3))
+    return commands, cursor
+
+
+def _clean_ring(coords, exterior):
+    """Round a ring to integer tile pixels and enforce the MVT winding order."""
+    ring = np.rint(coords[:-1]).astype(np.int64)
+    if len(ring) == 0:
+        return None
+    # Supprimer les points dupliqués consécutifs après arrondi
+    keep = np.ones(len(ring), dtype=bool)
+    keep[1:] = np.any(ring[1:] != ring[:-1], axis=1)
+    ring = ring[keep]
+    if len(ring) > 1 and (ring[0] == ring[-1]).all():
+        ring = ring[:-1]
+    if len(ring) < 3:
+        return None
+    x, y = ring[:, 0], ring[:, 1]
+    area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+    if area == 0:
+        return None
+    # Extérieur : aire positive en coordonnées tuile (y vers le bas)
+    if (area > 0) != exterior:
+        ring = ring[::-1]
+    return [tuple(p) for p in ring.tolist()]
+
+
+def _polygon_commands(geom):
+    commands, cursor = [], (0, 0)
+    polygons = geom.geoms if geom.geom_type == 'MultiPolygon' else [geom]
+    for polygon in polygons:
+        exterior = _clean_ring(np.asarray(polygon.exterior.coords), exterior=True)
+        if exterior is None:
+            continue
+        ring_commands, cursor = _ring_commands(exterior, cursor)
+        commands += ring_commands
+        for interior in polygon.interiors:
+            hole = _clean_ring(np.asarray(interior.coords), exterior=False)
+            if hole is not None:
+                ring_commands, cursor = _ring_commands(hole, cursor)
+                commands += ring_commands
+    return commands
+
+
+def encode_tile(features, layer_name=LAYER_NAME):
+    """Encode ``[(id, geometry_in_tile_pixels, properties), ...]`` as an MVT layer."""
+    keys, values, key_index, value_index = [], [], {}, {}
+    encoded_features = []
+    for feature_id, geom, properties in features:
+        commands = _polygon_commands(geom)
+        if not commands:
+            continue
+        tags = []
+        for name, value in properties.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            if name not in key_index:
+                key_index[name] = len(keys)
+                keys.append(name)
+            value_key = (type(value) is str, value)
+            if value_key not in value_index:
+                value_index[value_key] = len(values)
+                values.append(value)
+            tags += [key_index[name], value_index[value_key]]
+        encoded_features.append(
+            _key(1, 0) + _varint(feature_id)
+            + _packed_field(2, tags)
+            + _key(3, 0) + _varint(GEOM_POLYGON)
+            + _packed_field(4, commands)
+        )
+    if not encoded_features:
+        return None
+    layer = _key(15, 0) + _varint(2) + _bytes_field(1, layer_name.encode('utf-8'))
+    layer += b''.join(_bytes_field(2, f) for f in encoded_features)
+    layer += b''.join(_bytes_field(3, k.encode('utf-8')) for k in keys)
+    layer += b''.join(_bytes_field(4, _encode_value(v)) for v in values)
+    layer += _key(5, 0) + _varint(EXTENT)
+    return _bytes_field(3, layer)
+
+
+# --- Géométries et attributs ---
+
+def _to_mercator(coords):
+    lon = np.radians(coords[:, 0])
+    lat = np.radians(np.clip(coords[:, 1], -85.0511, 85.0511))
+    return np.column_stack([EARTH_RADIUS * lon, EARTH_RADIUS * np.log(np.tan(np.pi / 4 + lat / 2))])
+
+
+def tile_size(zoom):
+    return 2 * ORIGIN / (1 << zoom)
+
+
+def tile_bounds(zoom, x, y):
+    """Web Mercator bounds (minx, miny, maxx, maxy) of an XYZ tile."""
+    size = tile_size(zoom)
+    minx = -ORIGIN + x * size
+    maxy = ORIGIN - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def fetch_communes(url=COMMUNES_GEOJSON_URL, path=loaders.COMMUNES_GEOJSON):
+    """Download the commune polygons to ``path``; returns the number of communes."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with urllib.request.urlopen(url, timeout=300) as response, open(tmp_path, 'wb') as f:
+        shutil.copyfileobj(response, f)
+    with open(tmp_path, 'r') as f:
+        features = json.load(f).get('features') or [{}]
+    if not {'code', 'nom'} <= set(features[0].get('properties') or {}):
+        os.remove(tmp_path)
+        raise ValueError(f"{url} : les communes doivent porter les propriétés 'code' et 'nom'")
+    os.replace(tmp_path, path)
+    return len(features)
+
+
+def load_commune_geometries(path=loaders.COMMUNES_GEOJSON):
+    """Load commune polygons (INSEE code, name) projected to Web Mercator."""
+    with open(path, 'r') as f:
+        geojson = json.load(f)
+    codes = [str(feat['properties']['code']) for feat in geojson['features']]
+    names = [feat['properties']['nom'] for feat in geojson['features']]
+    geoms = np.array([shape(feat['geometry']) for feat in geojson['features']], dtype=object)
+    geoms = shapely.transform(geoms, _to_mercator)
+    return pd.DataFrame({'code_commune': codes, 'nom': names, 'geometry': geoms})
+
+
+def commune_sector_growth(df_sector, years=5):
+    """Growth (%) of total sector headcount per ville over the last ``years`` seasons."""
+    last_years = sorted(df_sector['année'].unique())[-years:]
+    totals = (df_sector[df_sector['année'].isin([last_years[0], last_years[-1]])]
+              .groupby([df_sector['ville'].str.lower(), 'année'], observed=True)['nb_effectif'].sum()
+              .unstack('année'))
+    start, end = totals[last_years[0]], totals[last_years[-1]]
+    return ((end - start) / start.where(start > 0) * 100).rename('croissance')
+
+
+def build_commune_attributes(df_scores, df_sector=None):
+    """Wide attribute table keyed by code_commune: one column per metric and year."""
+    df = df_scores.dropna(subset=['code_commune']).copy()
+    df['code_commune'] = df['code_commune'].astype(str).str.zfill(5)
+    wide = df.pivot_table(index='code_commune', columns='annee',
+                          values=['score_sportif', 'score_economique'], aggfunc='mean')
+    wide.columns = [f"{'sport' if metric == 'score_sportif' else 'eco'}_{annee}" for metric, annee in wide.columns]
+
+    # Corrélation sport/économie par commune, calculée sur l'ensemble des saisons
+    grouped = df.groupby('code_commune')
+    wide['correlation'] = grouped[['score_sportif', 'score_economique']].corr().xs(
+        'score_sportif', level=1)['score_economique']
+    wide['ville'] = grouped['ville'].first().str.lower()
+
+    if df_sector is not None:
+        wide = wide.join(commune_sector_growth(df_sector), on='ville')
+    return wide.drop(columns='ville').astype('float64')
+
+
+# --- Génération de l'archive ---
+
+def _tile_range(bounds, zoom):
+    size = tile_size(zoom)
+    minx, miny, maxx, maxy = bounds
+    x0, x1 = int((minx + ORIGIN) // size), int((maxx + ORIGIN) // size)
+    y0, y1 = int((ORIGIN - maxy) // size), int((ORIGIN - miny) // size)
+    return x0, x1, y0, y1
+
+
+def _create_mbtiles(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+    conn.execute("CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)")
+    conn.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+    return conn
+
+
+def build_commune_tiles(df_geo, attributes, out_path=COMMUNES_MBTILES, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+    """Write an MBTiles archive of commune polygons joined with their attributes."""
+    df_geo = df_geo.join(attributes, on='code_commune')
+    attribute_cols = list(attributes.columns)
+    records = df_geo[['code_commune', 'nom'] + attribute_cols].to_dict('records')
+    geoms = df_geo['geometry'].to_numpy()
+    all_bounds = shapely.bounds(geoms)
+
+    conn = _create_mbtiles(out_path)
+    n_tiles = 0
+    for zoom in range(min_zoom, max_zoom + 1):
+        size = tile_size(zoom)
+        # Simplification à un pixel de tuile, une seule fois par niveau de zoom
+        simplified = shapely.simplify(geoms, size / EXTENT, preserve_topology=True)
+        tree = shapely.STRtree(simplified)
+
+        tiles = set()
+        for bounds in all_bounds:
+            x0, x1, y0, y1 = _tile_range(bounds, zoom)
+            tiles.update((x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+
+        rows = []
+        margin = size * BUFFER / EXTENT
+        for x, y in sorted(tiles):
+            minx, miny, maxx, maxy = tile_bounds(zoom, x, y)
+            idx = tree.query(shapely.box(minx, miny, maxx, maxy))
+            if len(idx) == 0:
+                continue
+            clipped = shapely.clip_by_rect(simplified[idx], minx - margin, miny - margin,
+                                           maxx + margin, maxy + margin)
+            features = []
+            for i, geom in zip(idx, clipped):
+                if geom.is_empty or geom.geom_type not in ('Polygon', 'MultiPolygon'):
+                    continue
+                # Passage en coordonnées pixel de la tuile (y vers le bas)
+                local = shapely.transform(geom, lambda c: np.column_stack([
+                    (c[:, 0] - minx) / size * EXTENT, (maxy - c[:, 1]) / size * EXTENT]))
+                features.append((int(i) + 1, local, records[i]))
+            data = encode_tile(features)
+            if data is not None:
+                # MBTiles utilise le schéma TMS (axe y inversé)
+                rows.append((zoom, x, (1 << zoom) - 1 - y, gzip.compress(data)))
+        conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+        n_tiles += len(rows)
+
+    stats = {col: [float(np.nanmin(attributes[col])), float(np.nanmax(attributes[col]))]
+             for col in attribute_cols if attributes[col].notna().any()}
+    lon_lat = shapely.transform(shapely.box(*shapely.total_bounds(geoms)), _from_mercator)
+    metadata = {
+        'name': LAYER_NAME,
+        'format': 'pbf',
+        'minzoom': str(min_zoom),
+        'maxzoom': str(max_zoom),
+        'bounds': ','.join(f"{v:.5f}" for v in lon_lat.bounds),
+        'json': json.dumps({'vector_layers': [{'id': LAYER_NAME, 'fields': {c: 'Number' for c in attribute_cols}}],
+                            'stats': stats}),
+    }
+    conn.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+    conn.commit()
+    conn.close()
+    return n_tiles
+
+
+def _from_mercator(coords):
+    lon = np.degrees(coords[:, 0] / EARTH_RADIUS)
+    lat = np.degrees(2 * np.arctan(np.exp(coords[:, 1] / EARTH_RADIUS)) - np.pi / 2)
+    return np.column_stack([lon, lat])
+
+
+def read_metadata(path=COMMUNES_MBTILES):
+    """Return the MBTiles metadata, with the ``json`` entry decoded."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+    finally:
+        conn.close()
+    metadata['json'] = json.loads(metadata.get('json', '{}'))
+    return metadata
+
+
+# --- Export statique et serveur de tuiles ---
+
+def static_version(mbtiles_path=COMMUNES_MBTILES):
+    return catalog.file_hash(mbtiles_path)[:16]
+
+
+def export_static(mbtiles_path=COMMUNES_MBTILES, out_dir=STATIC_TILES_PATH):
+    """Write every tile of the archive as ``<version>/{z}/{x}/{y}.pbf`` (uncompressed); older exports removed."""
+    version = static_version(mbtiles_path)
+    target = os.path.join(out_dir, version)
+    tmp_dir = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    conn = sqlite3.connect(f"file:{mbtiles_path}?mode=ro", uri=True)
+    try:
+        for z, x, tms_y, data in conn.execute("SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles"):
+            directory = os.path.join(tmp_dir, str(z), str(x))
+            os.makedirs(directory, exist_ok=True)
+            # Servies sans Content-Encoding : tuiles décompressées, y au schéma XYZ
+            with open(os.path.join(directory, f"{(1 << z) - 1 - tms_y}.pbf"), 'wb') as f:
+                f.write(gzip.decompress(data))
+    finally:
+        conn.close()
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_dir, target)
+    for name in os.listdir(out_dir):
+        if name != version and not name.endswith('.tmp'):
+            shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+    return target
+
+
+def tiles_url(mbtiles_path=COMMUNES_MBTILES):
+    """URL template the browser loads the commune tiles from (None until the archive was exported)."""
+    if os.environ.get('SPORTECO_TILES_URL'):
+        return os.environ['SPORTECO_TILES_URL']
+    version = static_version(mbtiles_path)
+    if not os.path.isdir(os.path.join(STATIC_TILES_PATH, version)):
+        return None
+    return STATIC_TILES_URL.format(version=version)
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Serve ``/{z}/{x}/{y}.pbf`` from an MBTiles archive."""
+
+    mbtiles_path = COMMUNES_MBTILES
+
+    def do_GET(self):
+        try:
+            z, x, y = self.path.split('?')[0].strip('/').removesuffix('.pbf').split('/')
+            z, x, y = int(z), int(x), int(y)
+        except ValueError:
+            self.send_error(404)
+            return
+        conn = sqlite3.connect(f"file:{self.mbtiles_path}?mode=ro", uri=True, check_same_thread=False)
+        try:
+            row = conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (1 << z) - 1 - y)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            self.send_response(204)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-protobuf')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(row[0])))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'public, max-age=86400')
+        self.end_headers()
+        self.wfile.write(row[0])
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(mbtiles_path=COMMUNES_MBTILES, host=TILE_HOST, port=TILE_PORT):
+    handler = type('BoundTileHandler', (TileHandler,), {'mbtiles_path': mbtiles_path})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tuiles vectorielles des communes (MBTiles)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    fetch = sub.add_parser('fetch', help="Télécharger les contours des communes")
+    fetch.add_argument('--url', default=COMMUNES_GEOJSON_URL)
+    fetch.add_argument('--out', default=loaders.COMMUNES_GEOJSON)
+    build = sub.add_parser('build', help="Générer l'archive MBTiles et son export statique")
+    build.add_argument('--geojson', default=loaders.COMMUNES_GEOJSON)
+    build.add_argument('--out', default=COMMUNES_MBTILES)
+    build.add_argument('--min-zoom', type=int, default=MIN_ZOOM)
+    build.add_argument('--max-zoom', type=int, default=MAX_ZOOM)
+    serve = sub.add_parser('serve', help="Servir l'archive hors de Streamlit")
+    serve.add_argument('--mbtiles', default=COMMUNES_MBTILES)
+    serve.add_argument('--host', default=TILE_HOST)
+    serve.add_argument('--port', type=int, default=TILE_PORT)
+    args = parser.parse_args()
+
+    if args.command == 'fetch':
+        n_communes = fetch_communes(args.url, args.out)
+        print(f"{n_communes} communes écrites dans {args.out}")
+    elif args.command == 'build':
+        if not os.path.exists(args.geojson):
+            parser.error(f"{args.geojson} est absent : lancez d'abord `python scripts/tiles.py fetch`")
+        attributes = build_commune_attributes(loaders.load_scores(), loaders.load_sector())
+        n_tiles = build_commune_tiles(load_commune_geometries(args.geojson), attributes,
+                                      args.out, args.min_zoom, args.max_zoom)
+        catalog.record('tuiles', args.out)
+        print(f"{n_tiles} tuiles écrites dans {args.out}, export statique dans {export_static(args.out)}")
+    else:
+        server = make_server(args.mbtiles, args.host, args.port)
+        print(f"Tuiles servies sur http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.pbf")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""What-if weighting of the sport and economic scores.
+
+``score_sportif`` and ``score_economique`` are weighted sums of normalised
+components (``Calcul_score (4).ipynb``). The components are computed once
+and averaged per entity and season; since the scores are linear in the
+weights, any new weighting is a single matrix-vector product over those
+stacked matrices, followed by vectorized rankings and per-entity
+correlations.
+"""
+# Standard library imports
+import time
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+import stats
+
+# Pondérations du notebook Calcul_score
+SPORT_WEIGHTS = {'class': 0.4, 'taux_remplissage': 0.3, 'coeff_division': 0.4, 'score_event': 0.1}
+ECO_WEIGHTS = {'salaire_median_norm': 0.4, 'taux_chomage_norm': 0.5, 'nb_crea_entreprise_norm': 0.5}
+
+COMPONENT_LABELS = {
+    'class': "Classement",
+    'taux_remplissage': "Taux de remplissage",
+    'coeff_division': "Division",
+    'score_event': "Parcours européen",
+    'salaire_median_norm': "Salaire médian",
+    'taux_chomage_norm': "Taux de chômage (inversé)",
+    'nb_crea_entreprise_norm': "Créations d'entreprises",
+}
+
+
+def _min_max(series):
+    return (series - series.min()) / (series.max() - series.min())
+
+
+def build_components(df_main):
+    """Normalised score components for every club and season."""
+    df = df_main.copy()
+    df['class'] = (20 - df['classement'] + 1) / 20
+    df['coeff_division'] = df['division'].map({1: 1, 2: 0.5})
+    df['salaire_median_norm'] = _min_max(df['salaire_median'])
+    df['taux_chomage_norm'] = 1 - _min_max(df['taux_chomage'])
+    df['nb_crea_entreprise_norm'] = _min_max(df['nb_crea_entreprise'])
+    return df
+
+
+class WeightModel:
+    """Stacked component matrices of one geographic level, scored for any weights."""
+
+    def __init__(self, components, level):
+        # Facteur qui transforme chaque composante min-max en z-score, à une constante près
+        raw = components[list(SPORT_WEIGHTS) + list(ECO_WEIGHTS)]
+        self.zscore_scale = ((raw.max() - raw.min()) / raw.std()).to_numpy(dtype='float64')
+
+        frame = (components.groupby([level, 'fin_saison'], observed=True)[list(SPORT_WEIGHTS) + list(ECO_WEIGHTS)]
+                 .mean().reset_index())
+        self.level = level
+        self.entity_codes, self.entities = pd.factorize(frame[level].astype(str))
+        self.years = frame['fin_saison'].to_numpy()
+        self.sport_matrix = frame[list(SPORT_WEIGHTS)].to_numpy(dtype='float64')
+        self.eco_matrix = frame[list(ECO_WEIGHTS)].to_numpy(dtype='float64')
+        self.baseline = self.evaluate(SPORT_WEIGHTS, ECO_WEIGHTS)
+
+    def scores(self, sport_weights, eco_weights):
+        """Sport and economic score of every entity-season for the given weights."""
+        w_sport = np.array([sport_weights[c] for c in SPORT_WEIGHTS], dtype='float64')
+        w_eco = np.array([eco_weights[c] for c in ECO_WEIGHTS], dtype='float64')
+        return self.sport_matrix @ w_sport, self.eco_matrix @ w_eco
+
+    def evaluate(self, sport_weights, eco_weights, rows=None):
+        """Scores, per-season ranks and per-entity correlation of the selected rows (all by default)."""
+        sport, eco = self.scores(sport_weights, eco_weights)
+        # La corrélation porte sur toutes les saisons de chaque entité
+        correlation = stats.grouped_pearson(self.entity_codes, sport, eco, len(self.entities))
+        rows = np.arange(len(self.years)) if rows is None else rows
+        codes, years = self.entity_codes[rows], self.years[rows]
+        return pd.DataFrame({
+            self.level: self.entities[codes],
+            'annee': years,
+            'score_sportif': sport[rows],
+            'score_economique': eco[rows],
+            'rang_sportif': stats.rank_within(years, sport[rows]),
+            'rang_economique': stats.rank_within(years, eco[rows]),
+            'correlation': correlation[codes],
+        }, index=rows)
+
+    def what_if(self, sport_weights, eco_weights, year):
+        """Results of one season with rank changes against the notebook weights, and elapsed ms."""
+        start = time.perf_counter()
+        rows = np.flatnonzero(self.years == year)
+        result = self.evaluate(sport_weights, eco_weights, rows)
+        baseline = self.baseline.loc[rows]
+        result['evolution_rang_sportif'] = baseline['rang_sportif'] - result['rang_sportif']
+        result['evolution_rang_economique'] = baseline['rang_economique'] - result['rang_economique']
+        return result.sort_values('rang_sportif'), (time.perf_counter() - start) * 1000